@@ -1,8 +1,11 @@
 from moviefinder.buttons import add_services_groupbox
 from moviefinder.checkable_combo_box import CheckableComboBox
 from moviefinder.country_code import CountryCode
+from moviefinder.habits_sync import habits_sync
+from moviefinder.loading_dialog import LoadingDialog
 from moviefinder.service_name import ServiceName
 from moviefinder.movies import movies
+from moviefinder.service_call import ServiceCall
 from moviefinder.user import show_message_box
 from moviefinder.user import user
 from moviefinder.validators import EmailValidator
@@ -17,6 +20,8 @@ class AccountCreationMenu(QtWidgets.QWidget):
     def __init__(self, main_window: QtWidgets.QMainWindow):
         super().__init__(main_window)
         self.main_window = main_window
+        self.__create_call: ServiceCall | None = None
+        self.__loading_dialog: LoadingDialog | None = None
         self.layout = QtWidgets.QFormLayout(self)
         title_label = QtWidgets.QLabel("<h1>create account</h1>", self)
         title_label.setAlignment(Qt.AlignCenter)
@@ -108,7 +113,30 @@ class AccountCreationMenu(QtWidgets.QWidget):
         self.region_combo_box.setCurrentIndex(0)
         self.__reset_services()
         self.genres_combo_box.clear()
-        if not user.create(name, email, CountryCode(region), services, password):
+        self.__loading_dialog = LoadingDialog(on_cancel=self.__stop_creating)
+        self.__loading_dialog.show()
+        self.__create_call = user.create(
+            name,
+            email,
+            CountryCode(region),
+            services,
+            password,
+            lambda ok: self.__finish_creating(ok, email, chosen_genres),
+        )
+
+    def __stop_creating(self) -> None:
+        """Closes the loading dialog and ignores any response from the service."""
+        if self.__create_call is not None:
+            self.__create_call.cancel()
+            self.__create_call = None
+        if self.__loading_dialog is not None:
+            self.__loading_dialog.close()
+            self.__loading_dialog = None
+
+    def __finish_creating(self, ok: bool, email: str, chosen_genres: str) -> None:
+        self.__stop_creating()
+        if not ok:
             return
+        habits_sync.open(email)
         movies.genres = chosen_genres.split(", ")
         self.main_window.show_logged_in_start_menu()
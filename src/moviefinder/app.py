@@ -1,11 +1,16 @@
 import sys
 from importlib import metadata as importlib_metadata
 
-from moviefinder.main_window import MainWindow
+from moviefinder.startup_profile import startup_profile
 from PySide6 import QtWidgets
 
 
 def main():
+    # The main window's module is imported here so that its import time is profiled.
+    from moviefinder.main_window import MainWindow
+
+    startup_profile.mark("importing the main window")
+
     # Linux desktop environments use app's .desktop file to integrate the app
     # to their application menus. The .desktop file of this app will include
     # StartupWMClass key, set to app's formal name, which helps associate
@@ -19,12 +24,14 @@ def main():
     app_module = sys.modules["__main__"].__package__
     # Retrieve the app's metadata
     metadata = importlib_metadata.metadata(app_module)
+    startup_profile.mark("reading the app's metadata")
 
     QtWidgets.QApplication.setApplicationName(metadata["Formal-Name"])
 
     QtWidgets.QApplication.setStyle("Fusion")
     sys.argv += ["-platform", "windows:darkmode=1"]
     app = QtWidgets.QApplication(sys.argv)
+    startup_profile.mark("creating the application")
     app.setStyleSheet(
         """
         QWidget {
@@ -67,5 +74,7 @@ def main():
         }
         """
     )
+    startup_profile.report_after_first_paint(app)
     main_window = MainWindow()  # noqa: F841
+    startup_profile.mark("creating the main window")
     sys.exit(app.exec())
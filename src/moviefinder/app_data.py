@@ -0,0 +1,38 @@
+import os
+import tempfile
+from pathlib import Path
+
+from PySide6 import QtCore
+
+
+def app_data_path(*parts: str) -> Path:
+    """Returns a path in this app's writable data folder on the device.
+
+    Parameters
+    ----------
+    *parts : str
+        The names of the folders and/or file to join onto the app's data folder.
+    """
+    location = QtCore.QStandardPaths.writableLocation(
+        QtCore.QStandardPaths.AppDataLocation
+    )
+    return Path(location).joinpath(*parts)
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """Writes a file so that it is either fully written or not changed at all.
+
+    The data is written to a temporary file in the same folder which then replaces the
+    destination file. Any missing parent folders of the path are created.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
@@ -1,34 +1,17 @@
 from moviefinder.browse_widget import BrowseWidget
 from moviefinder.checkable_combo_box import CheckableComboBox
+from moviefinder.dev_settings import SEARCH_DELAY_MILLISECONDS
 from moviefinder.loading_dialog import LoadingDialog
 from moviefinder.movies import movies
+from moviefinder.movies import RefreshedPages
+from moviefinder.task_executor import TaskPriority
 from moviefinder.user import show_message_box
 from moviefinder.user import user
+from moviefinder.worker import Worker
 from PySide6 import QtCore
 from PySide6 import QtWidgets
 
 
-class InfiniteScrollBar(QtWidgets.QScrollBar):
-    """A scroll bar that emits a signal when it nears and when it reaches the bottom."""
-
-    at_bottom = QtCore.Signal()
-    near_bottom = QtCore.Signal()
-
-    def __init__(self):
-        super().__init__()
-        self.setTracking(False)
-        self.valueChanged.connect(self.emit_at_bottom_if_true)
-        self.valueChanged.connect(self.emit_near_bottom_if_true)
-
-    def emit_at_bottom_if_true(self) -> None:
-        if self.value() == self.maximum():
-            self.at_bottom.emit()
-
-    def emit_near_bottom_if_true(self) -> None:
-        if self.value() >= self.maximum() - self.pageStep():
-            self.near_bottom.emit()
-
-
 class BrowseMenu(QtWidgets.QWidget):
     def __init__(self, main_window: QtWidgets.QMainWindow):
         QtWidgets.QWidget.__init__(self)
@@ -43,17 +26,31 @@ class BrowseMenu(QtWidgets.QWidget):
         )
         self.genres_combo_box.setCurrentData(movies.genres)
         self.layout.addWidget(self.genres_combo_box)
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_bar = InfiniteScrollBar()
-        self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-        self.scroll_bar.near_bottom.connect(self.add_row)
-        self.scroll_area.setVerticalScrollBar(self.scroll_bar)
+        self.search_line_edit = QtWidgets.QLineEdit(self)
+        self.search_line_edit.setPlaceholderText("search titles, people, and plots")
+        self.search_line_edit.setClearButtonEnabled(True)
+        self.layout.addWidget(self.search_line_edit)
+        self.__search_timer = QtCore.QTimer(self)
+        self.__search_timer.setSingleShot(True)
+        self.__search_timer.setInterval(SEARCH_DELAY_MILLISECONDS)
+        self.__search_timer.timeout.connect(self.__search)
+        self.search_line_edit.textChanged.connect(self.__search_timer.start)
         self.browse_widget = BrowseWidget(main_window)
-        if self.scroll_bar.value() == self.scroll_bar.maximum():
-            self.add_row()
-        self.scroll_area.setWidget(self.browse_widget)
-        self.layout.addWidget(self.scroll_area)
+        self.layout.addWidget(self.browse_widget)
+        self.__refresher = Worker(TaskPriority.LOW)
+        self.__refresher.done.connect(self.__merge_refreshed)
+
+    def refresh_restored_movies(self) -> None:
+        """Checks movies restored from a session snapshot against the service.
+
+        The pages the movies were restored from are requested again in the background,
+        and the grid is updated when they are received.
+        """
+        self.__refresher.start(movies.fetch_restored_pages)
+
+    def __merge_refreshed(self, refreshed: RefreshedPages | None) -> None:
+        if refreshed is not None:
+            self.browse_widget.movies_model.merge_refreshed(refreshed)
 
     def reload_browse_widget_if_genres_changed(self) -> None:
         if self.main_window.is_quitting:
@@ -64,20 +61,33 @@ class BrowseMenu(QtWidgets.QWidget):
             self.genres_combo_box.setCurrentData(movies.genres)
             return
         if new_genres != movies.genres:
+            self.change_genres(new_genres)
+
+    def change_genres(self, new_genres: list[str]) -> None:
+        """Shows movies of other genres.
+
+        The loaded movies that match the new genres are shown right away. More movies
+        are loaded from the service first only if none of the loaded movies match.
+        """
+        self.__refresher.cancel()
+        self.browse_widget.movies_model.refilter(new_genres)
+        if not movies:
             with LoadingDialog():
-                movies.genres = new_genres
-                self.main_window.clear_movies()
-                if not movies.load():
+                if movies.load() is False:
                     show_message_box("Error: unable to connect to the service.")
                     return
-                self.reload_browse_widget()
+        self.reload_browse_widget()
 
     def reload_browse_widget(self) -> None:
+        old_browse_widget = self.browse_widget
         self.browse_widget = BrowseWidget(self.main_window)
-        self.scroll_area.setWidget(self.browse_widget)
+        self.layout.replaceWidget(old_browse_widget, self.browse_widget)
+        old_browse_widget.deleteLater()
+        self.__search()
+
+    def __search(self) -> None:
+        self.__search_timer.stop()
+        self.browse_widget.search(self.search_line_edit.text())
 
     def update_movies_buttons(self) -> None:
         self.browse_widget.update_movies_buttons()
-
-    def add_row(self) -> None:
-        self.browse_widget.add_row()
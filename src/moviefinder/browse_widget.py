@@ -1,55 +1,65 @@
-from moviefinder.dev_settings import POSTER_WIDTH
+from moviefinder.buttons import decline_movie
+from moviefinder.buttons import toggle_heart
+from moviefinder.habits_sync import habits_sync
+from moviefinder.movie_delegate import MovieDelegate
 from moviefinder.movie_menu import MovieMenu
-from moviefinder.movie_widget import MovieWidget
 from moviefinder.movies import movies
-from moviefinder.worker import Worker
+from moviefinder.movies_model import MoviesModel
+from moviefinder.movies_model import SearchResultsModel
+from moviefinder.poster_fetcher import placeholder_poster
+from moviefinder.poster_fetcher import poster_loader
+from moviefinder.search_index import search_index
 from PySide6 import QtCore
 from PySide6 import QtWidgets
 
 
 class BrowseWidget(QtWidgets.QWidget):
-    """A widget that displays a list of movies and shows.
+    """A widget that displays a grid of movies and shows.
 
     This widget is deleted and recreated every time the user changes the genres,
-    services, and/or region.
+    services, and/or region. The grid is a list view of ``movies_model`` that paints
+    only the movies scrolled into view, so there is no limit to how many movies can be
+    browsed. More movies are loaded when the view is scrolled to the bottom. When the
+    user's genre habits change, the movies that haven't been scrolled to yet are ranked
+    again. Searching shows only the loaded movies that match, through
+    ``search_results_model``.
     """
 
     def __init__(self, main_window: QtWidgets.QMainWindow):
         QtWidgets.QWidget.__init__(self)
         self.main_window = main_window
-        self.main_window.window_resized.connect(
-            self.__unset_parents_and_reset_movies_layout
-        )
-        self.__START_ROW_COUNT = 2
-        self.__MAX_SHOWN_MOVIES = 100
         self.movie_menu: MovieMenu | None = None
-        self.movie_widgets: dict[str, MovieWidget] = {}  # movie_id: MovieWidget
-        self.__movies_loader = Worker()
-        self.__movies_loader.done.connect(self.__add_row)
+        self.movies_model = MoviesModel(self)
+        self.movies_model.loading_started.connect(self.__show_loading_label)
+        self.movies_model.loading_finished.connect(self.__hide_loading_label)
+        poster_loader.loaded.connect(self.__show_loaded_poster)
+        habits_sync.genre_habits_changed.connect(self.movies_model.rerank)
+        self.search_results_model = SearchResultsModel(self)
+        self.search_results_model.setSourceModel(self.movies_model)
         self.layout = QtWidgets.QVBoxLayout(self)
-        self.__movies_layout = QtWidgets.QVBoxLayout()
-        self.layout.addLayout(self.__movies_layout)
-        self.__row_layouts: list[QtWidgets.QHBoxLayout] = []
-        self.layout.addSpacerItem(QtWidgets.QSpacerItem(1, 100))
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.list_view = QtWidgets.QListView()
+        self.list_view.setViewMode(QtWidgets.QListView.IconMode)
+        self.list_view.setResizeMode(QtWidgets.QListView.Adjust)
+        self.list_view.setMovement(QtWidgets.QListView.Static)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSpacing(10)
+        self.list_view.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.list_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.list_view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.list_view.setModel(self.search_results_model)
+        self.movie_delegate = MovieDelegate(self.list_view)
+        self.movie_delegate.poster_clicked.connect(self.show_movie_menu)
+        self.movie_delegate.heart_clicked.connect(self.__toggle_heart)
+        self.movie_delegate.x_clicked.connect(
+            lambda movie_id, self=self: decline_movie(movie_id, self)
+        )
+        self.list_view.setItemDelegate(self.movie_delegate)
+        self.layout.addWidget(self.list_view)
         self.__loading_label = QtWidgets.QLabel("<h2>Loading...</h2>")
+        self.__loading_label.hide()
         self.layout.addWidget(self.__loading_label, alignment=QtCore.Qt.AlignCenter)
-        self.reset_movies_layout()
-
-    def __unset_parents_and_reset_movies_layout(self) -> None:
-        for movie_widget in self.movie_widgets.values():
-            movie_widget.setParent(None)
-        self.reset_movies_layout()
-
-    def reset_movies_layout(self) -> None:
-        self.__total_shown_movie_count = 0
-        self.__movies_per_row = self.main_window.width() // (POSTER_WIDTH + 10) - 1
-        for row_layout in self.__row_layouts:
-            row_layout.setParent(None)
-        self.__row_layouts = []
-        self.__row_movie_count = 0
-        if movies:
-            self.__load_starting_movie_rows()
-        else:
+        if not movies:
             self.layout.addWidget(
                 QtWidgets.QLabel(
                     "No movies match your chosen genres, services, and region."
@@ -57,86 +67,50 @@ class BrowseWidget(QtWidgets.QWidget):
                 alignment=QtCore.Qt.AlignCenter,
             )
 
-    def __load_starting_movie_rows(self) -> None:
-        for _ in range(self.__START_ROW_COUNT):
-            self.add_row()
-        # Prevent movie widgets from each being a different window.
-        for movie_widget in self.movie_widgets.values():
-            if movie_widget.parent() is None:
-                movie_widget.setParent(self)
+    def __show_loading_label(self) -> None:
+        self.__loading_label.show()
+
+    def __hide_loading_label(self, _: bool | None) -> None:
+        self.__loading_label.hide()
+
+    def __show_loaded_poster(self, movie_id: str) -> None:
+        self.movies_model.update_movie(movie_id)
+        if self.movie_menu is not None:
+            if self.movie_menu.movie_id == movie_id:
+                self.movie_menu.poster_label.setPixmap(
+                    poster_loader.menu_poster_pixmap(movie_id)
+                )
+            self.movie_menu.update_similar_poster(movie_id)
+
+    def __toggle_heart(self, movie_id: str) -> None:
+        toggle_heart(movie_id)
+        self.movies_model.update_movie(movie_id)
+
+    def remove_movie(self, movie_id: str) -> None:
+        """Removes a movie from the grid and from ``movies``."""
+        self.movies_model.remove_movie(movie_id)
+
+    def search(self, query: str) -> None:
+        """Shows only the movies that match a search, or all of them if it's blank."""
+        if not search_index.tokenize(query):
+            self.search_results_model.set_results(None)
+        else:
+            self.search_results_model.set_results(
+                search_index.search(query, movie_ids=movies)
+            )
 
     def update_movies_buttons(self) -> None:
-        for movie_widget in self.movie_widgets.values():
-            movie_widget.update_movie_buttons()
+        self.movies_model.update_all_movies()
 
     def show_movie_menu(self, movie_id: str) -> None:
         if self.movie_menu is None:
             self.movie_menu = MovieMenu(self.main_window)
             self.main_window.central_widget.addWidget(self.movie_menu)
-        if not self.movie_menu.update_movie_data(
-            movie_id, movies[movie_id].poster_pixmap
-        ):
+        poster_pixmap = poster_loader.menu_poster_pixmap(movie_id)
+        if poster_pixmap is None:
+            poster_loader.request(movies[movie_id])
+            poster_pixmap = placeholder_poster()
+        if not self.movie_menu.update_movie_data(movie_id, poster_pixmap):
             print(f'Error: movie "{movie_id}" is invalid.')
         else:
             self.main_window.central_widget.setCurrentWidget(self.movie_menu)
-
-    def add_row(self) -> None:
-        """Loads more movies if needed and adds a row of movies to the browse widget."""
-        if self.__total_shown_movie_count >= self.__MAX_SHOWN_MOVIES:
-            print("Maximum number of movies shown.")
-            self.__loading_label.hide()
-            return
-        if self.__total_shown_movie_count < len(movies):
-            self.__add_row()
-        if self.__total_shown_movie_count >= len(movies) - 3 * self.__movies_per_row:
-            if not self.__movies_loader.is_running:
-                self.__movies_loader.start(movies.load)
-
-    def __add_row(self, ok: bool | None = True) -> None:
-        """Adds a row of movies to the browse widget.
-
-        Parameters
-        ----------
-        ok : bool | None, optional
-            Whether the movies were loaded successfully. If False or None, the row is
-            not added. The default is True.
-        """
-        if not ok:
-            if ok is None:
-                self.__loading_label.hide()
-            return
-        is_new_row = False
-        if (
-            self.__row_movie_count == 0
-            or self.__row_movie_count >= self.__movies_per_row
-        ):
-            is_new_row = True
-            self.__row_movie_count = 0
-            self.__row_layouts.append(QtWidgets.QHBoxLayout())
-        for movie_id in movies.range(self.__total_shown_movie_count):
-            if self.__row_movie_count >= self.__movies_per_row:
-                break
-            movie_widget: MovieWidget | None = None
-            if movie_id in self.movie_widgets:
-                movie_widget = self.movie_widgets[movie_id]
-            else:
-                movie_widget = self.__create_movie_widget(movie_id)
-            if movie_widget is not None:
-                self.__row_layouts[-1].addWidget(movie_widget)
-                self.__row_movie_count += 1
-                self.__total_shown_movie_count += 1
-        if is_new_row:
-            self.__movies_layout.addLayout(self.__row_layouts[-1])
-        elif self.main_window.browse_menu is not None:
-            scroll_bar = self.main_window.browse_menu.scroll_bar
-            if scroll_bar.value() == scroll_bar.maximum():
-                scroll_bar.setValue(scroll_bar.maximum() - 1)
-
-    def __create_movie_widget(self, movie_id: str) -> MovieWidget | None:
-        if movie_widget := MovieWidget(movie_id, self):
-            movie_widget.poster_button.clicked.connect(
-                lambda self=self, movie_id=movie_id: self.show_movie_menu(movie_id)
-            )
-            self.movie_widgets[movie_id] = movie_widget
-            return movie_widget
-        return None
@@ -1,4 +1,5 @@
 from moviefinder.abstract_movie_widget import AbstractMovieWidget
+from moviefinder.habits_sync import habits_sync
 from moviefinder.movies import movies
 from moviefinder.resources import empty_heart_icon_path
 from moviefinder.resources import filled_heart_icon_path
@@ -41,35 +42,33 @@ def init_buttons(widget: AbstractMovieWidget, movie_id: str, browse_widget) -> N
     w.x_button.setIcon(QtGui.QIcon(red_x_icon_path))
 
 
+def toggle_heart(movie_id: str) -> None:
+    """Hearts or unhearts a movie and updates the user's genre habits to match."""
+    movie = movies[movie_id]
+    movie.hearted = not movie.hearted
+    habits_sync.change_genre_habits(movie.genres, 1 if movie.hearted else -1)
+
+
+def decline_movie(movie_id: str, browse_widget) -> None:
+    """Removes a movie the user clicked "x" on and remembers that they declined it."""
+    browse_widget.remove_movie(movie_id)
+    habits_sync.decline_movie(movie_id)
+
+
 def __on_heart_click(widget: AbstractMovieWidget, movie_id: str) -> None:
     """Responds to a widget's heart button being clicked."""
-    if not movies[movie_id].hearted:
-        movies[movie_id].hearted = True
+    toggle_heart(movie_id)
+    if movies[movie_id].hearted:
         widget.heart_button.setIcon(QtGui.QIcon(filled_heart_icon_path))
         widget.x_button.setDisabled(True)
-        for genre in movies[movie_id].genres:
-            if genre not in user.genre_habits:
-                print(f"Genre '{genre}' not in user's genre habits.")
-            else:
-                user.genre_habits[genre] += 1
     else:
-        movies[movie_id].hearted = False
         widget.heart_button.setIcon(QtGui.QIcon(empty_heart_icon_path))
         widget.x_button.setDisabled(False)
-        for genre in movies[movie_id].genres:
-            if genre not in user.genre_habits:
-                print(f"Genre '{genre}' not in user's genre habits.")
-            else:
-                user.genre_habits[genre] -= 1
 
 
 def __on_x_click(movie_id: str, browse_widget) -> None:
     """Responds to a widget's x button being clicked."""
-    del movies[movie_id]
-    browse_widget.movie_widgets[movie_id].setParent(None)
-    del browse_widget.movie_widgets[movie_id]
-    user.declined_movies.append(movie_id)
-    browse_widget.reset_movies_layout()
+    decline_movie(movie_id, browse_widget)
 
 
 def add_services_groupbox(widget: QtWidgets.QWidget) -> None:
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from moviefinder.app_data import app_data_path
+from moviefinder.dev_settings import CATALOG_CACHE_MAX_AGE_SECONDS
+from moviefinder.dev_settings import CATALOG_CACHE_MAX_BYTES
+from moviefinder.disk_cache import DiskCache
+
+
+class CatalogCache:
+    """A thread-safe cache of pages of movies stored in the device's files.
+
+    Pages are looked up by the parts of their requests that choose which movies are
+    returned, so the order of the genres and services doesn't matter. Pages older than
+    the maximum age are not used, and the least recently used pages are deleted when the
+    cache exceeds its byte budget.
+    """
+
+    def __init__(self, folder: Path, max_bytes: int, max_age_seconds: float):
+        self.__files = DiskCache(folder, max_bytes, max_age_seconds)
+
+    def get(self, request_body: dict[str, Any]) -> dict[str, Any] | None:
+        """Returns a page's response data, or None if it isn't cached or is too old."""
+        cached = self.__files.get(self.__key(request_body))
+        if cached is None:
+            return None
+        entry, data = cached
+        if not self.__files.is_fresh(entry):
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def put(self, request_body: dict[str, Any], response_content: bytes) -> None:
+        """Saves a page's response to the cache, replacing any older version of it."""
+        self.__files.put(self.__key(request_body), response_content)
+
+    def save(self) -> None:
+        """Saves the cache's index, including the order pages were last used in."""
+        self.__files.save()
+
+    def __key(self, request_body: dict[str, Any]) -> str:
+        normalized_body = dict(request_body)
+        normalized_body["genre"] = sorted(request_body["genre"])
+        normalized_body["services"] = sorted(request_body["services"])
+        return json.dumps(normalized_body, sort_keys=True)
+
+
+catalog_cache = CatalogCache(
+    app_data_path("catalog"), CATALOG_CACHE_MAX_BYTES, CATALOG_CACHE_MAX_AGE_SECONDS
+)
@@ -0,0 +1,374 @@
+import json
+import sqlite3
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from moviefinder.app_data import app_data_path
+from moviefinder.country_code import CountryCode
+from moviefinder.dev_settings import CATALOG_MIRROR_MAX_AGE_SECONDS
+from moviefinder.dev_settings import CATALOG_MIRROR_PAGE_SIZE
+from moviefinder.movie import Movie
+from moviefinder.service_name import ServiceName
+from moviefinder.vocabulary import service_vocabulary
+
+
+class CatalogMirror:
+    """A copy of the service's whole catalog in a SQLite database on the device.
+
+    The catalog of each region and set of services is synced separately by requesting
+    all of its pages from the service in a background task. Each page is saved in its
+    own transaction along with the number of the next page to request, so a sync that
+    is interrupted continues where it stopped the next time. Movies whose info hasn't
+    changed since the last sync are not written again, and movies that a finished sync
+    didn't receive are deleted. A catalog's "last synced" watermark is when its last
+    finished sync started, and a new sync starts once it is older than the maximum age.
+
+    Once a catalog has been synced, pages of its movies in any genres are read from the
+    database instead of the service. The movies' genres, regions, and services are
+    indexed, as are their release years and ratings, which the pages are sorted by, so
+    reading a page walks the movies in order and stops once the page is full. Where
+    each page ended is kept until the catalog is synced again, so the next page starts
+    there instead of skipping all of the earlier pages' movies. Each call uses its own
+    connection, so the database can be read while it is synced.
+    """
+
+    __SCHEMA = """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE IF NOT EXISTS movies (
+            id TEXT PRIMARY KEY,
+            service TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            rating INTEGER NOT NULL,
+            data TEXT NOT NULL,  -- the movie's JSON from the service
+            synced_at REAL NOT NULL  -- when the sync that last received it started
+        );
+        CREATE INDEX IF NOT EXISTS movies_service ON movies (service);
+        CREATE INDEX IF NOT EXISTS movies_year_rating ON movies (year, rating, id);
+        CREATE TABLE IF NOT EXISTS movie_genres (
+            genre TEXT NOT NULL,
+            movie_id TEXT NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+            PRIMARY KEY (genre, movie_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS movie_genres_movie_id ON movie_genres (movie_id);
+        CREATE TABLE IF NOT EXISTS movie_regions (
+            region TEXT NOT NULL,
+            movie_id TEXT NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+            PRIMARY KEY (region, movie_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS movie_regions_movie_id ON movie_regions (movie_id);
+        CREATE TABLE IF NOT EXISTS syncs (
+            catalog TEXT PRIMARY KEY,  -- the region and services
+            started_at REAL NOT NULL,  -- of the sync in progress, if any
+            next_page INTEGER,  -- NULL if no sync is in progress
+            synced_at REAL  -- the watermark; NULL until a sync finishes
+        );
+    """
+
+    def __init__(self, path: Path, page_size: int, max_age_seconds: float):
+        self.path = path
+        self.page_size = page_size
+        self.max_age_seconds = max_age_seconds
+        self.__lock = Lock()
+        self.__has_schema = False
+        # Maps catalogs, genres, and page numbers to the sort keys of the pages' last
+        # movies.
+        self.__page_ends: dict[
+            tuple[str, frozenset[str], int], tuple[int, int, str]
+        ] = {}
+
+    def last_synced(
+        self, region: CountryCode, services: Iterable[ServiceName]
+    ) -> float | None:
+        """Returns when a catalog's last finished sync started, or None if none did."""
+        row = self.__sync_row(self.__catalog(region, services))
+        return row[2] if row is not None else None
+
+    def needs_sync(self, region: CountryCode, services: Iterable[ServiceName]) -> bool:
+        """Returns True if a catalog was never synced, is being synced, or is old."""
+        row = self.__sync_row(self.__catalog(region, services))
+        if row is None or row[1] is not None or row[2] is None:
+            return True
+        return time.time() - row[2] >= self.max_age_seconds
+
+    def sync(
+        self,
+        region: CountryCode,
+        services: Iterable[ServiceName],
+        fetch_page: Callable[[int], dict[str, Any] | None],
+    ) -> bool:
+        """Saves a catalog's pages from the service, continuing any unfinished sync.
+
+        Returns True if the sync finished, returns False otherwise.
+
+        Parameters
+        ----------
+        region : CountryCode
+            The region of the catalog.
+        services : Iterable[ServiceName]
+            The services of the catalog.
+        fetch_page : Callable[[int], dict[str, Any] | None]
+            Gets the response data of a page of all of the catalog's movies in all
+            genres from the service, or returns None if the request failed.
+        """
+        services = sorted(services, key=lambda service: service.name)
+        catalog = self.__catalog(region, services)
+        row = self.__sync_row(catalog)
+        synced_at = row[2] if row is not None else None
+        if row is not None and row[1] is not None:
+            started_at, page = row[0], row[1]
+        else:
+            started_at, page = time.time(), 1
+        print(f"Syncing the catalog mirror from page {page}...")
+        while True:
+            response_data = fetch_page(page)
+            if response_data is None:
+                print("Error: unable to sync the catalog mirror.")
+                return False
+            total_pages = response_data["total_pages"]
+            is_last_page = page >= total_pages
+            try:
+                with closing(self.__connect()) as connection, connection:
+                    self.__save_movies(connection, response_data["movies"], started_at)
+                    if is_last_page:
+                        self.__delete_unsynced_movies(
+                            connection, region, services, started_at
+                        )
+                    connection.execute(
+                        "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?, ?)",
+                        (
+                            catalog,
+                            started_at,
+                            None if is_last_page else page + 1,
+                            started_at if is_last_page else synced_at,
+                        ),
+                    )
+            except (sqlite3.Error, OSError) as e:
+                print(f"Error: unable to save the catalog mirror: {e}")
+                return False
+            with self.__lock:
+                self.__page_ends.clear()
+            if is_last_page:
+                print("The catalog mirror was synced successfully.")
+                return True
+            page += 1
+
+    def page(
+        self,
+        region: CountryCode,
+        services: Iterable[ServiceName],
+        genres: Iterable[str],
+        page: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Returns a page of a catalog's movies in some genres and a page count.
+
+        The movies are sorted from the newest to the oldest like the service's pages,
+        then from the highest to the lowest rating, and then by ID. Counting all of the
+        movies would take longer than reading a page, so the page count is the page's
+        number, or one more if there are movies after the page.
+
+        Parameters
+        ----------
+        region : CountryCode
+            The region the movies must be in.
+        services : Iterable[ServiceName]
+            The services the movies must be on any of.
+        genres : Iterable[str]
+            The lowercase genres the movies must have any of.
+        page : int
+            The number of the page, starting at 1.
+        """
+        services = list(services)
+        service_names = [service.name for service in services]
+        genres = list(genres)
+        catalog = self.__catalog(region, services)
+        genre_set = frozenset(genres)
+        # The region and genres are looked up for each movie instead of being listed
+        # first so that the movies can be read in the index's order.
+        condition = f"""
+            service IN ({", ".join("?" * len(service_names))})
+            AND EXISTS (
+                SELECT 1 FROM movie_regions
+                WHERE region = ? AND movie_id = movies.id
+            )
+            AND EXISTS (
+                SELECT 1 FROM movie_genres
+                WHERE genre IN ({", ".join("?" * len(genres))})
+                AND movie_id = movies.id
+            )
+        """
+        parameters: list[Any] = [*service_names, region.name, *genres]
+        with self.__lock:
+            previous_page_end = self.__page_ends.get((catalog, genre_set, page - 1))
+        if previous_page_end is not None:
+            condition = f"(year, rating, id) < (?, ?, ?) AND {condition}"
+            parameters = [*previous_page_end, *parameters]
+            offset = 0
+        else:
+            offset = (page - 1) * self.page_size
+        try:
+            with closing(self.__connect()) as connection:
+                rows = connection.execute(
+                    f"""
+                        SELECT year, rating, id, data
+                        FROM movies INDEXED BY movies_year_rating
+                        WHERE {condition}
+                        ORDER BY year DESC, rating DESC, id DESC LIMIT ? OFFSET ?
+                    """,
+                    [*parameters, self.page_size + 1, offset],
+                ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error: unable to read the catalog mirror: {e}")
+            return [], 0
+        has_next_page = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if rows:
+            with self.__lock:
+                self.__page_ends[(catalog, genre_set, page)] = rows[-1][:3]
+        total_pages = page + 1 if has_next_page else page
+        return [json.loads(row[3]) for row in rows], total_pages
+
+    def __connect(self) -> sqlite3.Connection:
+        """Opens a connection to the database, creating the database if needed."""
+        if not self.__has_schema:
+            with self.__lock:
+                if not self.__has_schema:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.path)) as connection:
+                        connection.executescript(self.__SCHEMA)
+                    self.__has_schema = True
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def __sync_row(self, catalog: str) -> tuple[float, int | None, float | None] | None:
+        """Returns a catalog's sync start time, next page, and watermark."""
+        try:
+            with closing(self.__connect()) as connection:
+                return connection.execute(
+                    "SELECT started_at, next_page, synced_at FROM syncs "
+                    "WHERE catalog = ?",
+                    (catalog,),
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error: unable to read the catalog mirror: {e}")
+            return None
+
+    def __save_movies(
+        self,
+        connection: sqlite3.Connection,
+        movies_data: Iterable[dict[str, Any]],
+        synced_at: float,
+    ) -> None:
+        """Saves a page's movies, only rewriting the ones whose info changed."""
+        new_data: dict[str, str] = {}
+        for movie_data in movies_data:
+            if "imdbID" in movie_data:
+                new_data[movie_data["imdbID"]] = json.dumps(movie_data, sort_keys=True)
+        if not new_data:
+            return
+        old_data = dict(
+            connection.execute(
+                "SELECT id, data FROM movies "
+                f"WHERE id IN ({', '.join('?' * len(new_data))})",
+                list(new_data),
+            )
+        )
+        connection.executemany(
+            "UPDATE movies SET synced_at = ? WHERE id = ?",
+            [
+                (synced_at, movie_id)
+                for movie_id, data in new_data.items()
+                if old_data.get(movie_id) == data
+            ],
+        )
+        for movie_id, data in new_data.items():
+            if old_data.get(movie_id) == data:
+                continue
+            movie = Movie(json.loads(data))
+            if not movie:
+                continue
+            services = service_vocabulary.values(movie.service_mask)
+            connection.execute(
+                """
+                    INSERT INTO movies VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        service = excluded.service,
+                        year = excluded.year,
+                        rating = excluded.rating,
+                        data = excluded.data,
+                        synced_at = excluded.synced_at
+                """,
+                (
+                    movie_id,
+                    services[0].name if services else "",
+                    movie.release_year,
+                    movie.imdb_rating_percent,
+                    data,
+                    synced_at,
+                ),
+            )
+            connection.execute(
+                "DELETE FROM movie_genres WHERE movie_id = ?", (movie_id,)
+            )
+            connection.executemany(
+                "INSERT INTO movie_genres VALUES (?, ?)",
+                [(genre, movie_id) for genre in movie.genres],
+            )
+            connection.execute(
+                "DELETE FROM movie_regions WHERE movie_id = ?", (movie_id,)
+            )
+            connection.executemany(
+                "INSERT INTO movie_regions VALUES (?, ?)",
+                [(region.name, movie_id) for region in movie.regions],
+            )
+
+    def __delete_unsynced_movies(
+        self,
+        connection: sqlite3.Connection,
+        region: CountryCode,
+        services: list[ServiceName],
+        started_at: float,
+    ) -> None:
+        """Deletes a catalog's movies that a finished sync didn't receive.
+
+        The movies are only removed from the catalog's region. Movies that are then in
+        no regions are deleted.
+        """
+        service_names = [service.name for service in services]
+        unsynced_condition = f"""
+            synced_at < ? AND service IN ({", ".join("?" * len(service_names))})
+        """
+        connection.execute(
+            f"""
+                DELETE FROM movie_regions
+                WHERE region = ?
+                AND movie_id IN (SELECT id FROM movies WHERE {unsynced_condition})
+            """,
+            [region.name, started_at, *service_names],
+        )
+        connection.execute(
+            f"""
+                DELETE FROM movies
+                WHERE {unsynced_condition}
+                AND NOT EXISTS (
+                    SELECT 1 FROM movie_regions WHERE movie_id = movies.id
+                )
+            """,
+            [started_at, *service_names],
+        )
+
+    def __catalog(self, region: CountryCode, services: Iterable[ServiceName]) -> str:
+        service_names = sorted(service.name for service in services)
+        return f"{region.name}:{','.join(service_names)}"
+
+
+catalog_mirror = CatalogMirror(
+    app_data_path("catalog_mirror.sqlite3"),
+    CATALOG_MIRROR_PAGE_SIZE,
+    CATALOG_MIRROR_MAX_AGE_SECONDS,
+)
@@ -0,0 +1,166 @@
+import json
+import re
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+
+from moviefinder.app_data import write_atomically
+
+
+class DeclinedMovies:
+    """The IDs of the movies a user clicked "x" on.
+
+    The IDs are kept in a set, so checking whether a movie was declined takes constant
+    time no matter how many movies were declined. Each user's declined movies are saved
+    in their own file in a folder on the device. Most IDs are IMDb IDs, which are saved
+    as a sorted array of their 4-byte numbers. The IDs declined since the last time the
+    service was told about declined movies are kept until ``mark_synced`` is called, so
+    that the service is only told about declines when there are new ones. The declined
+    movies can be saved in a background thread while more movies are declined.
+    """
+
+    __IMDB_ID = re.compile(r"tt(\d+)")
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.__lock = Lock()  # guards the path and the IDs
+        self.__save_lock = Lock()  # held while saving so that saves happen in order
+        self.__path: Path | None = None
+        self.__ids: set[str] = set()
+        self.__unsynced_ids: list[str] = []
+
+    def __contains__(self, movie_id: object) -> bool:
+        return movie_id in self.__ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__ids)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def add(self, movie_id: str) -> None:
+        """Declines a movie."""
+        with self.__lock:
+            if movie_id not in self.__ids:
+                self.__ids.add(movie_id)
+                self.__unsynced_ids.append(movie_id)
+
+    def merge(self, movie_ids: Iterable[str]) -> None:
+        """Adds movies that the service already knows were declined."""
+        with self.__lock:
+            self.__ids.update(movie_ids)
+
+    def ids(self) -> list[str]:
+        """Returns all of the declined IDs."""
+        with self.__lock:
+            return list(self.__ids)
+
+    def unsynced_ids(self) -> list[str]:
+        """Returns the IDs declined since the service was last told about declines."""
+        with self.__lock:
+            return list(self.__unsynced_ids)
+
+    def mark_synced(self, movie_ids: Iterable[str]) -> None:
+        """Records that the service was told that these movies were declined."""
+        synced_ids = set(movie_ids)
+        with self.__lock:
+            self.__unsynced_ids = [
+                movie_id
+                for movie_id in self.__unsynced_ids
+                if movie_id not in synced_ids
+            ]
+
+    def open(self, email: str) -> None:
+        """Replaces the declined movies with a user's from the device's files."""
+        path = self.folder / sha256(email.lower().encode("utf8")).hexdigest()
+        ids: set[str] = set()
+        unsynced_ids: list[str] = []
+        try:
+            data = path.read_bytes()
+        except OSError:
+            pass
+        else:
+            try:
+                ids, unsynced_ids = self.__decode(data)
+            except ValueError as e:
+                print(f"Error: unable to read the declined movies: {e}")
+        with self.__lock:
+            self.__path = path
+            self.__ids = ids
+            self.__unsynced_ids = unsynced_ids
+
+    def save(self) -> None:
+        """Saves the declined movies to the file of the user they were opened for.
+
+        Can be called from any thread. The IDs are copied while holding the lock and
+        encoded and written without it.
+        """
+        with self.__save_lock:
+            with self.__lock:
+                path = self.__path
+                ids = set(self.__ids)
+                unsynced_ids = list(self.__unsynced_ids)
+            if path is not None:
+                write_atomically(path, self.__encode(ids, unsynced_ids))
+
+    def clear(self) -> None:
+        """Forgets the declined movies without changing the device's files."""
+        with self.__lock:
+            self.__path = None
+            self.__ids = set()
+            self.__unsynced_ids = []
+
+    def __encode(self, ids: Iterable[str], unsynced_ids: list[str]) -> bytes:
+        """Returns the file data of declined IDs and unsynced IDs.
+
+        The data starts with the count of IMDb numbers as a 4-byte integer and then the
+        sorted numbers, followed by JSON of any other IDs and of the unsynced IDs.
+        """
+        numbers = array("I")
+        other_ids: list[str] = []
+        for movie_id in ids:
+            if (number := self.__imdb_number(movie_id)) is not None:
+                numbers.append(number)
+            else:
+                other_ids.append(movie_id)
+        numbers = array("I", sorted(numbers))
+        count = array("I", [len(numbers)])
+        other_data = {"other": sorted(other_ids), "unsynced": unsynced_ids}
+        return (
+            count.tobytes() + numbers.tobytes() + json.dumps(other_data).encode("utf8")
+        )
+
+    def __decode(self, data: bytes) -> tuple[set[str], list[str]]:
+        """Returns the declined IDs and the unsynced IDs from a file's data.
+
+        Raises ValueError if the data is invalid.
+        """
+        count = array("I")
+        if len(data) < count.itemsize:
+            raise ValueError("the data is too short")
+        numbers_start = count.itemsize
+        count.frombytes(data[:numbers_start])
+        numbers_end = numbers_start + count.itemsize * count[0]
+        numbers = array("I")
+        numbers.frombytes(data[numbers_start:numbers_end])
+        other_data = json.loads(data[numbers_end:])
+        if not isinstance(other_data, dict) or not (
+            {"other", "unsynced"} <= other_data.keys()
+        ):
+            raise ValueError("the other IDs are missing")
+        ids = {f"tt{number:07d}" for number in numbers}
+        ids.update(other_data["other"])
+        return ids, list(other_data["unsynced"])
+
+    def __imdb_number(self, movie_id: str) -> int | None:
+        """Returns the number of an IMDb ID that can be rebuilt from its number."""
+        match = self.__IMDB_ID.fullmatch(movie_id)
+        if match is None:
+            return None
+        number = int(match.group(1))
+        if f"tt{number:07d}" != movie_id or number >= 2**32:
+            return None
+        return number
@@ -6,8 +6,29 @@ if USE_MOCK_DATA:
     print("Using mock data.")
 __DOMAIN_NAME = "76.176.224.129"  # chuadevs.com
 SERVICE_BASE_URL = f"http://{__DOMAIN_NAME}:1587/v1"
+SERVICE_CONNECT_TIMEOUT_SECONDS = 5
+SERVICE_READ_TIMEOUT_SECONDS = 30
+MAX_CONNECTIONS_PER_HOST = 8  # the number of kept-alive connections to each host
+MAX_HTTP_RETRIES = 3  # for idempotent requests
+MAX_BACKGROUND_THREADS = 20  # the number of tasks, such as poster downloads, at once
+PREFETCHED_PAGE_COUNT = 2  # the number of movie pages requested ahead of time
+MOVIES_STREAM_CHUNK_SIZE = 16 * 1024  # how much of a page is read at a time
+STREAMED_MOVIES_BATCH_SIZE = 8  # the number of movies added at a time while streaming
+CATALOG_CACHE_MAX_BYTES = 20 * 1024 * 1024
+CATALOG_CACHE_MAX_AGE_SECONDS = 6 * 60 * 60
+USE_CATALOG_MIRROR = False  # whether to read pages from a synced copy of the catalog
+CATALOG_MIRROR_PAGE_SIZE = 50  # the number of movies in each page read from the copy
+CATALOG_MIRROR_MAX_AGE_SECONDS = 24 * 60 * 60  # before syncing the copy again
 POSTER_WIDTH = 235
 POSTER_HEIGHT = 350
+MENU_POSTER_WIDTH = 2 * POSTER_WIDTH  # the largest size the movie menu shows posters
+MENU_POSTER_HEIGHT = 2 * POSTER_HEIGHT
+MAX_POSTER_DOWNLOADS_PER_HOST = MAX_CONNECTIONS_PER_HOST
+POSTER_CACHE_MAX_BYTES = 300 * 1024 * 1024
+POSTER_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # before revalidating with the host
+HABITS_SYNC_DELAY_SECONDS = 30  # how long liked genre & declined movie changes wait
+SEARCH_DELAY_MILLISECONDS = 100  # how long typing must pause before searching
+SESSION_SNAPSHOT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # before loading pages again
 QCoreApplication.setApplicationName("MovieFinder")
 QCoreApplication.setOrganizationDomain("chuadevs.com")
 QCoreApplication.setOrganizationName("chuadevs.com")
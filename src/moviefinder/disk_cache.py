@@ -0,0 +1,190 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+
+from moviefinder.app_data import write_atomically
+
+
+@dataclass
+class CacheEntry:
+    """Info about one value in a ``DiskCache``.
+
+    ``etag`` and ``last_modified`` are the validators the value's host sent with it,
+    if any, which are used to ask the host whether the value has changed.
+    """
+
+    key: str
+    size: int
+    stored_at: float
+    etag: str = ""
+    last_modified: str = ""
+
+
+class DiskCache:
+    """A thread-safe least recently used cache of bytes stored in the device's files.
+
+    Each value is stored in a file named after the hash of its string key. When the
+    total size of the stored values exceeds the byte budget, the least recently used
+    values are deleted.
+
+    The index of the stored values is only written by ``save``, so storing a value
+    doesn't rewrite the whole index. Files that aren't in the index, such as those
+    stored after the last ``save`` before the app stopped, are deleted when the index
+    is read.
+    """
+
+    __INDEX_FILE_NAME = "index.json"
+
+    def __init__(self, folder: Path, max_bytes: int, max_age_seconds: float):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.__lock = Lock()
+        self.__save_lock = Lock()  # keeps older indexes from replacing newer ones
+        # Maps file names to the entries of the values in them, LRU first.
+        self.__entries: OrderedDict[str, CacheEntry] | None = None
+        self.__total_bytes = 0
+        self.__is_dirty = False  # whether the index changed since it was saved
+
+    def get(self, key: str) -> tuple[CacheEntry, bytes] | None:
+        """Returns a value's cache info and data, or None if it isn't cached."""
+        file_name = self.__file_name(key)
+        with self.__lock:
+            entries = self.__load_entries()
+            if file_name not in entries:
+                return None
+            entries.move_to_end(file_name)
+            entry = entries[file_name]
+        try:
+            return entry, (self.folder / file_name).read_bytes()
+        except OSError:
+            with self.__lock:
+                self.__remove(file_name)
+            return None
+
+    def put(
+        self, key: str, data: bytes, etag: str = "", last_modified: str = ""
+    ) -> None:
+        """Saves a value to the cache, replacing any older version of it."""
+        file_name = self.__file_name(key)
+        with self.__lock:
+            self.__load_entries()  # before the file is written, so it isn't deleted
+        write_atomically(self.folder / file_name, data)
+        with self.__lock:
+            entries = self.__load_entries()
+            if file_name in entries:
+                self.__total_bytes -= entries[file_name].size
+            entries[file_name] = CacheEntry(
+                key, len(data), time.time(), etag, last_modified
+            )
+            entries.move_to_end(file_name)
+            self.__total_bytes += len(data)
+            self.__evict()
+            self.__is_dirty = True
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Returns True if a value is younger than the cache's maximum age."""
+        return time.time() - entry.stored_at < self.max_age_seconds
+
+    def mark_fresh(self, key: str) -> None:
+        """Records that a value's host confirmed the cached value is up to date."""
+        file_name = self.__file_name(key)
+        with self.__lock:
+            entries = self.__load_entries()
+            if file_name in entries:
+                entries[file_name].stored_at = time.time()
+                self.__is_dirty = True
+
+    def save(self) -> None:
+        """Saves the cache's index, including the order values were last used in.
+
+        The index is copied while holding the lock and written after releasing it, so
+        values can be read while the index is written.
+        """
+        with self.__save_lock:
+            with self.__lock:
+                if self.__entries is None or not self.__is_dirty:
+                    return
+                index = [
+                    [file_name, asdict(entry)]
+                    for file_name, entry in self.__entries.items()
+                ]
+                self.__is_dirty = False
+            try:
+                write_atomically(
+                    self.folder / self.__INDEX_FILE_NAME,
+                    json.dumps(index).encode("utf8"),
+                )
+            except OSError as e:
+                print(f"Error: unable to save the cache index: {e}")
+                with self.__lock:
+                    self.__is_dirty = True
+
+    def __file_name(self, key: str) -> str:
+        return sha256(key.encode("utf8")).hexdigest()
+
+    def __load_entries(self) -> OrderedDict[str, CacheEntry]:
+        """Reads the cache's index from the device's files the first time it's needed.
+
+        Must be called while holding the lock.
+        """
+        if self.__entries is None:
+            self.__entries = OrderedDict()
+            self.__total_bytes = 0
+            try:
+                with open(self.folder / self.__INDEX_FILE_NAME, encoding="utf8") as f:
+                    index: list[list] = json.load(f)
+            except (OSError, ValueError):
+                index = []
+            try:
+                for file_name, entry_data in index:
+                    if (self.folder / file_name).exists():
+                        entry = CacheEntry(**entry_data)
+                        self.__entries[file_name] = entry
+                        self.__total_bytes += entry.size
+            except (TypeError, ValueError) as e:
+                print(f"Error: the cache index is invalid and was discarded: {e!r}")
+                self.__entries.clear()
+                self.__total_bytes = 0
+            self.__delete_unindexed_files()
+        return self.__entries
+
+    def __delete_unindexed_files(self) -> None:
+        """Deletes the files that aren't in the index.
+
+        Must be called while holding the lock.
+        """
+        assert self.__entries is not None
+        try:
+            paths = list(self.folder.iterdir())
+        except OSError:
+            return
+        for path in paths:
+            if path.name == self.__INDEX_FILE_NAME or path.name in self.__entries:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def __evict(self) -> None:
+        """Deletes the least recently used values until the cache is within budget.
+
+        Must be called while holding the lock.
+        """
+        assert self.__entries is not None
+        while self.__total_bytes > self.max_bytes and len(self.__entries) > 1:
+            self.__remove(next(iter(self.__entries)))
+
+    def __remove(self, file_name: str) -> None:
+        """Must be called while holding the lock."""
+        assert self.__entries is not None
+        entry = self.__entries.pop(file_name, None)
+        if entry is not None:
+            self.__total_bytes -= entry.size
+        (self.folder / file_name).unlink(missing_ok=True)
@@ -0,0 +1,295 @@
+import json
+from collections.abc import Iterable
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+
+import requests
+from moviefinder.app_data import app_data_path
+from moviefinder.app_data import write_atomically
+from moviefinder.declined_movies import DeclinedMovies
+from moviefinder.dev_settings import HABITS_SYNC_DELAY_SECONDS
+from moviefinder.dev_settings import SERVICE_BASE_URL
+from moviefinder.dev_settings import USE_MOCK_DATA
+from moviefinder.service_client import session
+from moviefinder.task_executor import Task
+from moviefinder.task_executor import task_executor
+from moviefinder.task_executor import TaskPriority
+from moviefinder.user import show_message_box
+from moviefinder.user import user
+from moviefinder.worker import Worker
+from PySide6 import QtCore
+
+
+class HabitsSync(QtCore.QObject):
+    """Saves the user's genre habits and declined movies in the background.
+
+    Hearts, unhearts, and declines are recorded in memory as they happen. A background
+    task then writes the genre habits to a journal file on the device and saves the
+    declined movies with ``user.declined_movies``, so that the GUI thread doesn't wait
+    for the disk and few changes are lost if the app is killed. Changes recorded while
+    the task waits are written by the same task. ``HABITS_SYNC_DELAY_SECONDS`` after
+    the first unsaved change, all of the changes are sent to the service in one request
+    in the background. The journal holds the whole genre habits rather than the changes
+    to them, so sending it again after the service already saved it changes nothing. A
+    user's journal replaces the genre habits from the service the next time they log
+    in, and it is deleted once the service has the genre habits it holds.
+    """
+
+    genre_habits_changed = QtCore.Signal()
+
+    def __init__(self, folder: Path):
+        QtCore.QObject.__init__(self)
+        self.folder = folder
+        self.__path: Path | None = None
+        # Whether the genre habits changed since the service last saved them.
+        self.__has_unsaved_genre_habits = False
+        # Whether the service refused the user's password, so sending is pointless.
+        self.__is_refused = False
+        # The journal path, genre habits, and declined movies being sent, if any.
+        self.__sending: tuple[Path, dict[str, int], list[str]] | None = None
+        self.__save_lock = Lock()  # guards the unsaved changes below
+        self.__write_lock = Lock()  # held while writing so that writes happen in order
+        # The journal path and the genre habits to write to it, or None to delete it.
+        self.__unsaved_journal: tuple[Path, dict[str, int] | None] | None = None
+        self.__has_unsaved_declined_movies = False
+        self.__is_save_queued = False
+        self.__worker = Worker(TaskPriority.LOW)
+        self.__worker.done.connect(self.__finish_sync)
+        self.__worker.failed.connect(lambda _: self.__finish_sync(False))
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(HABITS_SYNC_DELAY_SECONDS * 1000)
+        self.__timer.timeout.connect(self.sync)
+
+    def open(self, email: str) -> None:
+        """Replaces the user's genre habits with the unsaved ones in their journal.
+
+        Call this after the user's genre habits and declined movies are loaded.
+        """
+        self.__path = self.__journal_path(email)
+        self.__has_unsaved_genre_habits = False
+        self.__is_refused = False
+        genre_habits = self.__read_journal(self.__path)
+        if genre_habits is not None:
+            for genre, count in genre_habits.items():
+                if genre in user.genre_habits:
+                    user.genre_habits[genre] = count
+            self.__has_unsaved_genre_habits = True
+        if self.__has_unsaved_genre_habits or user.declined_movies.unsynced_ids():
+            self.__schedule_sync()
+
+    def change_genre_habits(self, genres: Iterable[str], change: int) -> None:
+        """Adds to the number of liked movies in each of the genres."""
+        for genre in genres:
+            if genre not in user.genre_habits:
+                print(f"Genre '{genre}' not in user's genre habits.")
+            else:
+                user.genre_habits[genre] += change
+        self.__has_unsaved_genre_habits = True
+        if self.__path is not None:
+            self.__save_journal_later(self.__path, dict(user.genre_habits))
+        self.__schedule_sync()
+        self.genre_habits_changed.emit()
+
+    def decline_movie(self, movie_id: str) -> None:
+        """Remembers that the user clicked "x" on a movie."""
+        user.declined_movies.add(movie_id)
+        self.__save_declined_movies_later()
+        self.__schedule_sync()
+
+    def sync(self) -> None:
+        """Starts sending the unsaved changes unless they are already being sent."""
+        if self.__path is None or self.__sending is not None or self.__is_refused:
+            return
+        declined_movies = user.declined_movies.unsynced_ids()
+        if not self.__has_unsaved_genre_habits and not declined_movies:
+            return
+        genre_habits = dict(user.genre_habits)
+        self.__sending = (self.__path, genre_habits, declined_movies)
+        self.__worker.start(
+            self.__send,
+            user.email,
+            user.password,
+            genre_habits,
+            user.declined_movies.ids(),
+        )
+
+    def close(self) -> Task[None] | None:
+        """Sends the unsaved changes one last time and stops recording changes.
+
+        Call this before the user's data is cleared. Quitting does not wait for the
+        changes to be sent. If sending fails, the changes are sent after the user logs
+        in again. Returns the task that sends the changes, or None if there are no
+        changes to send.
+        """
+        self.__timer.stop()
+        self.save()
+        if self.__path is None:
+            return None
+        path = self.__path
+        self.__path = None
+        has_unsaved_genre_habits = self.__has_unsaved_genre_habits
+        self.__has_unsaved_genre_habits = False
+        declined_movies = user.declined_movies.unsynced_ids()
+        if self.__is_refused or not (has_unsaved_genre_habits or declined_movies):
+            return None
+        email = user.email
+        password = user.password
+        genre_habits = dict(user.genre_habits)
+        all_declined_movies = user.declined_movies.ids()
+        declined_movies_folder = user.declined_movies.folder
+
+        def send_and_clear_journal() -> None:
+            if not self.__send(email, password, genre_habits, all_declined_movies):
+                return
+            if self.__path == path:
+                return  # the user logged in again, so their new session sends these
+            with self.__write_lock:
+                if self.__read_journal(path) == genre_habits:
+                    path.unlink(missing_ok=True)
+                if declined_movies:
+                    saved_declined_movies = DeclinedMovies(declined_movies_folder)
+                    saved_declined_movies.open(email)
+                    saved_declined_movies.mark_synced(declined_movies)
+                    saved_declined_movies.save()
+
+        return task_executor.submit(send_and_clear_journal, priority=TaskPriority.LOW)
+
+    def save(self) -> None:
+        """Writes the recorded changes that haven't been written to the device yet.
+
+        A background task does this soon after changes are recorded, so call this only
+        before quitting. Can be called from any thread.
+        """
+        with self.__write_lock:
+            with self.__save_lock:
+                self.__is_save_queued = False
+                journal = self.__unsaved_journal
+                self.__unsaved_journal = None
+                has_unsaved_declined_movies = self.__has_unsaved_declined_movies
+                self.__has_unsaved_declined_movies = False
+            if journal is not None:
+                path, genre_habits = journal
+                if genre_habits is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    write_atomically(
+                        path, json.dumps({"genre_habits": genre_habits}).encode("utf8")
+                    )
+            if has_unsaved_declined_movies:
+                user.declined_movies.save()
+
+    def __save_journal_later(
+        self, path: Path, genre_habits: dict[str, int] | None
+    ) -> None:
+        """Writes genre habits to a journal, or deletes it if they're None, soon."""
+        with self.__save_lock:
+            self.__unsaved_journal = (path, genre_habits)
+        self.__queue_save()
+
+    def __save_declined_movies_later(self) -> None:
+        with self.__save_lock:
+            self.__has_unsaved_declined_movies = True
+        self.__queue_save()
+
+    def __queue_save(self) -> None:
+        """Starts a background task that calls ``save`` unless one is waiting to."""
+        with self.__save_lock:
+            if self.__is_save_queued:
+                return
+            self.__is_save_queued = True
+        task_executor.submit(self.save, priority=TaskPriority.LOW)
+
+    def __schedule_sync(self) -> None:
+        if not self.__timer.isActive():
+            self.__timer.start()
+
+    def __journal_path(self, email: str) -> Path:
+        return self.folder / sha256(email.lower().encode("utf8")).hexdigest()
+
+    def __read_journal(self, path: Path) -> dict[str, int] | None:
+        """Returns the genre habits in a journal, or None if there aren't any."""
+        try:
+            with open(path, encoding="utf8") as file:
+                genre_habits = json.load(file)["genre_habits"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if not isinstance(genre_habits, dict):
+            return None
+        return genre_habits
+
+    def __finish_sync(self, ok: bool | None) -> None:
+        """Forgets the changes that were sent if sending them succeeded.
+
+        Parameters
+        ----------
+        ok : bool | None
+            What ``__send`` returned: True if the service saved the changes, False if
+            sending them failed, and None if the service refused the user's password.
+        """
+        assert self.__sending is not None
+        path, genre_habits, declined_movies = self.__sending
+        self.__sending = None
+        if path != self.__path:
+            return  # the user logged out while the changes were being sent
+        if ok is None:
+            self.__is_refused = True
+            self.__timer.stop()
+            show_message_box("Error: unable to connect to the service.")
+            return
+        if ok:
+            if user.genre_habits == genre_habits:
+                self.__has_unsaved_genre_habits = False
+                self.__save_journal_later(path, None)
+            user.declined_movies.mark_synced(declined_movies)
+            self.__save_declined_movies_later()
+        if self.__has_unsaved_genre_habits or user.declined_movies.unsynced_ids():
+            self.__schedule_sync()
+
+    def __send(
+        self,
+        email: str,
+        password: str,
+        genre_habits: dict[str, int],
+        declined_movies: list[str],
+    ) -> bool | None:
+        """Sends genre habits and all of the declined movies to the service.
+
+        The service replaces the user's declined movies with the ones sent, so all of
+        them are sent rather than only the new ones. Runs in a worker thread. Assumes
+        the account already exists. Returns True if the update was successful, False if
+        there was an error communicating with the service, and None if the service
+        refused the password.
+        """
+        if USE_MOCK_DATA:
+            return True
+        print("Saving genre habits...")
+        try:
+            response = session.put(
+                url=f"{SERVICE_BASE_URL}/data",
+                json={
+                    "email": email,
+                    "genre_habits": genre_habits,
+                    "password": password,
+                    "declined": declined_movies,
+                },
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Exception while saving genre habits: {e}")
+            return False
+        if response.status_code == 401:
+            print("Status code 401")
+            print(f"{response.content = }")
+            print("Error: the service refused the password.")
+            return None
+        if not response:
+            print(f"{response.status_code = }")
+            print(f"{response.content = }")
+            print("Error: failed to save the genre habits.")
+            return False
+        print("Successfully saved the genre habits.")
+        return True
+
+
+habits_sync = HabitsSync(app_data_path("habits"))
@@ -0,0 +1,125 @@
+import json
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import chain
+from typing import Any
+
+
+class JsonArrayStreamParser:
+    """Parses the items of an array in a JSON object while the JSON text arrives.
+
+    Each item of the array with the chosen key is yielded as soon as all of its text
+    has been received, so the items can be used before the rest of the text arrives.
+    The object's other members are kept whole in ``members``, and are complete once
+    all of the items have been yielded.
+    """
+
+    __OBJECT_START = 0
+    __KEY = 1
+    __COLON = 2
+    __VALUE = 3
+    __AFTER_MEMBER = 4
+    __ITEM = 5
+    __AFTER_ITEM = 6
+    __DONE = 7
+    __WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self.members: dict[str, Any] = {}
+        self.__decoder = json.JSONDecoder()
+
+    def parse(self, chunks: Iterable[str]) -> Iterator[Any]:
+        """Yields the array's items from chunks of JSON text.
+
+        Raises ValueError if the text is not a valid JSON object.
+        """
+        buffer = ""
+        position = 0
+        state = self.__OBJECT_START
+        key = ""
+        for chunk in chain(chunks, [None]):
+            is_last_chunk = chunk is None
+            if chunk is not None:
+                buffer = buffer[position:] + chunk
+                position = 0
+            while state != self.__DONE:
+                whitespace = self.__WHITESPACE.match(buffer, position)
+                assert whitespace is not None  # the pattern also matches empty text
+                position = whitespace.end()
+                if position >= len(buffer):
+                    break
+                char = buffer[position]
+                if state == self.__OBJECT_START:
+                    if char != "{":
+                        raise ValueError(f"Expected '{{' at position {position}.")
+                    position += 1
+                    state = self.__KEY
+                elif state == self.__KEY and char == "}":
+                    position += 1
+                    state = self.__DONE
+                elif state == self.__COLON:
+                    if char != ":":
+                        raise ValueError(f"Expected ':' at position {position}.")
+                    position += 1
+                    state = self.__VALUE
+                elif state == self.__VALUE and key == self.array_key and char == "[":
+                    position += 1
+                    state = self.__ITEM
+                elif state == self.__ITEM and char == "]":
+                    position += 1
+                    state = self.__AFTER_MEMBER
+                elif state in (self.__AFTER_MEMBER, self.__AFTER_ITEM):
+                    if char == "," and state == self.__AFTER_MEMBER:
+                        state = self.__KEY
+                    elif char == ",":
+                        state = self.__ITEM
+                    elif char == "}" and state == self.__AFTER_MEMBER:
+                        state = self.__DONE
+                    elif char == "]" and state == self.__AFTER_ITEM:
+                        state = self.__AFTER_MEMBER
+                    else:
+                        raise ValueError(f"Unexpected {char!r} at position {position}.")
+                    position += 1
+                else:
+                    decoded = self.__decode(buffer, position, is_last_chunk)
+                    if decoded is None:
+                        break  # wait for the rest of the value
+                    value, position = decoded
+                    if state == self.__KEY:
+                        if not isinstance(value, str):
+                            raise ValueError(f"Expected a key at position {position}.")
+                        key = value
+                        state = self.__COLON
+                    elif state == self.__VALUE:
+                        self.members[key] = value
+                        state = self.__AFTER_MEMBER
+                    else:
+                        yield value
+                        state = self.__AFTER_ITEM
+        if state != self.__DONE:
+            raise ValueError("The JSON text ended before the object was complete.")
+
+    def __decode(
+        self, buffer: str, position: int, is_last_chunk: bool
+    ) -> tuple[Any, int] | None:
+        """Decodes the JSON value at a position in the buffer.
+
+        Returns the value and the position after it, or None if the buffer might not
+        have all of the value's text yet.
+        """
+        try:
+            value, end = self.__decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if is_last_chunk:
+                raise
+            return None
+        # A number or literal at the end of the buffer may continue in the next chunk.
+        if (
+            end == len(buffer)
+            and not is_last_chunk
+            and not isinstance(value, (dict, list, str))
+        ):
+            return None
+        return value, end
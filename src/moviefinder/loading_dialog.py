@@ -1,17 +1,39 @@
+from collections.abc import Callable
+
 from PySide6 import QtCore
 from PySide6 import QtWidgets
 
 
 class LoadingDialog:
-    """A context manager that shows a loading dialog."""
+    """A loading dialog that can be used as a context manager or shown and closed.
+
+    If ``on_cancel`` is given, the dialog has a cancel button that closes the dialog and
+    calls ``on_cancel``.
+    """
+
+    def __init__(self, on_cancel: Callable[[], None] | None = None):
+        self.__on_cancel = on_cancel
+        self.__dialog: QtWidgets.QProgressDialog | None = None
 
     def __enter__(self) -> None:
-        self.__dialog = QtWidgets.QProgressDialog("Loading...", "", 0, 0)
+        self.show()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
+
+    def show(self) -> None:
+        cancel_text = "cancel" if self.__on_cancel is not None else ""
+        self.__dialog = QtWidgets.QProgressDialog("Loading...", cancel_text, 0, 0)
         self.__dialog.setWindowModality(QtCore.Qt.WindowModal)
-        self.__dialog.setCancelButton(None)
+        if self.__on_cancel is None:
+            self.__dialog.setCancelButton(None)
+        else:
+            self.__dialog.canceled.connect(self.__on_cancel)
         self.__dialog.show()
         self.__dialog.setValue(0)
         QtWidgets.QApplication.processEvents()  # For the dialog to not be blank.
 
-    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
-        self.__dialog.cancel()
+    def close(self) -> None:
+        if self.__dialog is not None:
+            self.__dialog.cancel()
+            self.__dialog = None
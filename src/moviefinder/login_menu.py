@@ -1,4 +1,3 @@
-from moviefinder.movies import movies
 from moviefinder.user import show_message_box
 from PySide6 import QtCore
 from PySide6 import QtWidgets
@@ -43,13 +42,19 @@ class LoginMenu(QtWidgets.QWidget):
         email = self.email_line_edit.text()
         password = self.password_line_edit.text()
         self.password_line_edit.clear()
-        if not self.main_window.load_user_data(email, password):
-            return
+        self.main_window.log_in(
+            email,
+            password,
+            lambda: self.__save_login_and_show_logged_in_start_menu(email, password),
+        )
+
+    def __save_login_and_show_logged_in_start_menu(
+        self, email: str, password: str
+    ) -> None:
         if self.stay_logged_in_checkbox.isChecked():
             print("Saving user login data to device config files...")
             settings = QtCore.QSettings()
             settings.setValue("user/email", email)
             settings.setValue("user/password", password)
             print("User login data saved.")
-        movies.genres = self.main_window.get_top_3_genres()
         self.main_window.show_logged_in_start_menu()
@@ -1,23 +1,19 @@
 import os
 import sys
 import webbrowser
+from collections.abc import Callable
 from textwrap import dedent
 from typing import Literal
+from typing import TYPE_CHECKING
 
-import requests
-from moviefinder.account_creation_menu import AccountCreationMenu
-from moviefinder.browse_menu import BrowseMenu
 from moviefinder.country_code import CountryCode
 from moviefinder.dev_settings import SERVICE_BASE_URL
 from moviefinder.dev_settings import USE_MOCK_DATA
 from moviefinder.loading_dialog import LoadingDialog
-from moviefinder.logged_in_start_menu import LoggedInStartMenu
-from moviefinder.login_menu import LoginMenu
-from moviefinder.movies import movies
 from moviefinder.resources import settings_icon_path
 from moviefinder.service_name import ServiceName
-from moviefinder.settings_menu import SettingsMenu
 from moviefinder.start_menu import StartMenu
+from moviefinder.startup_profile import startup_profile
 from moviefinder.user import show_message_box
 from moviefinder.user import user
 from moviefinder.validators import EmailValidator
@@ -26,8 +22,23 @@ from PySide6 import QtCore
 from PySide6 import QtGui
 from PySide6 import QtWidgets
 
+if TYPE_CHECKING:
+    import requests
+    from moviefinder.account_creation_menu import AccountCreationMenu
+    from moviefinder.browse_menu import BrowseMenu
+    from moviefinder.logged_in_start_menu import LoggedInStartMenu
+    from moviefinder.login_menu import LoginMenu
+    from moviefinder.service_call import ServiceCall
+    from moviefinder.settings_menu import SettingsMenu
+
 
 class MainWindow(QtWidgets.QMainWindow):
+    """The app's window, which shows one menu at a time.
+
+    Only the start menu is created with the window. The other menus, and the modules
+    they need, are created and imported the first time they are shown so that the
+    window can be shown sooner.
+    """
 
     window_resized = QtCore.Signal()
 
@@ -40,7 +51,10 @@ class MainWindow(QtWidgets.QMainWindow):
             self.setWindowIcon(QtGui.QIcon("src/moviefinder/resources/moviefinder.svg"))
         self.central_widget = QtWidgets.QStackedWidget()
         self.setCentralWidget(self.central_widget)
+        self.__log_in_call: "ServiceCall | None" = None
+        self.__log_in_dialog: LoadingDialog | None = None
         self.__init_menus()
+        startup_profile.mark("creating the start menu")
         self.__load_settings_and_show_window()
         self.is_quitting = False
         qApp.aboutToQuit.connect(self.__on_quit)  # type: ignore # noqa: F821
@@ -51,13 +65,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.start_menu = StartMenu(self)
         self.central_widget.addWidget(self.start_menu)
         self.central_widget.setCurrentWidget(self.start_menu)
-        self.account_creation_menu = AccountCreationMenu(self)
-        self.central_widget.addWidget(self.account_creation_menu)
-        self.login_menu = LoginMenu(self)
-        self.central_widget.addWidget(self.login_menu)
-        self.logged_in_start_menu: SettingsMenu | None = None
-        self.settings_menu: SettingsMenu | None = None
-        self.browse_menu: BrowseMenu | None = None
+        self.account_creation_menu: "AccountCreationMenu | None" = None
+        self.login_menu: "LoginMenu | None" = None
+        self.logged_in_start_menu: "LoggedInStartMenu | None" = None
+        self.settings_menu: "SettingsMenu | None" = None
+        self.browse_menu: "BrowseMenu | None" = None
 
     def __load_settings_and_show_window(self):
         """Reads the settings from the device's configuration files."""
@@ -67,8 +79,6 @@ class MainWindow(QtWidgets.QMainWindow):
             user.email = str(settings.value("user/email"))
             user.password = str(settings.value("user/password"))
             print("Loaded user data from device settings.")
-            if self.__attempt_log_in(user.email, user.password):
-                self.show_logged_in_start_menu()
         if not settings.contains("main_window/geometry"):
             self.showMaximized()
         else:
@@ -80,6 +90,11 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.restoreGeometry(geometry_bytes)
                 self.show()
         print("Settings loaded.")
+        if user.email and user.password:
+            # Logs in after the window is shown so that the window isn't blank for long.
+            QtCore.QTimer.singleShot(
+                0, lambda: self.__attempt_log_in(user.email, user.password)
+            )
 
     def __save_window_geometry(self):
         """Saves the window's size and location to the device's configuration files."""
@@ -92,14 +107,37 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         self.is_quitting = True
         self.__save_window_geometry()
-        if user:
-            user.save_genre_habits_and_declined_movies()
-
-    def load_user_data(self, email: str, password: str) -> bool:
-        """Loads user data from the service into the global ``user`` variable.
+        if "moviefinder.habits_sync" in sys.modules:  # if any habits were changed
+            from moviefinder.habits_sync import habits_sync
+
+            habits_sync.save()
+        if "moviefinder.movies" in sys.modules:  # if any movies or posters were loaded
+            from moviefinder.catalog_cache import catalog_cache
+            from moviefinder.movies import movies
+            from moviefinder.poster_cache import poster_cache
+            from moviefinder.search_index import search_index
+            from moviefinder.session_snapshot import session_snapshot
+
+            poster_cache.save()
+            catalog_cache.save()
+            search_index.retain(movies.pooled_ids())
+            search_index.save()
+            if movies and user.email and user.region is not None:
+                session_snapshot.save(user.email, movies.snapshot())
+
+    def log_in(
+        self, email: str, password: str, on_logged_in: Callable[[], None]
+    ) -> None:
+        """Loads user data from the service in the background and logs in.
 
-        Returns True if successful, False otherwise.
+        A loading dialog is shown until the service responds, and the user can cancel
+        logging in. If the user data is loaded into the global ``user`` variable
+        successfully, the user's top genres are chosen and ``on_logged_in`` is called.
         """
+        from moviefinder.habits_sync import habits_sync
+        from moviefinder.movies import movies
+        from moviefinder.service_call import ServiceCall
+
         if USE_MOCK_DATA:
             user.name = "user's name here"
             user.email = "a@b.c"
@@ -111,30 +149,63 @@ class MainWindow(QtWidgets.QMainWindow):
                 ServiceName.HULU,
                 ServiceName.NETFLIX,
             ]
-            return True
-        try:
-            response = requests.post(
-                url=f"{SERVICE_BASE_URL}/account",
-                json={
-                    "email": email,
-                    "password": password,
-                },
+            user.declined_movies.open(user.email)
+            habits_sync.open(user.email)
+            movies.genres = self.get_top_3_genres()
+            on_logged_in()
+            return
+        self.__stop_logging_in()
+        self.__log_in_call = ServiceCall(
+            "POST",
+            f"{SERVICE_BASE_URL}/account",
+            {
+                "email": email,
+                "password": password,
+            },
+        )
+        self.__log_in_call.finished.connect(
+            lambda response: self.__finish_log_in(
+                email, password, response, on_logged_in
             )
-        except requests.exceptions.ConnectionError as e:
+        )
+        self.__log_in_dialog = LoadingDialog(on_cancel=self.__stop_logging_in)
+        self.__log_in_dialog.show()
+        self.__log_in_call.start()
+
+    def __stop_logging_in(self) -> None:
+        """Closes the loading dialog and ignores any response from the service."""
+        if self.__log_in_call is not None:
+            self.__log_in_call.cancel()
+            self.__log_in_call = None
+        if self.__log_in_dialog is not None:
+            self.__log_in_dialog.close()
+            self.__log_in_dialog = None
+
+    def __finish_log_in(
+        self,
+        email: str,
+        password: str,
+        response: "requests.Response | None",
+        on_logged_in: Callable[[], None],
+    ) -> None:
+        from moviefinder.habits_sync import habits_sync
+        from moviefinder.movies import movies
+
+        self.__stop_logging_in()
+        if response is None:
             show_message_box("Could not connect to the server.")
-            print(e)
-            return False
+            return
         if response.status_code == 401:
             show_message_box("Incorrect password.")
-            return False
+            return
         if response.status_code == 404:
             show_message_box("No account is associated with this email address.")
-            return False
+            return
         if not response:
             show_message_box(
                 f"Unknown error when logging in. Status code: {response.status_code}"
             )
-            return False
+            return
         data = response.json()
         user.name = data["name"]
         user.email = email
@@ -146,13 +217,22 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 print(f"Unknown service: {s}")
         user.genre_habits = data["genre_habits"]
+        user.declined_movies.open(email)
+        user.declined_movies.merge(data.get("declined", []))
+        habits_sync.open(email)
+        movies.genres = self.get_top_3_genres()
         print("Logged in successfully.")
-        return True
+        on_logged_in()
 
     def show_start_menu(self) -> None:
         self.central_widget.setCurrentWidget(self.start_menu)
 
     def show_account_creation_menu(self) -> None:
+        if self.account_creation_menu is None:
+            from moviefinder.account_creation_menu import AccountCreationMenu
+
+            self.account_creation_menu = AccountCreationMenu(self)
+            self.central_widget.addWidget(self.account_creation_menu)
         self.central_widget.setCurrentWidget(self.account_creation_menu)
 
     def show_login_menu(self) -> None:
@@ -162,6 +242,11 @@ class MainWindow(QtWidgets.QMainWindow):
         email and password were retrieved from their device's config files (if they
         chose to stay logged in), this method will show the browse menu instead.
         """
+        if self.login_menu is None:
+            from moviefinder.login_menu import LoginMenu
+
+            self.login_menu = LoginMenu(self)
+            self.central_widget.addWidget(self.login_menu)
         self.central_widget.setCurrentWidget(self.login_menu)
 
     def show_logged_in_start_menu(self) -> None:
@@ -172,6 +257,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 user.clear()
                 self.show_start_menu()
                 return
+            from moviefinder.logged_in_start_menu import LoggedInStartMenu
+
             self.logged_in_start_menu = LoggedInStartMenu(self)
             self.central_widget.addWidget(self.logged_in_start_menu)
         self.central_widget.setCurrentWidget(self.logged_in_start_menu)
@@ -186,6 +273,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 user.clear()
                 self.show_start_menu()
                 return
+            from moviefinder.settings_menu import SettingsMenu
+
             self.settings_menu = SettingsMenu(self)
             self.central_widget.addWidget(self.settings_menu)
         self.settings_menu.from_menu_name = from_menu_name
@@ -200,13 +289,24 @@ class MainWindow(QtWidgets.QMainWindow):
                 print(f"    User: {user.__dict__}")
                 self.show_start_menu()
                 return
-            with LoadingDialog():
-                if not movies.load():
-                    show_message_box("Cannot connect to the service.")
-                    self.show_settings_menu("LoggedInStartMenu")
-                    return
-                self.browse_menu = BrowseMenu(self)
-                self.central_widget.addWidget(self.browse_menu)
+            from moviefinder.browse_menu import BrowseMenu
+            from moviefinder.movies import movies
+            from moviefinder.session_snapshot import session_snapshot
+
+            # The last session's movies are shown right away and checked afterwards.
+            is_restored = False
+            if not movies and (state := session_snapshot.load(user.email)) is not None:
+                is_restored = movies.restore(state)
+            if not is_restored:
+                with LoadingDialog():
+                    if not movies.load():
+                        show_message_box("Cannot connect to the service.")
+                        self.show_settings_menu("LoggedInStartMenu")
+                        return
+            self.browse_menu = BrowseMenu(self)
+            self.central_widget.addWidget(self.browse_menu)
+            if is_restored:
+                self.browse_menu.refresh_restored_movies()
         self.central_widget.setCurrentWidget(self.browse_menu)
 
     def show_about_dialog(self) -> None:
@@ -247,26 +347,23 @@ class MainWindow(QtWidgets.QMainWindow):
             )
         )
 
-    def __attempt_log_in(self, email: str, password: str) -> bool:
-        """Validates the email & password, gets user data from the service, & logs in.
-
-        Returns True if successful, False otherwise.
-        """
+    def __attempt_log_in(self, email: str, password: str) -> None:
+        """Validates the email & password and starts logging in if they're valid."""
         print("Attempting to log in...")
         if EmailValidator().validate(email) != QtGui.QValidator.Acceptable:
             print("Invalid email format.")
-            return False
+            return
         elif PasswordValidator().validate(password) != QtGui.QValidator.Acceptable:
             print("Invalid password format.")
-            return False
-        if not self.load_user_data(email, password):
-            print("Unable to load user data.")
-            return False
-        movies.genres = self.get_top_3_genres()
-        print("Logged in successfully.")
-        return True
+            return
+        self.log_in(email, password, self.show_logged_in_start_menu)
 
     def log_out(self) -> None:
+        self.clear_movies()
+        if "moviefinder.movies" in sys.modules:  # if any movies were loaded
+            from moviefinder.movies_model import forget_movies
+
+            forget_movies()
         if self.browse_menu is not None:
             if self.browse_menu.browse_widget.movie_menu is not None:
                 self.central_widget.removeWidget(
@@ -277,9 +374,14 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.settings_menu is not None:
             self.central_widget.removeWidget(self.settings_menu)
             self.settings_menu = None
-        user.save_genre_habits_and_declined_movies()
+        from moviefinder.habits_sync import habits_sync
+
+        habits_sync.close()
+        if user.email:
+            from moviefinder.session_snapshot import session_snapshot
+
+            session_snapshot.delete(user.email)
         user.clear()
-        self.clear_movies()
         settings = QtCore.QSettings()
         if settings.contains("user/email"):
             settings.remove("user/email")
@@ -293,13 +395,18 @@ class MainWindow(QtWidgets.QMainWindow):
             "https://github.com/chizuo/COMP587-MovieApplication/releases"
         )
 
-    def create_options_button(self, parent: QtWidgets.QWidget) -> QtWidgets.QToolButton:
+    def create_options_button(
+        self, parent: QtWidgets.QWidget, include_settings: bool = True
+    ) -> QtWidgets.QToolButton:
         """Creates and connects an options toolbutton.
 
         Parameters
         ----------
         parent : QtWidgets.QWidget
             The widget that will be the parent of the options button.
+        include_settings : bool
+            Whether the options menu has an action that opens the settings menu.
+            Defaults to True.
         """
         options_button = QtWidgets.QToolButton()
         options_button.setArrowType(QtCore.Qt.NoArrow)  # This doesn't seem to work?
@@ -313,7 +420,7 @@ class MainWindow(QtWidgets.QMainWindow):
         parent.update_action = QtGui.QAction("Check for updates")
         parent.options_menu.addAction(parent.update_action)
         parent.update_action.triggered.connect(self.open_downloads_site)
-        if not isinstance(parent, SettingsMenu):
+        if include_settings:
             parent.settings_action = QtGui.QAction("Settings")
             parent.options_menu.addAction(parent.settings_action)
             parent.settings_action.triggered.connect(
@@ -330,8 +437,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def clear_movies(self) -> None:
         if self.browse_menu is not None:
-            self.browse_menu.browse_widget.movie_widgets.clear()
-            movies.clear()
+            self.browse_menu.browse_widget.movies_model.clear()
 
     def get_top_3_genres(self) -> list[str]:
         """Returns the 3 genres in which the user has liked the most movies.
@@ -1,17 +1,47 @@
+import sys
 from html import escape
 from typing import NoReturn
 
-import requests
 from moviefinder.country_code import CountryCode
 from moviefinder.dev_settings import POSTER_HEIGHT
 from moviefinder.dev_settings import POSTER_WIDTH
 from moviefinder.service_name import ServiceName
-from PySide6 import QtGui
-
+from moviefinder.vocabulary import genre_vocabulary
+from moviefinder.vocabulary import region_vocabulary
+from moviefinder.vocabulary import service_vocabulary
 
 
 class Movie:
-    """A movie or a show."""
+    """A movie's or a show's catalog info.
+
+    To keep many movies in memory at once, movies have no ``__dict__``. Their genres,
+    regions, and services are stored as bitmasks of the vocabularies in
+    ``moviefinder.vocabulary``, and people's names are interned and stored in tuples.
+    The ``genres``, ``regions``, and ``services`` properties decode the bitmasks.
+    Movies' poster pixmaps are kept by ``poster_fetcher.poster_loader``, not here.
+    """
+
+    __slots__ = (
+        "__ok",
+        "hearted",
+        "xed",
+        "id",
+        "title",
+        "genre_mask",
+        "region_mask",
+        "service_mask",
+        "video_url",
+        "imdb_rating_percent",
+        "imdb_vote_count",
+        "poster_url",
+        "release_year",
+        "runtime_minutes",
+        "cast",
+        "directors",
+        "writers",
+        "overview",
+        "tagline",
+    )
 
     def __init__(self, movie_info: dict):
         self.__ok = True
@@ -28,26 +58,28 @@ class Movie:
             return
         self.id: str = movie_info["imdbID"]
         self.title: str = movie_info["title"]
-        self.genres: list[str] = [genre.lower() for genre in movie_info["genres"]]
-        self.regions: list[CountryCode] = []
+        self.genre_mask: int = genre_vocabulary.mask(
+            genre.lower() for genre in movie_info["genres"]
+        )
+        self.region_mask = 0
         for region in movie_info["countries"]:
             region = region.upper()
             try:
-                self.regions.append(CountryCode[region])
+                self.region_mask |= region_vocabulary.bit(CountryCode[region])
             except KeyError:
                 print(f"Unknown region: {region}")
-        self.services: dict[ServiceName, str] = {}  # maps names to video URLs
-        url: str = movie_info["videoURL"].lower()
-        if "amazon.com" in url:
-            self.services[ServiceName.AMAZON_PRIME] = url
-        elif "tv.apple.com" in url:
-            self.services[ServiceName.APPLE_TV_PLUS] = url
-        elif "disneyplus.com" in url:
-            self.services[ServiceName.DISNEY_PLUS] = url
-        elif "hulu.com" in url:
-            self.services[ServiceName.HULU] = url
-        elif "netflix.com" in url:
-            self.services[ServiceName.NETFLIX] = url
+        self.video_url: str = movie_info["videoURL"].lower()
+        self.service_mask = 0
+        if "amazon.com" in self.video_url:
+            self.service_mask = service_vocabulary.bit(ServiceName.AMAZON_PRIME)
+        elif "tv.apple.com" in self.video_url:
+            self.service_mask = service_vocabulary.bit(ServiceName.APPLE_TV_PLUS)
+        elif "disneyplus.com" in self.video_url:
+            self.service_mask = service_vocabulary.bit(ServiceName.DISNEY_PLUS)
+        elif "hulu.com" in self.video_url:
+            self.service_mask = service_vocabulary.bit(ServiceName.HULU)
+        elif "netflix.com" in self.video_url:
+            self.service_mask = service_vocabulary.bit(ServiceName.NETFLIX)
         self.imdb_rating_percent: int = -1
         if "imdbRating" in movie_info:
             self.imdb_rating_percent = movie_info["imdbRating"]
@@ -61,34 +93,21 @@ class Movie:
             w = POSTER_WIDTH
             t = escape(self.title)
             self.poster_url = f"https://via.placeholder.com/{w}x{h}.png?text={t}"
-        response = requests.get(self.poster_url)
-        if not response:
-            self.__ok = False
-            print(
-                f'Error: unable to get "{self.title}"\'s poster from'
-                f' url "{self.poster_url}".'
-            )
-            return
-        if not qApp:  # type: ignore # noqa: F821
-            return
-        self.poster_pixmap = QtGui.QPixmap()
-        self.poster_pixmap.loadFromData(response.content)
-        self.poster_pixmap.scaledToWidth(5)
         self.release_year: int = -1
         if "year" in movie_info:
             self.release_year = movie_info["year"]
         self.runtime_minutes: int = -1
         if "runtime" in movie_info:
             self.runtime_minutes = movie_info["runtime"]
-        self.cast: list[str] = []
+        self.cast: tuple[str, ...] = ()
         if "cast" in movie_info:
-            self.cast = movie_info["cast"]
-        self.directors: list[str] = []
+            self.cast = tuple(sys.intern(name) for name in movie_info["cast"])
+        self.directors: tuple[str, ...] = ()
         if "director" in movie_info:
-            self.directors = movie_info["director"]
-        self.writers: list[str] = []
+            self.directors = tuple(sys.intern(name) for name in movie_info["director"])
+        self.writers: tuple[str, ...] = ()
         if "writer" in movie_info:
-            self.writers = movie_info["writer"]
+            self.writers = tuple(sys.intern(name) for name in movie_info["writer"])
         self.overview: str = ""
         if "overview" in movie_info:
             self.overview = movie_info["overview"]
@@ -96,6 +115,102 @@ class Movie:
         if "tagline" in movie_info:
             self.tagline = movie_info["tagline"]
 
+    @property
+    def genres(self) -> list[str]:
+        return genre_vocabulary.values(self.genre_mask)
+
+    @property
+    def regions(self) -> list[CountryCode]:
+        return region_vocabulary.values(self.region_mask)
+
+    @property
+    def services(self) -> dict[ServiceName, str]:
+        """Maps the names of the services the movie is on to its video URLs."""
+        return {
+            service: self.video_url
+            for service in service_vocabulary.values(self.service_mask)
+        }
+
+    def snapshot(self) -> tuple:
+        """Returns the movie's info as a tuple of ints, strings, and lists of strings.
+
+        Genres, regions, and services are saved by name instead of by bitmask because
+        the genre vocabulary's bits can differ between runs of the app.
+        """
+        return (
+            self.id,
+            self.title,
+            self.genres,
+            [region.name for region in self.regions],
+            [service.name for service in service_vocabulary.values(self.service_mask)],
+            self.video_url,
+            self.imdb_rating_percent,
+            self.imdb_vote_count,
+            self.poster_url,
+            self.release_year,
+            self.runtime_minutes,
+            list(self.cast),
+            list(self.directors),
+            list(self.writers),
+            self.overview,
+            self.tagline,
+            self.hearted,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple) -> "Movie":
+        """Creates a movie from what ``snapshot`` returned.
+
+        Raises ValueError if the snapshot is invalid.
+        """
+        try:
+            (
+                movie_id,
+                title,
+                genres,
+                regions,
+                services,
+                video_url,
+                imdb_rating_percent,
+                imdb_vote_count,
+                poster_url,
+                release_year,
+                runtime_minutes,
+                cast,
+                directors,
+                writers,
+                overview,
+                tagline,
+                hearted,
+            ) = snapshot
+            movie = cls.__new__(cls)
+            movie.__ok = True
+            movie.hearted = bool(hearted)
+            movie.xed = False
+            movie.id = movie_id
+            movie.title = title
+            movie.genre_mask = genre_vocabulary.mask(genres)
+            movie.region_mask = region_vocabulary.mask(
+                CountryCode[region] for region in regions
+            )
+            movie.service_mask = service_vocabulary.mask(
+                ServiceName[service] for service in services
+            )
+            movie.video_url = video_url
+            movie.imdb_rating_percent = imdb_rating_percent
+            movie.imdb_vote_count = imdb_vote_count
+            movie.poster_url = poster_url
+            movie.release_year = release_year
+            movie.runtime_minutes = runtime_minutes
+            movie.cast = tuple(sys.intern(name) for name in cast)
+            movie.directors = tuple(sys.intern(name) for name in directors)
+            movie.writers = tuple(sys.intern(name) for name in writers)
+            movie.overview = overview
+            movie.tagline = tagline
+        except (TypeError, ValueError, KeyError) as e:
+            raise ValueError(f"invalid movie snapshot: {e!r}") from e
+        return movie
+
     def __bool__(self) -> bool:
         return self.__ok
 
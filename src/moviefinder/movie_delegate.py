@@ -0,0 +1,121 @@
+from moviefinder.dev_settings import POSTER_HEIGHT
+from moviefinder.dev_settings import POSTER_WIDTH
+from moviefinder.movies_model import MoviesModel
+from moviefinder.resources import empty_heart_icon_path
+from moviefinder.resources import filled_heart_icon_path
+from moviefinder.resources import red_x_icon_path
+from PySide6 import QtCore
+from PySide6 import QtGui
+from PySide6 import QtWidgets
+
+
+class MovieDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints one movie's poster with heart and x buttons under it.
+
+    Instead of each movie having its own widgets, the view asks this delegate to paint
+    only the movies that are visible. Clicks on the poster and on the buttons emit
+    signals with the movie's ID.
+    """
+
+    poster_clicked = QtCore.Signal(str)
+    heart_clicked = QtCore.Signal(str)
+    x_clicked = QtCore.Signal(str)
+
+    __BUTTON_HEIGHT = 34
+    __BUTTON_ICON_SIZE = QtCore.QSize(20, 20)
+    __SPACING = 5
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        QtWidgets.QStyledItemDelegate.__init__(self, parent)
+        self.__empty_heart_icon = QtGui.QIcon(empty_heart_icon_path)
+        self.__filled_heart_icon = QtGui.QIcon(filled_heart_icon_path)
+        self.__x_icon = QtGui.QIcon(red_x_icon_path)
+
+    def sizeHint(
+        self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        return QtCore.QSize(
+            POSTER_WIDTH, POSTER_HEIGHT + self.__SPACING + self.__BUTTON_HEIGHT
+        )
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        poster_rect, heart_rect, x_rect = self.__rects(option.rect)
+        poster_pixmap: QtGui.QPixmap = index.data(QtCore.Qt.DecorationRole)
+        hearted: bool = index.data(MoviesModel.HEARTED_ROLE)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        poster_size = poster_pixmap.size().scaled(
+            poster_rect.size(), QtCore.Qt.KeepAspectRatio
+        )
+        centered_poster_rect = QtCore.QRect(QtCore.QPoint(0, 0), poster_size)
+        centered_poster_rect.moveCenter(poster_rect.center())
+        painter.drawPixmap(centered_poster_rect, poster_pixmap)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor("#424242"))
+        for button_rect in (heart_rect, x_rect):
+            painter.drawRoundedRect(button_rect, 3, 3)
+        heart_icon = self.__filled_heart_icon if hearted else self.__empty_heart_icon
+        heart_icon.paint(painter, self.__icon_rect(heart_rect))
+        self.__x_icon.paint(
+            painter,
+            self.__icon_rect(x_rect),
+            mode=QtGui.QIcon.Disabled if hearted else QtGui.QIcon.Normal,
+        )
+        painter.restore()
+
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        if (
+            event.type() != QtCore.QEvent.MouseButtonRelease
+            or event.button() != QtCore.Qt.LeftButton
+        ):
+            return False
+        movie_id: str = index.data(MoviesModel.MOVIE_ID_ROLE)
+        poster_rect, heart_rect, x_rect = self.__rects(option.rect)
+        position = event.position().toPoint()
+        if poster_rect.contains(position):
+            self.poster_clicked.emit(movie_id)
+        elif heart_rect.contains(position):
+            self.heart_clicked.emit(movie_id)
+        elif x_rect.contains(position):
+            if not index.data(MoviesModel.HEARTED_ROLE):
+                self.x_clicked.emit(movie_id)
+        else:
+            return False
+        return True
+
+    def __rects(
+        self, item_rect: QtCore.QRect
+    ) -> tuple[QtCore.QRect, QtCore.QRect, QtCore.QRect]:
+        """Returns the poster's, heart button's, and x button's areas in an item."""
+        poster_rect = QtCore.QRect(
+            item_rect.topLeft(), QtCore.QSize(POSTER_WIDTH, POSTER_HEIGHT)
+        )
+        button_width = (POSTER_WIDTH - self.__SPACING) // 2
+        buttons_top = poster_rect.bottom() + 1 + self.__SPACING
+        heart_rect = QtCore.QRect(
+            item_rect.left(), buttons_top, button_width, self.__BUTTON_HEIGHT
+        )
+        x_rect = QtCore.QRect(
+            heart_rect.right() + 1 + self.__SPACING,
+            buttons_top,
+            button_width,
+            self.__BUTTON_HEIGHT,
+        )
+        return poster_rect, heart_rect, x_rect
+
+    def __icon_rect(self, button_rect: QtCore.QRect) -> QtCore.QRect:
+        """Returns the area of an icon centered in a button."""
+        icon_rect = QtCore.QRect(QtCore.QPoint(0, 0), self.__BUTTON_ICON_SIZE)
+        icon_rect.moveCenter(button_rect.center())
+        return icon_rect
@@ -0,0 +1,57 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import Movie
+from moviefinder.service_name import ServiceName
+from moviefinder.vocabulary import genre_vocabulary
+from moviefinder.vocabulary import region_vocabulary
+from moviefinder.vocabulary import service_vocabulary
+
+
+@dataclass(frozen=True)
+class MovieFilter:
+    """Chooses the movies that are in a region, on a service, and in a genre.
+
+    A movie matches if it has the region and at least one of the services and one of
+    the genres. The region, services, and genres are stored as bitmasks like movies'
+    are, so checking a movie takes three bitwise ANDs.
+    """
+
+    region_mask: int
+    service_mask: int
+    genre_mask: int
+
+    @classmethod
+    def create(
+        cls,
+        region: CountryCode | None,
+        services: Iterable[ServiceName],
+        genres: Iterable[str],
+    ) -> "MovieFilter":
+        """Creates a filter for a region, services, and lowercase genres."""
+        return cls(
+            region_vocabulary.bit(region) if region is not None else 0,
+            service_vocabulary.mask(services),
+            genre_vocabulary.mask(genres),
+        )
+
+    def matches(self, movie: Movie) -> bool:
+        return bool(
+            movie.region_mask & self.region_mask
+            and movie.service_mask & self.service_mask
+            and movie.genre_mask & self.genre_mask
+        )
+
+    def filter(self, movies: Iterable[Movie]) -> list[Movie]:
+        """Returns the movies that match, in the same order."""
+        region_mask = self.region_mask
+        service_mask = self.service_mask
+        genre_mask = self.genre_mask
+        return [
+            movie
+            for movie in movies
+            if movie.region_mask & region_mask
+            and movie.service_mask & service_mask
+            and movie.genre_mask & genre_mask
+        ]
@@ -5,14 +5,20 @@ from textwrap import dedent
 from moviefinder.abstract_movie_widget import AbstractMovieWidget
 from moviefinder.buttons import init_buttons
 from moviefinder.country_code import CountryCode
+from moviefinder.dev_settings import POSTER_HEIGHT
+from moviefinder.dev_settings import POSTER_WIDTH
+from moviefinder.habits_sync import habits_sync
 from moviefinder.movie import Movie
 from moviefinder.movies import movies
+from moviefinder.poster_fetcher import placeholder_poster
+from moviefinder.poster_fetcher import poster_loader
 from moviefinder.resources import corner_up_left_arrow_icon_path
 from moviefinder.resources import filled_heart_icon_path
 from moviefinder.scaled_label import ScaledLabel
 from moviefinder.service_name import ServiceName
-from moviefinder.user import user
+from moviefinder.similar_movies import similar_movies
 from moviefinder.validators import valid_services
+from PySide6 import QtCore
 from PySide6 import QtGui
 from PySide6 import QtWidgets
 from PySide6.QtCore import Qt
@@ -22,7 +28,8 @@ class MovieMenu(AbstractMovieWidget):
     """A menu that displays info about one movie or show.
 
     After creating an MovieMenu object, call ``update_movie_data`` to choose which movie
-    or show it should display when opened.
+    or show it should display when opened. Below the movie's info, a row of the most
+    similar loaded movies can be clicked to show them instead.
     """
 
     def __init__(self, main_window: QtWidgets.QMainWindow):
@@ -72,6 +79,20 @@ class MovieMenu(AbstractMovieWidget):
             QtWidgets.QSizePolicy.MinimumExpanding,
         )
         self.right_layout.addWidget(self.text_browser)
+        self.similar_label = QtWidgets.QLabel("<h2>More like this</h2>", self)
+        self.right_layout.addWidget(self.similar_label)
+        self.similar_list = QtWidgets.QListWidget(self)
+        self.similar_list.setViewMode(QtWidgets.QListView.IconMode)
+        self.similar_list.setFlow(QtWidgets.QListView.LeftToRight)
+        self.similar_list.setWrapping(False)
+        self.similar_list.setMovement(QtWidgets.QListView.Static)
+        self.similar_list.setTextElideMode(Qt.ElideRight)
+        icon_size = QtCore.QSize(POSTER_WIDTH // 3, POSTER_HEIGHT // 3)
+        self.similar_list.setIconSize(icon_size)
+        self.similar_list.setGridSize(icon_size + QtCore.QSize(30, 30))
+        self.similar_list.setFixedHeight(icon_size.height() + 60)
+        self.similar_list.itemClicked.connect(self.__show_similar_movie)
+        self.right_layout.addWidget(self.similar_list)
         self.movie_layout.addLayout(self.left_layout)
         self.movie_layout.addLayout(self.right_layout)
         self.layout.addLayout(self.movie_layout)
@@ -124,8 +145,44 @@ class MovieMenu(AbstractMovieWidget):
         self.reconnect_service_button(
             ServiceName.NETFLIX, services, self.netflix_button
         )
+        self.__update_similar_movies()
         return True
 
+    def __update_similar_movies(self) -> None:
+        """Shows the loaded movies most similar to this menu's movie, if any."""
+        self.similar_list.clear()
+        assert self.movie_id is not None
+        for similar_id in similar_movies.similar(self.movie_id, movie_ids=movies):
+            similar_movie = movies[similar_id]
+            poster_pixmap = poster_loader.poster_pixmap(similar_id)
+            if poster_pixmap is None:
+                poster_loader.request(similar_movie)
+                poster_pixmap = placeholder_poster()
+            item = QtWidgets.QListWidgetItem(
+                QtGui.QIcon(poster_pixmap), similar_movie.title
+            )
+            item.setData(Qt.UserRole, similar_id)
+            item.setToolTip(similar_movie.title)
+            self.similar_list.addItem(item)
+        has_similar_movies = self.similar_list.count() > 0
+        self.similar_label.setVisible(has_similar_movies)
+        self.similar_list.setVisible(has_similar_movies)
+
+    def update_similar_poster(self, movie_id: str) -> None:
+        """Shows a similar movie's poster after it's loaded."""
+        poster_pixmap = poster_loader.poster_pixmap(movie_id)
+        if poster_pixmap is None:
+            return
+        for i in range(self.similar_list.count()):
+            item = self.similar_list.item(i)
+            if item.data(Qt.UserRole) == movie_id:
+                item.setIcon(QtGui.QIcon(poster_pixmap))
+
+    def __show_similar_movie(self, item: QtWidgets.QListWidgetItem) -> None:
+        movie_id = item.data(Qt.UserRole)
+        if movie_id in movies:
+            self.main_window.browse_menu.browse_widget.show_movie_menu(movie_id)
+
     def reconnect_service_button(
         self,
         service: ServiceName,
@@ -151,8 +208,7 @@ class MovieMenu(AbstractMovieWidget):
         if not movies[self.movie_id].hearted:
             movies[self.movie_id].hearted = True
             self.heart_button.setIcon(QtGui.QIcon(filled_heart_icon_path))
-            for genre in movies[self.movie_id].genres:
-                user.genre_habits[genre] += 1
+            habits_sync.change_genre_habits(movies[self.movie_id].genres, 1)
         webbrowser.open_new_tab(movies[self.movie_id].services[service])
 
     def is_valid_movie(self, movie_id: str) -> bool:
@@ -204,7 +260,7 @@ class MovieMenu(AbstractMovieWidget):
             assert movie.runtime_minutes, "Error: runtime_minutes is falsy"
             assert movie.cast, "Error: cast is falsy"
             assert isinstance(
-                movie.cast, list
+                movie.cast, tuple
             ), f"Type error: cast is a {type(movie.cast)}"
             if movie.cast:
                 assert isinstance(
@@ -212,7 +268,7 @@ class MovieMenu(AbstractMovieWidget):
                 ), f"Type error: cast[0] is a {type(movie.cast[0])}"
             assert movie.directors, "Error: directors is falsy"
             assert isinstance(
-                movie.directors, list
+                movie.directors, tuple
             ), f"Type error: directors is a {type(movie.directors)}"
             if movie.directors:
                 assert isinstance(
@@ -0,0 +1,94 @@
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from math import sqrt
+
+from moviefinder.movie import Movie
+from moviefinder.vocabulary import genre_vocabulary
+
+
+@dataclass(frozen=True)
+class MovieRanker:
+    """Scores movies by how well they match the user's genre habits and their ratings.
+
+    A movie's genre score is the cosine similarity of its genres and the genre habits,
+    so movies in the genres the user likes most score highest no matter how many genres
+    they have. The habits are stored as weights indexed by the genres' bit positions in
+    ``genre_vocabulary``, so scoring a movie only adds the weights of its genre mask's
+    set bits. A movie's rating score is its IMDb rating, pulled towards an average
+    rating when it has few votes.
+
+    A score is combined from a genre match, which only changes when the habits of the
+    movie's genres change, and a rating score, which never changes. Callers that keep
+    these parts only need to recompute the genre matches of the movies in the genres
+    whose habits changed.
+    """
+
+    genre_weights: tuple[float, ...]  # habits by genre bit position
+    genre_weights_length: float  # for normalizing the genre matches
+
+    GENRE_SHARE = 0.75  # how much of the score is the genre score
+    PRIOR_RATING_PERCENT = 60  # the rating of movies without ratings or votes
+    PRIOR_VOTE_COUNT = 1000  # the votes a movie needs for its rating to count half
+
+    @classmethod
+    def create(cls, genre_habits: Mapping[str, int]) -> "MovieRanker":
+        """Creates a ranker for genre habits. Negative habits count as 0."""
+        weights: list[float] = []
+        for genre, habit in genre_habits.items():
+            index = genre_vocabulary.bit(genre).bit_length() - 1
+            if index < 0:
+                continue
+            if index >= len(weights):
+                weights.extend([0.0] * (index + 1 - len(weights)))
+            weights[index] = max(habit, 0)
+        length = sqrt(sum(weight * weight for weight in weights))
+        return cls(tuple(weights), length)
+
+    def score(self, movie: Movie) -> float:
+        """Returns a score from 0 to 1 of how much the user may like a movie."""
+        return self.combine(self.genre_match(movie), self.rating_score(movie))
+
+    def combine(self, genre_match: float, rating_score: float) -> float:
+        """Returns the score of a movie from its genre match and rating score."""
+        genre_score = 0.0
+        if self.genre_weights_length:
+            genre_score = genre_match / self.genre_weights_length
+        return self.GENRE_SHARE * genre_score + (1 - self.GENRE_SHARE) * rating_score
+
+    def genre_match(self, movie: Movie) -> float:
+        """Returns how well a movie's genres match the habits, before normalizing.
+
+        The match is the sum of the habits of the movie's genres divided by the square
+        root of the movie's genre count.
+        """
+        genre_match = 0.0
+        mask = movie.genre_mask
+        if mask:
+            weights = self.genre_weights
+            while mask:
+                lowest_bit = mask & -mask
+                index = lowest_bit.bit_length() - 1
+                if index < len(weights):
+                    genre_match += weights[index]
+                mask ^= lowest_bit
+            genre_match /= sqrt(movie.genre_mask.bit_count())
+        return genre_match
+
+    def rating_score(self, movie: Movie) -> float:
+        """Returns a movie's rating from 0 to 1, pulled towards the prior rating."""
+        rating_percent: float = self.PRIOR_RATING_PERCENT
+        if movie.imdb_rating_percent >= 0 and movie.imdb_vote_count > 0:
+            votes = movie.imdb_vote_count
+            rating_percent = (
+                votes * movie.imdb_rating_percent
+                + self.PRIOR_VOTE_COUNT * self.PRIOR_RATING_PERCENT
+            ) / (votes + self.PRIOR_VOTE_COUNT)
+        return rating_percent / 100
+
+    def rank(self, movies: Iterable[Movie]) -> list[Movie]:
+        """Returns the movies from the highest to the lowest score.
+
+        Movies with equal scores keep their order.
+        """
+        return sorted(movies, key=self.score, reverse=True)
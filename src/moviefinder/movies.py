@@ -1,19 +1,147 @@
+import codecs
 import json
 from collections import UserDict
+from collections.abc import Callable
+from collections.abc import Iterable
 from collections.abc import Iterator
-from random import shuffle
+from dataclasses import dataclass
 from threading import Lock
 from typing import Any
 from typing import final
 from typing import NoReturn
 from typing import Optional
 
-import requests
+from moviefinder.catalog_cache import catalog_cache
+from moviefinder.catalog_mirror import catalog_mirror
+from moviefinder.country_code import CountryCode
+from moviefinder.dev_settings import MOVIES_STREAM_CHUNK_SIZE
+from moviefinder.dev_settings import PREFETCHED_PAGE_COUNT
 from moviefinder.dev_settings import SERVICE_BASE_URL
+from moviefinder.dev_settings import STREAMED_MOVIES_BATCH_SIZE
+from moviefinder.dev_settings import USE_CATALOG_MIRROR
 from moviefinder.dev_settings import USE_MOCK_DATA
+from moviefinder.json_stream import JsonArrayStreamParser
 from moviefinder.movie import Movie
+from moviefinder.movie_filter import MovieFilter
+from moviefinder.movie_ranker import MovieRanker
 from moviefinder.resources import sample_movies_json_path
+from moviefinder.search_index import search_index
+from moviefinder.service_client import session
+from moviefinder.service_name import ServiceName
+from moviefinder.similar_movies import similar_movies
+from moviefinder.task_executor import Task
+from moviefinder.task_executor import task_executor
+from moviefinder.task_executor import TaskPriority
 from moviefinder.user import user
+from moviefinder.vocabulary import GENRES
+
+
+class _KeyOrder:
+    """An ordered set of keys that can find, and delete, keys by position quickly.
+
+    Keys are kept in slots in order. Deleting a key empties its slot instead of moving
+    the keys after it, and a Fenwick tree counts the filled slots before each slot, so
+    finding a key's position, finding the key at a position, and deleting a key take
+    logarithmic time. Appending a key takes logarithmic time too. The empty slots are
+    removed once they are at least half of the slots, which takes amortized constant
+    time per deletion and doesn't change any key's position.
+    """
+
+    __MIN_COMPACTED_SLOT_COUNT = 64  # fewer empty slots than this are never removed
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.__build(list(dict.fromkeys(keys)))
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self.__keys if key is not None)
+
+    def append(self, key: str) -> None:
+        """Adds a key at the end unless it's already in the order."""
+        if key in self.__slots:
+            return
+        self.__keys.append(key)
+        slot_number = len(self.__keys)  # the tree's indexes start at 1
+        lowest_bit = slot_number & -slot_number
+        # A tree node counts the filled slots of a range that ends at its own slot.
+        self.__tree.append(
+            1 + self.__count(slot_number - 1) - self.__count(slot_number - lowest_bit)
+        )
+        self.__slots[key] = slot_number - 1
+
+    def remove(self, key: str) -> None:
+        """Deletes a key. Raises KeyError if it isn't in the order."""
+        slot = self.__slots.pop(key)
+        self.__keys[slot] = None
+        i = slot + 1
+        while i < len(self.__tree):
+            self.__tree[i] -= 1
+            i += i & -i
+        empty_slot_count = len(self.__keys) - len(self.__slots)
+        if (
+            empty_slot_count >= self.__MIN_COMPACTED_SLOT_COUNT
+            and empty_slot_count * 2 >= len(self.__keys)
+        ):
+            self.__build(list(self))
+
+    def index(self, key: str) -> int:
+        """Returns a key's position. Raises KeyError if it isn't in the order."""
+        return self.__count(self.__slots[key])
+
+    def key_at(self, index: int) -> str:
+        """Returns the key at a position. Raises IndexError if there isn't one."""
+        if not 0 <= index < len(self.__slots):
+            raise IndexError(index)
+        # Finds the last slot number whose slots before it have at most ``index`` keys.
+        slot_number = 0
+        remaining = index + 1
+        step = 1 << (len(self.__tree) - 1).bit_length()
+        while step:
+            next_number = slot_number + step
+            if next_number < len(self.__tree) and self.__tree[next_number] < remaining:
+                slot_number = next_number
+                remaining -= self.__tree[next_number]
+            step >>= 1
+        key = self.__keys[slot_number]
+        assert key is not None
+        return key
+
+    def keys(self, start: int, stop: int) -> list[str]:
+        """Returns the keys from one position to another, not including the last."""
+        stop = min(stop, len(self.__slots))
+        if start >= stop:
+            return []
+        keys: list[str] = []
+        slot = self.__slots[self.key_at(start)]
+        while len(keys) < stop - start:
+            key = self.__keys[slot]
+            if key is not None:
+                keys.append(key)
+            slot += 1
+        return keys
+
+    def __count(self, slot_count: int) -> int:
+        """Returns how many keys are in the first slots."""
+        count = 0
+        i = slot_count
+        while i:
+            count += self.__tree[i]
+            i -= i & -i
+        return count
+
+    def __build(self, keys: list[str]) -> None:
+        self.__keys: list[str | None] = list(keys)  # None in the empty slots
+        self.__slots = {key: slot for slot, key in enumerate(keys)}  # of the keys
+        self.__tree = [0] + [1] * len(keys)  # the tree's indexes start at 1
+        for i in range(1, len(self.__tree)):
+            parent = i + (i & -i)
+            if parent < len(self.__tree):
+                self.__tree[parent] += self.__tree[i]
 
 
 @final
@@ -22,7 +150,25 @@ class _Movies(UserDict):
 
     The keys are movie IDs (strings) and the values are Movie objects. Although this is
     a dictionary, you can iterate over it at a starting index of your choice using the
-    ``enum_items`` method.
+    ``range`` method.
+
+    The keys' order is kept in a ``_KeyOrder``, so adding, deleting, and finding keys
+    and their positions never take longer than logarithmic time, even while the user is
+    declining movies one after another.
+
+    Every valid movie received from the service is also kept in a pool, even if it
+    doesn't match the chosen genres, so that changing the genres can show the pooled
+    movies that match right away. Pages are requested for the genres that were chosen
+    when the first page was requested, so narrowing the genres keeps loading the same
+    pages instead of requesting new ones.
+
+    The service sorts movies by year, so each batch of received movies is ranked by how
+    well the movies match the user's genre habits before being added. Changing the
+    genres ranks all of the matching movies at once.
+
+    With ``USE_CATALOG_MIRROR``, the whole catalog of the user's region and services is
+    synced to ``catalog_mirror`` in the background, and once it has been synced, pages
+    are read from it instead of being requested from the service.
     """
 
     __instance: Optional["_Movies"] = None
@@ -40,16 +186,41 @@ class _Movies(UserDict):
         self.genres: list[str] = []
         self.total_pages: int | None = None
         self.current_page: int = 0
-        self.__keys: list[str] = []
+        self.__pool: dict[str, Movie] = {}
+        self.__requested_genres: list[str] = []  # the genres pages are requested for
+        self.__is_from_mirror = False  # whether the pages are read from catalog_mirror
+        self.__generation = 0  # changes each time the movies are cleared or re-filtered
+        self.__load_lock = Lock()  # held while loading so that one load runs at a time
+        self.__order = _KeyOrder()
+        # Maps keys to the genre matches and rating scores of ``rerank``, which were
+        # computed with the genre weights of ``self.__score_weights``.
+        self.__score_parts: dict[str, tuple[float, float]] = {}
+        self.__score_weights: tuple[float, ...] = ()
+        # Maps page numbers to the request body and response data of prefetched pages.
+        # Guarded by the lock because the loader and the GUI thread both change it.
+        self.__prefetched_pages: dict[
+            int, tuple[dict[str, Any], Task[dict[str, Any] | None]]
+        ] = {}
 
     def __setitem__(self, key: str, item: Movie) -> None:
-        if key not in self.__keys:
-            self.__keys.append(key)
-        return super().__setitem__(key, item)
+        with self.__lock:
+            self.__order.append(key)
+            return super().__setitem__(key, item)
 
     def __delitem__(self, key: str) -> None:
-        self.__keys.remove(key)
-        return super().__delitem__(key)
+        with self.__lock:
+            self.__order.remove(key)
+            return super().__delitem__(key)
+
+    def index(self, key: str) -> int:
+        """Returns the index of a movie key in the order that ``range`` yields keys."""
+        with self.__lock:
+            return self.__order.index(key)
+
+    def key_at(self, index: int) -> str:
+        """Returns the movie key at an index in the order that ``range`` yields keys."""
+        with self.__lock:
+            return self.__order.key_at(index)
 
     def range(self, start: int = 0, stop: int = -1) -> Iterator[str]:
         """Yields movie keys starting and stopping at the given indexes.
@@ -61,11 +232,11 @@ class _Movies(UserDict):
         stop : int
             The index to stop at. Defaults to -1 (the end).
         """
-        if stop == -1:
-            stop = len(self.__keys)
         with self.__lock:
-            for i in range(start, stop):
-                yield self.__keys[i]
+            if stop == -1:
+                stop = len(self.__order)
+            keys = self.__order.keys(start, stop)
+        yield from keys
 
     def __copy__(self) -> NoReturn:
         raise RuntimeError("The movies singleton object cannot be copied.")
@@ -76,26 +247,129 @@ class _Movies(UserDict):
     def clear(self) -> None:
         """Clears all movies and shows.
 
-        Always call ``browse_widget.movie_widgets.clear()`` immediately after or before
-        calling this method (you can just use ``main_window.clear_movies`` to do both).
+        Use ``main_window.clear_movies`` instead of calling this method directly so that
+        the browse widget's model is reset at the same time.
+        """
+        with self.__lock:
+            self.data.clear()
+            self.__order = _KeyOrder()
+            self.__pool.clear()
+            self.__score_parts.clear()
+            self.__generation += 1
+        similar_movies.clear()
+        self.__restart_pages()
+
+    def refilter(self, genres: list[str]) -> None:
+        """Chooses other genres and replaces the movies with the pooled ones that match.
+
+        The matching movies are ranked by ``movie_ranker``. Use ``MoviesModel.refilter``
+        instead of calling this method directly so that the browse widget's model is
+        reset at the same time. If any of the genres weren't chosen when the first page
+        was requested, the next ``load`` starts over from the first page of the new
+        genres. Otherwise, no new pages are needed.
         """
-        self.data.clear()
+        self.genres = genres
+        with self.__lock:
+            matching_movies = self.movie_ranker().rank(
+                self.movie_filter().filter(
+                    movie
+                    for movie in self.__pool.values()
+                    if movie.id not in user.declined_movies
+                )
+            )
+            self.data = {movie.id: movie for movie in matching_movies}
+            self.__order = _KeyOrder(self.data)
+            self.__generation += 1
+        if not set(genres) <= set(self.__requested_genres):
+            self.__restart_pages()
+
+    def rerank(self, start: int) -> None:
+        """Ranks the movies from an index to the end again after genre habits changed.
+
+        The movies before the index keep their places. Each movie's genre match and
+        rating score are kept between calls, so only the genre matches of the movies in
+        the genres whose habits changed are recomputed before the movies are sorted by
+        their new scores. Use ``MoviesModel.rerank`` instead of calling this method
+        directly so that views are told about the new order.
+        """
+        movie_ranker = self.movie_ranker()
+        new_weights = movie_ranker.genre_weights
+        with self.__lock:
+            old_weights = self.__score_weights
+            changed_mask = 0
+            for i in range(max(len(old_weights), len(new_weights))):
+                old_weight = old_weights[i] if i < len(old_weights) else 0.0
+                new_weight = new_weights[i] if i < len(new_weights) else 0.0
+                if old_weight != new_weight:
+                    changed_mask |= 1 << i
+            self.__score_weights = new_weights
+            score_parts = self.__score_parts
+            stale_keys = [
+                key
+                for key in score_parts
+                if key not in self.data or self.data[key].genre_mask & changed_mask
+            ]
+            for key in stale_keys:
+                del score_parts[key]
+
+            def score(key: str) -> float:
+                parts = score_parts.get(key)
+                if parts is None:
+                    movie = self.data[key]
+                    parts = (
+                        movie_ranker.genre_match(movie),
+                        movie_ranker.rating_score(movie),
+                    )
+                    score_parts[key] = parts
+                return movie_ranker.combine(*parts)
+
+            keys = list(self.__order)
+            tail = keys[start:]
+            tail.sort(key=score, reverse=True)
+            keys[start:] = tail
+            self.__order = _KeyOrder(keys)
+
+    def __restart_pages(self) -> None:
+        """Makes the next ``load`` request the first page for the chosen genres."""
         self.total_pages = None
         self.current_page = 0
-        self.__keys = []
+        with self.__lock:
+            prefetched_pages = self.__prefetched_pages
+            self.__prefetched_pages = {}
+        for _, future in prefetched_pages.values():
+            future.cancel()
 
     def update(self, *args, **kwargs) -> None:
-        self.data.update(*args, **kwargs)
-        self.__keys.extend(key for key, _ in args)
-        self.__keys.extend(kwargs.keys())
+        new_data = dict(*args, **kwargs)
+        with self.__lock:
+            self.data.update(new_data)
+            for key in new_data:
+                self.__order.append(key)
 
-    def load(self) -> bool | None:
+    def load(self, on_movies_added: Callable[[], None] | None = None) -> bool | None:
         """Loads movies from the service.
 
         Assumes the user object has already been loaded and has valid data. Returns True
         if the movies were loaded successfully, None if there are no more movies to
         load, False otherwise. Calling this method will not clear any current data; the
-        method can be called multiple times to load more movies.
+        method can be called multiple times to load more movies. Only one load runs at
+        a time, so a load started while another is running waits for it to finish and
+        then loads the next page.
+
+        Parameters
+        ----------
+        on_movies_added : Callable[[], None] | None, optional
+            Called each time some of the page's movies have been added, which may be
+            before the rest of the page has been received. Defaults to None.
+        """
+        with self.__load_lock:
+            return self.__load(on_movies_added)
+
+    def __load(self, on_movies_added: Callable[[], None] | None) -> bool | None:
+        """Loads movies while holding the load lock; see ``load``.
+
+        A load that was started before the movies were cleared or re-filtered stops
+        after the page it is loading, so a load waiting for the lock doesn't wait long.
         """
         print("Loading movies...")
         if not self.genres:
@@ -105,85 +379,501 @@ class _Movies(UserDict):
             print("Error: user region must be set before loading movies.")
             return False
         if USE_MOCK_DATA:
-            if self.data:
+            if self.__pool:
                 print("No more movies to load.")
                 return None
             with open(sample_movies_json_path, "r", encoding="utf8") as file:
-                return self.__add_movies(json.load(file))
-        if self.total_pages is not None and self.current_page >= self.total_pages:
+                return self.__add_streamed_page(
+                    iter(lambda: file.read(MOVIES_STREAM_CHUNK_SIZE), ""),
+                    on_movies_added,
+                )
+        if USE_CATALOG_MIRROR:
+            self.__sync_catalog_mirror()
+        movie_count = len(self.data)
+        generation = self.__generation
+        # Loads pages until one has movies that match or the movies are re-filtered.
+        while len(self.data) == movie_count and generation == self.__generation:
+            if self.total_pages is not None and self.current_page >= self.total_pages:
+                print("No more movies to load.")
+                return None
+            if self.current_page == 0:
+                self.__requested_genres = list(self.genres)
+                self.__is_from_mirror = (
+                    USE_CATALOG_MIRROR
+                    and catalog_mirror.last_synced(user.region, user.services)
+                    is not None
+                )
+            self.current_page += 1
+            if self.__is_from_mirror:
+                if not (ok := self.__add_mirror_page(on_movies_added)):
+                    return ok
+                continue
+            request_body = self.__request_body(self.current_page)
+            with self.__lock:
+                prefetched = self.__prefetched_pages.pop(self.current_page, None)
+            # A prefetch that hasn't started may be waiting behind other tasks, so the
+            # page is fetched right away instead.
+            if (
+                prefetched is not None
+                and prefetched[0] == request_body
+                and not prefetched[1].cancel_if_not_started()
+            ):
+                ok = self.__add_page(prefetched[1].result(), on_movies_added)
+            elif (cached_data := catalog_cache.get(request_body)) is not None:
+                ok = self.__add_page(cached_data, on_movies_added)
+            else:
+                ok = self.__stream_page(request_body, on_movies_added)
+            if not ok:
+                return False
+            self.__prefetch_pages()
+        return True
+
+    def __request_body(self, page: int) -> dict[str, Any]:
+        """Returns the JSON body of the request for a page of movies."""
+        assert user.region is not None
+        return self.__catalog_request_body(
+            user.region, user.services, self.__requested_genres, page
+        )
+
+    @staticmethod
+    def __catalog_request_body(
+        region: CountryCode,
+        services: Iterable[ServiceName],
+        genres: Iterable[str],
+        page: int,
+    ) -> dict[str, Any]:
+        """Returns the JSON body of the request for a page of a catalog's movies."""
+        return {
+            "country": region.name.lower(),
+            "genre": [genre.title() for genre in genres],
+            "language": "en",
+            "orderBy": "year",  # "original_title" or "year"
+            "page": str(page),
+            "services": [service.value.lower() for service in services],
+        }
+
+    def __sync_catalog_mirror(self) -> None:
+        """Starts syncing the user's catalog to ``catalog_mirror`` if it needs to be.
+
+        The sync runs in the background, and the catalog's pages in all genres aren't
+        saved to the catalog cache.
+        """
+        assert user.region is not None
+        region = user.region
+        services = sorted(user.services, key=lambda service: service.name)
+        if not catalog_mirror.needs_sync(region, services):
+            return
+        task_executor.submit(
+            catalog_mirror.sync,
+            region,
+            services,
+            lambda page: self.__fetch_page(
+                self.__catalog_request_body(region, services, GENRES, page),
+                use_cache=False,
+                cache_response=False,
+            ),
+            priority=TaskPriority.LOW,
+            key=("catalog_mirror", region, tuple(services)),
+        )
+
+    def __add_mirror_page(
+        self, on_movies_added: Callable[[], None] | None
+    ) -> bool | None:
+        """Adds movies to ``self.data`` from the current page of ``catalog_mirror``.
+
+        Returns True if the movies were added successfully, None if the page has no
+        movies, and False otherwise.
+        """
+        assert user.region is not None
+        movies_data, self.total_pages = catalog_mirror.page(
+            user.region, user.services, self.__requested_genres, self.current_page
+        )
+        if not movies_data:
             print("No more movies to load.")
             return None
-        self.current_page += 1
+        return self.__add_movies(movies_data, on_movies_added)
+
+    def __fetch_page(
+        self,
+        request_body: dict[str, Any],
+        use_cache: bool = True,
+        cache_response: bool = True,
+    ) -> dict[str, Any] | None:
+        """Gets a page of movies from the catalog cache or from the service.
+
+        Returns the response's data, or None if the request failed.
+
+        Parameters
+        ----------
+        request_body : dict[str, Any]
+            The JSON body of the request for the page.
+        use_cache : bool
+            Whether to use the page in the catalog cache if it's there. Defaults to
+            True.
+        cache_response : bool
+            Whether to save the service's response to the catalog cache. Defaults to
+            True.
+        """
+        if use_cache and (cached_data := catalog_cache.get(request_body)) is not None:
+            return cached_data
         try:
             print("Sending request for movies...")
-            response = requests.get(
+            response = session.get(
                 url=f"{SERVICE_BASE_URL}/movie",
-                json={
-                    "country": user.region.name.lower(),
-                    "genre": [genre.title() for genre in self.genres],
-                    "language": "en",
-                    "orderBy": "year",  # "original_title" or "year"
-                    "page": str(self.current_page),
-                    "services": [service.value.lower() for service in user.services],
-                },
+                json=request_body,
                 verify=False,
             )
             print(f"movies {response = }")
+            if not response:
+                print(f"movies {response.content = }")
+                print("Error: failed to load more movies. `response` is falsy.")
+                return None
+            response_data = response.json()
+        except ValueError as e:
+            print(f"Error: the movies response is not valid JSON: {e}")
+            return None
+        except Exception as e:
+            print(f"Exception while loading movies: {e}")
+            return None
+        if cache_response:
+            catalog_cache.put(request_body, response.content)
+        return response_data
+
+    def __stream_page(
+        self,
+        request_body: dict[str, Any],
+        on_movies_added: Callable[[], None] | None,
+    ) -> bool:
+        """Gets a page of movies from the service, adding each movie as it arrives.
+
+        Returns True if the movies were added successfully, returns False otherwise.
+        """
+        content_chunks: list[bytes] = []  # for the catalog cache
+
+        def read_chunks() -> Iterator[bytes]:
+            for chunk in response.iter_content(MOVIES_STREAM_CHUNK_SIZE):
+                content_chunks.append(chunk)
+                yield chunk
+
+        try:
+            print("Sending request for movies...")
+            response = session.get(
+                url=f"{SERVICE_BASE_URL}/movie",
+                json=request_body,
+                verify=False,
+                stream=True,
+            )
+            print(f"movies {response = }")
+            if not response:
+                print(f"movies {response.content = }")
+                print("Error: failed to load more movies. `response` is falsy.")
+                return False
+            ok = self.__add_streamed_page(
+                codecs.iterdecode(read_chunks(), "utf8"), on_movies_added
+            )
         except Exception as e:
             print(f"Exception while loading movies: {e}")
             return False
-        if not response:
-            print(f"movies {response.content = }")
-            print("Error: failed to load more movies. `response` is falsy.")
-            return False
-        return self.__add_movies(response.json())
+        catalog_cache.put(request_body, b"".join(content_chunks))
+        return ok
 
-    def __add_movies(self, response_data: dict[str, Any]) -> bool:
-        """Adds movies to ``self.data`` from a web request response.
+    def __prefetch_pages(self) -> None:
+        """Starts getting the next pages of movies in the background.
+
+        Up to ``PREFETCHED_PAGE_COUNT`` pages after the current page are requested, not
+        including any pages after the last one.
+        """
+        last_page = self.current_page + PREFETCHED_PAGE_COUNT
+        if self.total_pages is not None:
+            last_page = min(last_page, self.total_pages)
+        for page in range(self.current_page + 1, last_page + 1):
+            request_body = self.__request_body(page)
+            with self.__lock:
+                prefetched = self.__prefetched_pages.get(page)
+                if prefetched is None or prefetched[0] != request_body:
+                    self.__prefetched_pages[page] = (
+                        request_body,
+                        task_executor.submit(
+                            self.__fetch_page,
+                            request_body,
+                            priority=TaskPriority.LOW,
+                            key=("page", json.dumps(request_body, sort_keys=True)),
+                        ),
+                    )
+
+    def __add_page(
+        self,
+        response_data: dict[str, Any] | None,
+        on_movies_added: Callable[[], None] | None,
+    ) -> bool:
+        """Adds movies to ``self.data`` from a whole web request response.
 
         Returns True if the movies were added successfully, returns False otherwise.
         """
-        self.total_pages = response_data["total_pages"]
-        movies_data: list[dict] = response_data["movies"]
-        if not movies_data:
-            print("Error: no movies were received from the service.")
+        if response_data is None:
             return False
+        self.total_pages = response_data["total_pages"]
+        return self.__add_movies(response_data["movies"], on_movies_added)
+
+    def __add_streamed_page(
+        self, chunks: Iterable[str], on_movies_added: Callable[[], None] | None
+    ) -> bool:
+        """Adds movies to ``self.data`` from a web request response's text as it comes.
+
+        Returns True if the movies were added successfully, returns False otherwise.
+        Raises ValueError if the response is not valid JSON.
+        """
+        parser = JsonArrayStreamParser("movies")
+        ok = self.__add_movies(parser.parse(chunks), on_movies_added)
+        self.total_pages = parser.members["total_pages"]
+        return ok
+
+    def __add_movies(
+        self,
+        movies_data: Iterable[dict[str, Any]],
+        on_movies_added: Callable[[], None] | None,
+    ) -> bool:
+        """Adds movies to the pool and ``self.data`` in batches as they are received.
+
+        Only the movies that match the chosen genres, the user's region, and the user's
+        services are added to ``self.data``. The movies in each batch of
+        ``STREAMED_MOVIES_BATCH_SIZE`` are ranked by ``movie_ranker``. Returns True if
+        any valid movies were received, returns False otherwise.
+        """
+        received_count = 0
+        valid_count = 0
+        generation = self.__generation
+        movie_filter = self.movie_filter()
+        movie_ranker = self.movie_ranker()
         new_movies: dict[str, Movie] = {}
+        matching_movies: dict[str, Movie] = {}
         for movie_data in movies_data:
+            received_count += 1
             if (
                 "imdbID" not in movie_data
                 or movie_data["imdbID"] in user.declined_movies
             ):
                 continue
-            new_movie = Movie(movie_data)
-            if new_movie and self.__service_region_and_genres_match(new_movie):
-                new_movies[new_movie.id] = new_movie
-        if not new_movies:
+            new_movie = self.__pool.get(movie_data["imdbID"]) or Movie(movie_data)
+            if not new_movie:
+                continue
+            valid_count += 1
+            new_movies[new_movie.id] = new_movie
+            if movie_filter.matches(new_movie):
+                matching_movies[new_movie.id] = new_movie
+            if len(new_movies) >= STREAMED_MOVIES_BATCH_SIZE:
+                self.__add_batch(
+                    new_movies,
+                    movie_ranker.rank(matching_movies.values()),
+                    generation,
+                    on_movies_added,
+                )
+                new_movies = {}
+                matching_movies = {}
+        self.__add_batch(
+            new_movies,
+            movie_ranker.rank(matching_movies.values()),
+            generation,
+            on_movies_added,
+        )
+        if not received_count:
+            print("Error: no movies were received from the service.")
+            return False
+        if not valid_count:
             print("Error: none of the movies from the service were valid.")
             return False
-        items = list(new_movies.items())
-        shuffle(items)
-        with self.__lock:
-            self.data.update(items)
-        self.__keys.extend(key for key, _ in items)
         print("Movies loaded successfully.")
         return True
 
-    def __service_region_and_genres_match(self, movie: Movie) -> bool:
-        """Checks if the user has the service, region, & genres of the movie."""
-        if user.region not in movie.regions:
-            return False
-        for service in user.services:
-            if service in movie.services:
-                break
-        else:
+    def __add_batch(
+        self,
+        new_movies: dict[str, Movie],
+        matching_movies: list[Movie],
+        generation: int,
+        on_movies_added: Callable[[], None] | None,
+    ) -> None:
+        """Pools and indexes a batch of movies and adds the matching ones in order.
+
+        The matching movies are not added if the movies were cleared or re-filtered
+        since the batch's page started loading.
+        """
+        items = [(movie.id, movie) for movie in matching_movies]
+        with self.__lock:
+            self.__pool.update(new_movies)
+            is_current = generation == self.__generation
+            if is_current:
+                self.data.update(items)
+                for key, _ in items:
+                    self.__order.append(key)
+        if is_current and items and on_movies_added is not None:
+            on_movies_added()
+        self.__index_movies(new_movies.values())
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the loaded movies' state for ``session_snapshot`` to save.
+
+        The state has only ints, strings, lists, and dictionaries, so it can be saved
+        and read quickly.
+        """
+        assert user.region is not None
+        with self.__lock:
+            return {
+                "region": user.region.name,
+                "services": sorted(service.name for service in user.services),
+                "genres": list(self.genres),
+                "requested_genres": list(self.__requested_genres),
+                "is_from_mirror": self.__is_from_mirror,
+                "current_page": self.current_page,
+                "total_pages": self.total_pages,
+                "pool": [movie.snapshot() for movie in self.__pool.values()],
+                "keys": list(self.__order),
+            }
+
+    def restore(self, state: dict[str, Any]) -> bool:
+        """Replaces the movies with ones that ``snapshot`` returned in an earlier run.
+
+        The movies are shown in the same order as when the snapshot was taken. Returns
+        False without changing anything if the snapshot is invalid or is of another
+        region or other services than the user's, returns True otherwise. Use
+        ``fetch_restored_pages`` afterwards to check the movies against the service.
+        """
+        if user.region is None:
             return False
-        for genre in self.genres:
-            if genre in movie.genres:
-                break
-        else:
+        try:
+            if state["region"] != user.region.name or state["services"] != sorted(
+                service.name for service in user.services
+            ):
+                return False
+            pool: dict[str, Movie] = {}
+            for movie_snapshot in state["pool"]:
+                movie = Movie.from_snapshot(movie_snapshot)
+                if movie.id not in user.declined_movies:
+                    pool[movie.id] = movie
+            snapshot_genres = list(state["genres"])
+            requested_genres = list(state["requested_genres"])
+            is_from_mirror = bool(state.get("is_from_mirror", False))
+            current_page = int(state["current_page"])
+            total_pages = state["total_pages"]
+            keys = [key for key in state["keys"] if key in pool]
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error: unable to restore the movies: {e!r}")
             return False
+        genres = self.genres or snapshot_genres
+        self.clear()
+        with self.__lock:
+            self.__pool = pool
+            self.__requested_genres = requested_genres
+            self.__is_from_mirror = is_from_mirror
+            self.current_page = current_page
+            self.total_pages = total_pages
+            self.genres = snapshot_genres
+            self.data = {key: pool[key] for key in keys}
+            self.__order = _KeyOrder(keys)
+        if genres != snapshot_genres:
+            self.refilter(genres)
+        self.__index_movies(pool.values())
         return True
 
+    def fetch_restored_pages(self) -> "RefreshedPages | None":
+        """Gets the pages that the movies were restored from again from the service.
+
+        Returns None if any of the pages couldn't be received or if the movies weren't
+        restored from pages of the service, such as from pages of ``catalog_mirror``.
+        Use ``merge_refreshed`` in the GUI thread to update the movies with the pages.
+        """
+        generation = self.__generation
+        page_count = self.current_page
+        if USE_MOCK_DATA or self.__is_from_mirror or not page_count:
+            return None
+        refreshed = RefreshedPages(generation, {}, self.total_pages)
+        for page in range(1, page_count + 1):
+            request_body = self.__request_body(page)
+            response_data = self.__fetch_page(request_body, use_cache=False)
+            if response_data is None:
+                return None
+            refreshed.total_pages = response_data["total_pages"]
+            for movie_data in response_data["movies"]:
+                if "imdbID" not in movie_data:
+                    continue
+                movie = Movie(movie_data)
+                if movie:
+                    refreshed.movies[movie.id] = movie
+        return refreshed
+
+    def stale_keys(self, refreshed: "RefreshedPages") -> list[str]:
+        """Returns the keys of the movies that are no longer in the refreshed pages.
+
+        Returns an empty list if the movies changed since the pages were requested.
+        """
+        if refreshed.generation != self.__generation:
+            return []
+        return [key for key in self.range() if key not in refreshed.movies]
+
+    def merge_refreshed(self, refreshed: "RefreshedPages") -> None:
+        """Updates the movies with the refreshed pages of ``fetch_restored_pages``.
+
+        Movies that are still in the pages are replaced with their new info but keep
+        their hearted states, and new movies that match are added at the end. Movies
+        that are no longer in the pages are removed from the pool; delete the keys of
+        ``stale_keys`` first. Does nothing if the movies changed since the pages were
+        requested.
+        """
+        with self.__lock:
+            if refreshed.generation != self.__generation:
+                return
+            movie_filter = self.movie_filter()
+            pool: dict[str, Movie] = {}
+            for movie_id, movie in refreshed.movies.items():
+                if movie_id in user.declined_movies:
+                    continue
+                if (old_movie := self.__pool.get(movie_id)) is not None:
+                    movie.hearted = old_movie.hearted
+                pool[movie_id] = movie
+                if movie_id in self.data:
+                    self.data[movie_id] = movie
+                elif movie_id not in self.__pool and movie_filter.matches(movie):
+                    self.data[movie_id] = movie
+                    self.__order.append(movie_id)
+            self.__pool = pool
+            self.__score_parts.clear()
+            self.total_pages = refreshed.total_pages
+        self.__index_movies(pool.values())
+
+    def __index_movies(self, new_movies: Iterable[Movie]) -> None:
+        """Adds pooled movies to the search index and to the similar movies' table.
+
+        Similar movies are found in the background because it takes longer.
+        """
+        new_movies = list(new_movies)
+        search_index.add(new_movies)
+        task_executor.submit(
+            similar_movies.add,
+            new_movies,
+            similar_movies.generation,
+            priority=TaskPriority.LOW,
+        )
+
+    def pooled_ids(self) -> set[str]:
+        """Returns the IDs of all of the pooled movies, including those not shown."""
+        with self.__lock:
+            return set(self.__pool)
+
+    def movie_filter(self) -> MovieFilter:
+        """Returns a filter for the user's region & services and the chosen genres."""
+        return MovieFilter.create(user.region, user.services, self.genres)
+
+    def movie_ranker(self) -> MovieRanker:
+        """Returns a ranker for the user's genre habits."""
+        return MovieRanker.create(user.genre_habits)
+
+
+@dataclass
+class RefreshedPages:
+    """The pages of movies received by ``movies.fetch_restored_pages``."""
+
+    generation: int  # of the movies when the pages were requested
+    movies: dict[str, Movie]
+    total_pages: int | None
+
 
 movies = _Movies()
@@ -0,0 +1,242 @@
+from typing import Any
+
+from moviefinder.movies import movies
+from moviefinder.movies import RefreshedPages
+from moviefinder.poster_fetcher import placeholder_poster
+from moviefinder.poster_fetcher import poster_loader
+from moviefinder.search_index import search_index
+from moviefinder.worker import Worker
+from PySide6 import QtCore
+
+
+class MoviesModel(QtCore.QAbstractListModel):
+    """A list model of the movies and shows in ``movies``, in the same order.
+
+    Views only ask for the data of the movies they show, so a movie's poster is loaded
+    the first time its poster is asked for. When a view is scrolled to the end of the
+    list, ``fetchMore`` loads the next page of movies in a worker thread. The rows
+    after the last row whose poster was asked for have not been seen yet, so ``rerank``
+    can reorder them without moving anything the user has seen.
+    """
+
+    MOVIE_ID_ROLE = int(QtCore.Qt.UserRole)
+    HEARTED_ROLE = int(QtCore.Qt.UserRole) + 1
+
+    loading_started = QtCore.Signal()
+    loading_finished = QtCore.Signal(object)  # what ``movies.load`` returned
+    __movies_added = QtCore.Signal()  # emitted from the worker thread
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        QtCore.QAbstractListModel.__init__(self, parent)
+        self.__row_count = len(movies)
+        self.__seen_row_count = 0  # the rows up to the last one whose poster was shown
+        self.__has_all_movies = False
+        self.__movies_loader = Worker()
+        self.__movies_loader.done.connect(self.__finish_loading)
+        self.__movies_loader.failed.connect(lambda _: self.__finish_loading(False))
+        self.__movies_added.connect(self.__insert_new_rows)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.__row_count
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self.__row_count:
+            return None
+        movie = movies[movies.key_at(index.row())]
+        if role == QtCore.Qt.DisplayRole:
+            return movie.title
+        if role == QtCore.Qt.DecorationRole:
+            self.__seen_row_count = max(self.__seen_row_count, index.row() + 1)
+            poster_pixmap = poster_loader.poster_pixmap(movie.id)
+            if poster_pixmap is None:
+                poster_loader.request(movie)
+                return placeholder_poster()
+            return poster_pixmap
+        if role == self.MOVIE_ID_ROLE:
+            return movie.id
+        if role == self.HEARTED_ROLE:
+            return movie.hearted
+        return None
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return (
+            not parent.isValid()
+            and not self.__has_all_movies
+            and not self.__movies_loader.is_running
+        )
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if self.canFetchMore(parent):
+            self.__movies_loader.start(movies.load, self.__movies_added.emit)
+            self.loading_started.emit()
+
+    def __insert_new_rows(self) -> None:
+        """Adds rows for any movies added to ``movies`` since the rows were counted.
+
+        Rows are inserted while a page of movies is still loading, so views can show
+        the first movies of a page before the rest of the page has been received.
+        """
+        movie_count = len(movies)
+        if movie_count > self.__row_count:
+            first_row = self.__row_count
+            self.beginInsertRows(QtCore.QModelIndex(), first_row, movie_count - 1)
+            self.__row_count = movie_count
+            self.endInsertRows()
+
+    def __finish_loading(self, ok: bool | None) -> None:
+        if ok is None:
+            self.__has_all_movies = True
+        self.__insert_new_rows()
+        self.loading_finished.emit(ok)
+
+    def __stop_loading(self) -> None:
+        """Ignores the result of the page being loaded, if any, without waiting for it.
+
+        ``movies.load`` lets only one load run at a time, so the next load waits until
+        the ignored one stops.
+        """
+        if self.__movies_loader.is_running:
+            self.__movies_loader.cancel()
+            # Nothing failed, so views just stop waiting for the page.
+            self.loading_finished.emit(True)
+
+    def remove_movie(self, movie_id: str) -> None:
+        """Deletes a movie from ``movies``, its poster, and its row."""
+        row = movies.index(movie_id)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del movies[movie_id]
+        self.__row_count -= 1
+        if row < self.__seen_row_count:
+            self.__seen_row_count -= 1
+        self.endRemoveRows()
+        poster_loader.forget(movie_id)
+
+    def clear(self) -> None:
+        """Clears ``movies``, their posters, and this model's rows."""
+        self.__stop_loading()
+        self.beginResetModel()
+        movies.clear()
+        poster_loader.clear()
+        self.__row_count = 0
+        self.__seen_row_count = 0
+        self.__has_all_movies = False
+        self.endResetModel()
+
+    def refilter(self, genres: list[str]) -> None:
+        """Shows the loaded movies that match other genres.
+
+        See ``movies.refilter``. The posters of the movies that no longer match are
+        freed. A page that was loading for the old genres is not waited for, and its
+        result is ignored.
+        """
+        self.__stop_loading()
+        self.beginResetModel()
+        old_movie_ids = set(movies)
+        movies.refilter(genres)
+        for movie_id in old_movie_ids.difference(movies):
+            poster_loader.forget(movie_id)
+        self.__row_count = len(movies)
+        self.__seen_row_count = 0
+        self.__has_all_movies = False
+        self.endResetModel()
+
+    def rerank(self) -> None:
+        """Reorders the rows that haven't been seen yet after genre habits changed.
+
+        See ``movies.rerank``. The rows that have been seen keep their places.
+        """
+        first_row = self.__seen_row_count
+        if first_row >= len(movies):
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = [
+            index for index in self.persistentIndexList() if index.row() >= first_row
+        ]
+        movie_ids = [movies.key_at(index.row()) for index in old_indexes]
+        movies.rerank(first_row)
+        self.changePersistentIndexList(
+            old_indexes, [self.index(movies.index(movie_id)) for movie_id in movie_ids]
+        )
+        self.layoutChanged.emit()
+
+    def merge_refreshed(self, refreshed: RefreshedPages) -> None:
+        """Updates the rows with pages received by ``movies.fetch_restored_pages``.
+
+        The rows of movies that are no longer in the pages are removed, rows are added
+        for new movies, and the other rows are redrawn with the movies' new info.
+        """
+        for movie_id in movies.stale_keys(refreshed):
+            self.remove_movie(movie_id)
+        movies.merge_refreshed(refreshed)
+        self.__insert_new_rows()
+        self.update_all_movies()
+
+    def update_movie(self, movie_id: str) -> None:
+        """Tells views that a movie's poster or hearted state changed."""
+        if movie_id in movies:
+            index = self.index(movies.index(movie_id))
+            self.dataChanged.emit(index, index)
+
+    def update_all_movies(self) -> None:
+        """Tells views that any of the movies' posters or hearted states changed."""
+        if self.__row_count:
+            self.dataChanged.emit(self.index(0), self.index(self.__row_count - 1))
+
+
+class SearchResultsModel(QtCore.QSortFilterProxyModel):
+    """Shows only the movies of a ``MoviesModel`` that match a search, best match first.
+
+    When there is no search, all of the movies are shown in the source model's order.
+    More movies are not loaded while searching.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        QtCore.QSortFilterProxyModel.__init__(self, parent)
+        self.__ranks: dict[str, int] | None = None  # maps movie IDs to their ranks
+
+    @property
+    def is_searching(self) -> bool:
+        return self.__ranks is not None
+
+    def set_results(self, movie_ids: list[str] | None) -> None:
+        """Shows only the movies with these IDs in this order, or all if None."""
+        if movie_ids is None:
+            self.__ranks = None
+        else:
+            self.__ranks = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        self.invalidate()
+        self.sort(-1 if self.__ranks is None else 0)
+
+    def filterAcceptsRow(
+        self, source_row: int, source_parent: QtCore.QModelIndex
+    ) -> bool:
+        if self.__ranks is None:
+            return True
+        source_index = self.sourceModel().index(source_row, 0, source_parent)
+        return source_index.data(MoviesModel.MOVIE_ID_ROLE) in self.__ranks
+
+    def lessThan(self, left: QtCore.QModelIndex, right: QtCore.QModelIndex) -> bool:
+        if self.__ranks is None:
+            return left.row() < right.row()
+        left_id = left.data(MoviesModel.MOVIE_ID_ROLE)
+        right_id = right.data(MoviesModel.MOVIE_ID_ROLE)
+        return self.__ranks[left_id] < self.__ranks[right_id]
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return self.__ranks is None and QtCore.QSortFilterProxyModel.canFetchMore(
+            self, parent
+        )
+
+
+def forget_movies() -> None:
+    """Forgets the loaded movies and what was found out about them.
+
+    Clears ``movies``, which clears the similar movies too, the posters, and the search
+    index, so that none of them are shown to or saved for the next user who logs in.
+    Call ``MoviesModel.clear`` first if a model shows the movies.
+    """
+    movies.clear()
+    poster_loader.clear()
+    search_index.clear()
@@ -0,0 +1,10 @@
+from moviefinder.app_data import app_data_path
+from moviefinder.dev_settings import POSTER_CACHE_MAX_AGE_SECONDS
+from moviefinder.dev_settings import POSTER_CACHE_MAX_BYTES
+from moviefinder.disk_cache import DiskCache
+
+# Poster images keyed by their URLs. Stale posters are only downloaded again if their
+# hosts say they have changed.
+poster_cache = DiskCache(
+    app_data_path("posters"), POSTER_CACHE_MAX_BYTES, POSTER_CACHE_MAX_AGE_SECONDS
+)
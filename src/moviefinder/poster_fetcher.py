@@ -0,0 +1,189 @@
+from functools import cache
+from threading import BoundedSemaphore
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from moviefinder.dev_settings import MAX_POSTER_DOWNLOADS_PER_HOST
+from moviefinder.dev_settings import MENU_POSTER_HEIGHT
+from moviefinder.dev_settings import MENU_POSTER_WIDTH
+from moviefinder.dev_settings import POSTER_HEIGHT
+from moviefinder.dev_settings import POSTER_WIDTH
+from moviefinder.movie import Movie
+from moviefinder.poster_cache import poster_cache
+from moviefinder.service_client import session
+from moviefinder.task_executor import Task
+from moviefinder.task_executor import task_executor
+from PySide6 import QtCore
+from PySide6 import QtGui
+
+
+__host_semaphores: dict[str, BoundedSemaphore] = {}
+__host_semaphores_lock = Lock()
+
+
+class PosterLoader(QtCore.QObject):
+    """Loads movies' posters on demand without blocking the GUI thread.
+
+    Posters are downloaded and downscaled in parallel by ``task_executor``, and then
+    turned into pixmaps in the GUI thread. Emits a ``loaded`` signal with a movie's ID
+    after its poster pixmaps are set. The pixmaps are kept here, apart from the movies'
+    catalog info, until they are forgotten.
+    """
+
+    loaded = QtCore.Signal(str)
+    __decoded = QtCore.Signal(object, list)  # the movie and its poster images
+
+    def __init__(self):
+        QtCore.QObject.__init__(self)
+        # Maps the IDs of the movies whose posters are loading to the loading tasks.
+        self.__pending_tasks: dict[str, Task[None]] = {}
+        # Maps movie IDs to their browse widget and movie menu poster pixmaps.
+        self.__pixmaps: dict[str, tuple[QtGui.QPixmap, QtGui.QPixmap]] = {}
+        self.__decoded.connect(self.__set_poster)
+
+    def request(self, movie: Movie) -> None:
+        """Starts loading a movie's poster unless it's already loaded or loading."""
+        if movie.id in self.__pixmaps or movie.id in self.__pending_tasks:
+            return
+        self.__pending_tasks[movie.id] = task_executor.submit(self.__download, movie)
+
+    def __download(self, movie: Movie) -> None:
+        """Runs in a worker thread."""
+        poster_images: list[QtGui.QImage] = []
+        if poster_data := fetch_poster_data(movie):
+            if decoded := decode_poster(poster_data):
+                poster_images = list(decoded)
+            else:
+                print(f'Error: unable to decode "{movie.title}"\'s poster.')
+        self.__decoded.emit(movie, poster_images)
+
+    def __set_poster(self, movie: Movie, poster_images: list[QtGui.QImage]) -> None:
+        """Runs in the GUI thread."""
+        if self.__pending_tasks.pop(movie.id, None) is None:
+            return  # the poster was forgotten while it was loading
+        if poster_images:
+            poster_image, menu_poster_image = poster_images
+            self.__pixmaps[movie.id] = (
+                QtGui.QPixmap.fromImage(poster_image),
+                QtGui.QPixmap.fromImage(menu_poster_image),
+            )
+            self.loaded.emit(movie.id)
+
+    def poster_pixmap(self, movie_id: str) -> QtGui.QPixmap | None:
+        """Returns a movie's browse widget poster, or None if it isn't loaded."""
+        if movie_id in self.__pixmaps:
+            return self.__pixmaps[movie_id][0]
+        return None
+
+    def menu_poster_pixmap(self, movie_id: str) -> QtGui.QPixmap | None:
+        """Returns a movie's movie menu poster, or None if it isn't loaded."""
+        if movie_id in self.__pixmaps:
+            return self.__pixmaps[movie_id][1]
+        return None
+
+    def forget(self, movie_id: str) -> None:
+        """Frees a movie's poster pixmaps and stops loading them if they're loading."""
+        self.__pixmaps.pop(movie_id, None)
+        if (task := self.__pending_tasks.pop(movie_id, None)) is not None:
+            task.cancel()
+
+    def clear(self) -> None:
+        """Frees all of the poster pixmaps and stops loading any posters."""
+        self.__pixmaps.clear()
+        for task in self.__pending_tasks.values():
+            task.cancel()
+        self.__pending_tasks.clear()
+
+
+def fetch_poster_data(movie: Movie) -> bytes | None:
+    """Gets a movie's poster image data from the poster cache or by downloading it.
+
+    At most ``MAX_POSTER_DOWNLOADS_PER_HOST`` posters are downloaded from the same host
+    at once. Cached posters are not downloaded again unless they are stale and their
+    hosts say they have changed. Returns None if the poster could not be gotten.
+    """
+    headers: dict[str, str] = {}
+    if cached := poster_cache.get(movie.poster_url):
+        entry, data = cached
+        if poster_cache.is_fresh(entry):
+            return data
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    with __get_host_semaphore(movie.poster_url):
+        try:
+            response = session.get(movie.poster_url, headers=headers)
+        except requests.exceptions.RequestException as e:
+            print(f'Exception while getting "{movie.title}"\'s poster: {e}')
+            if cached:
+                return data
+            return None
+    if cached and response.status_code == 304:
+        poster_cache.mark_fresh(movie.poster_url)
+        return data
+    if not response:
+        print(
+            f'Error: unable to get "{movie.title}"\'s poster from'
+            f' url "{movie.poster_url}".'
+        )
+        return None
+    poster_cache.put(
+        movie.poster_url,
+        response.content,
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+    )
+    return response.content
+
+
+def decode_poster(
+    poster_data: bytes,
+) -> tuple[QtGui.QImage, QtGui.QImage] | None:
+    """Decodes a poster straight into the sizes the browse widget and movie menu use.
+
+    The image is scaled while it is decoded, so the full-size poster is never held in
+    memory. Safe to call outside the GUI thread. Returns the browse widget's poster
+    image and the movie menu's poster image, or None if the data can't be decoded.
+    """
+    buffer = QtCore.QBuffer()
+    buffer.setData(poster_data)
+    reader = QtGui.QImageReader(buffer)
+    full_size = reader.size()
+    if full_size.isValid():
+        menu_size = QtCore.QSize(MENU_POSTER_WIDTH, MENU_POSTER_HEIGHT)
+        if full_size.width() > menu_size.width() or (
+            full_size.height() > menu_size.height()
+        ):
+            reader.setScaledSize(full_size.scaled(menu_size, QtCore.Qt.KeepAspectRatio))
+    menu_poster_image = reader.read()
+    if menu_poster_image.isNull():
+        return None
+    poster_image = menu_poster_image.scaled(
+        POSTER_WIDTH,
+        POSTER_HEIGHT,
+        QtCore.Qt.KeepAspectRatio,
+        QtCore.Qt.SmoothTransformation,
+    )
+    return poster_image, menu_poster_image
+
+
+@cache
+def placeholder_poster() -> QtGui.QPixmap:
+    """Returns a blank pixmap to show in place of a poster that isn't loaded yet."""
+    pixmap = QtGui.QPixmap(POSTER_WIDTH, POSTER_HEIGHT)
+    pixmap.fill(QtGui.QColor("#323232"))
+    return pixmap
+
+
+def __get_host_semaphore(url: str) -> BoundedSemaphore:
+    """Returns the semaphore that limits the concurrent downloads from a URL's host."""
+    host = urlsplit(url).netloc
+    with __host_semaphores_lock:
+        if host not in __host_semaphores:
+            __host_semaphores[host] = BoundedSemaphore(MAX_POSTER_DOWNLOADS_PER_HOST)
+        return __host_semaphores[host]
+
+
+poster_loader = PosterLoader()
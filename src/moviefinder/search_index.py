@@ -0,0 +1,300 @@
+import marshal
+import re
+import struct
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Container
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+
+from moviefinder.app_data import app_data_path
+from moviefinder.app_data import write_atomically
+from moviefinder.movie import Movie
+
+
+class SearchIndex:
+    """A thread-safe full-text index of movies' titles, people, and plots.
+
+    Each movie's text is split into lowercase words without accents, and each word is
+    weighted by the fields it is in, so a word in a title counts more than a word in an
+    overview. The index maps each word to the movies that have it and their weights, and
+    keeps the words sorted so that all the words starting with what the user is typing
+    can be found with a binary search. Movies can be added while the index is searched.
+
+    The index is saved to a file in the app's data folder and read again the first time
+    it is used, so movies that were indexed in an earlier run are not indexed again.
+    """
+
+    FIELD_WEIGHTS = {
+        "title": 4.0,
+        "directors": 2.0,
+        "cast": 2.0,
+        "writers": 1.0,
+        "tagline": 1.0,
+        "overview": 0.5,
+    }
+    MIN_PREFIX_LENGTH = 2  # shorter words being typed only match whole words
+    PREFIX_MATCH_SHARE = 0.5  # how much a word counts when only its start matches
+    STOP_WORDS = frozenset(
+        "a an and as at by for from her his in is it its of on or the to with".split()
+    )
+
+    __WORD = re.compile(r"\w+")
+    __MAGIC = b"MFSI"
+    __FORMAT_VERSION = 1
+    __HEADER = struct.Struct("<4sHH")  # magic, format version, and marshal version
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.__lock = Lock()
+        self.__is_loaded = False
+        # Maps movie IDs to their words' weights.
+        self.__documents: dict[str, dict[str, float]] = {}
+        # Maps words to the IDs of the movies that have them and their weights.
+        self.__postings: dict[str, dict[str, float]] = {}
+        self.__sorted_words: list[str] = []
+        self.__unsorted_words: list[str] = []  # added since the words were sorted
+
+    def __contains__(self, movie_id: object) -> bool:
+        with self.__lock:
+            self.__load()
+            return movie_id in self.__documents
+
+    def __len__(self) -> int:
+        with self.__lock:
+            self.__load()
+            return len(self.__documents)
+
+    def add(self, movies: Iterable[Movie]) -> None:
+        """Indexes movies, replacing the words of indexed movies whose info changed.
+
+        The movies' words are found without holding the lock, so searches aren't
+        blocked while many movies are added.
+        """
+        documents = [(movie.id, self.__weigh_words(movie)) for movie in movies]
+        with self.__lock:
+            self.__load()
+            has_removed_words = False
+            for movie_id, weights in documents:
+                old_weights = self.__documents.get(movie_id)
+                if old_weights == weights:
+                    continue
+                if old_weights is not None:
+                    has_removed_words |= self.__remove_document(movie_id)
+                self.__add_document(movie_id, weights)
+            if has_removed_words:
+                self.__sorted_words = sorted(self.__postings)
+                self.__unsorted_words = []
+
+    def search(
+        self,
+        query: str,
+        movie_ids: Container[str] | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """Returns the IDs of the movies that match a query, best match first.
+
+        A movie matches if it has every word of the query, or a word starting with it.
+        Words of the query that are shorter than ``MIN_PREFIX_LENGTH`` must match whole
+        words.
+
+        Parameters
+        ----------
+        query : str
+            What the user typed.
+        movie_ids : Container[str] | None
+            If given, only these movies are returned. Defaults to None.
+        limit : int | None
+            The most movie IDs to return. Defaults to None (no limit).
+        """
+        words = self.tokenize(query)
+        if not words:
+            return []
+        with self.__lock:
+            self.__load()
+            self.__sort_words()
+            scores: dict[str, float] | None = None
+            for word in sorted(words, key=self.__match_count):
+                word_scores = self.__match(word)
+                if scores is None:
+                    scores = word_scores
+                    if movie_ids is not None:
+                        scores = {
+                            movie_id: score
+                            for movie_id, score in scores.items()
+                            if movie_id in movie_ids
+                        }
+                else:
+                    scores = {
+                        movie_id: score + word_scores[movie_id]
+                        for movie_id, score in scores.items()
+                        if movie_id in word_scores
+                    }
+                if not scores:
+                    return []
+        assert scores is not None
+        ranked_ids = sorted(scores, key=scores.__getitem__, reverse=True)
+        return ranked_ids[:limit] if limit is not None else ranked_ids
+
+    def retain(self, movie_ids: Container[str]) -> None:
+        """Removes the movies that aren't in ``movie_ids`` from the index."""
+        with self.__lock:
+            self.__load()
+            removed_ids = [
+                movie_id for movie_id in self.__documents if movie_id not in movie_ids
+            ]
+            has_removed_words = False
+            for movie_id in removed_ids:
+                has_removed_words |= self.__remove_document(movie_id)
+            if has_removed_words:
+                self.__sorted_words = sorted(self.__postings)
+                self.__unsorted_words = []
+
+    def clear(self) -> None:
+        """Removes all of the movies from the index without changing its file."""
+        with self.__lock:
+            self.__is_loaded = True  # so the file's movies aren't read again
+            self.__documents = {}
+            self.__postings = {}
+            self.__sorted_words = []
+            self.__unsorted_words = []
+
+    def save(self) -> None:
+        """Saves the index to its file."""
+        with self.__lock:
+            if not self.__is_loaded:
+                return
+            header = self.__HEADER.pack(
+                self.__MAGIC, self.__FORMAT_VERSION, marshal.version
+            )
+            data = header + marshal.dumps(self.__documents)
+        try:
+            write_atomically(self.path, data)
+        except OSError as e:
+            print(f"Error: unable to save the search index: {e}")
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        """Returns the lowercase words of a text without accents or stop words."""
+        text = text.casefold()
+        if not text.isascii():
+            text = unicodedata.normalize("NFKD", text)
+            text = "".join(char for char in text if not unicodedata.combining(char))
+        return [word for word in cls.__WORD.findall(text) if word not in cls.STOP_WORDS]
+
+    def __weigh_words(self, movie: Movie) -> dict[str, float]:
+        """Returns the words of a movie's fields and their weights."""
+        weights: dict[str, float] = {}
+        for field, field_weight in self.FIELD_WEIGHTS.items():
+            value = getattr(movie, field)
+            text = value if isinstance(value, str) else " ".join(value)
+            for word in set(self.tokenize(text)):
+                weights[word] = weights.get(word, 0.0) + field_weight
+        return weights
+
+    def __add_document(self, movie_id: str, weights: dict[str, float]) -> None:
+        """Must be called while holding the lock."""
+        self.__documents[movie_id] = weights
+        for word, weight in weights.items():
+            postings = self.__postings.get(word)
+            if postings is None:
+                postings = self.__postings[word] = {}
+                self.__unsorted_words.append(word)
+            postings[movie_id] = weight
+
+    def __remove_document(self, movie_id: str) -> bool:
+        """Returns True if any words are no longer indexed.
+
+        The sorted words aren't changed, so sort them again if any words were removed.
+        Must be called while holding the lock.
+        """
+        has_removed_words = False
+        for word in self.__documents.pop(movie_id):
+            postings = self.__postings[word]
+            del postings[movie_id]
+            if not postings:
+                del self.__postings[word]
+                has_removed_words = True
+        return has_removed_words
+
+    def __sort_words(self) -> None:
+        """Adds the words added since the words were sorted to the sorted words.
+
+        The new words are sorted and appended, so sorting them all again only merges
+        two sorted runs. Must be called while holding the lock.
+        """
+        if self.__unsorted_words:
+            self.__unsorted_words.sort()
+            self.__sorted_words.extend(self.__unsorted_words)
+            self.__sorted_words.sort()
+            self.__unsorted_words = []
+
+    def __matching_words(self, word: str) -> Iterable[str]:
+        """Yields the indexed words that a query's word matches.
+
+        Must be called while holding the lock.
+        """
+        if len(word) < self.MIN_PREFIX_LENGTH:
+            if word in self.__postings:
+                yield word
+            return
+        sorted_words = self.__sorted_words
+        i = bisect_left(sorted_words, word)
+        while i < len(sorted_words) and sorted_words[i].startswith(word):
+            yield sorted_words[i]
+            i += 1
+
+    def __match_count(self, word: str) -> int:
+        """Returns how many postings a query's word matches, to match rare words first.
+
+        Must be called while holding the lock.
+        """
+        return sum(len(self.__postings[w]) for w in self.__matching_words(word))
+
+    def __match(self, word: str) -> dict[str, float]:
+        """Maps the IDs of the movies that a query's word matches to their scores.
+
+        Each movie's score is the weight of its best matching word. Must be called
+        while holding the lock.
+        """
+        scores: dict[str, float] = {}
+        for matching_word in self.__matching_words(word):
+            share = 1.0 if matching_word == word else self.PREFIX_MATCH_SHARE
+            for movie_id, weight in self.__postings[matching_word].items():
+                score = share * weight
+                if score > scores.get(movie_id, 0.0):
+                    scores[movie_id] = score
+        return scores
+
+    def __load(self) -> None:
+        """Reads the index from its file the first time the index is used.
+
+        Must be called while holding the lock.
+        """
+        if self.__is_loaded:
+            return
+        self.__is_loaded = True
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return
+        header_size = self.__HEADER.size
+        if len(data) < header_size or self.__HEADER.unpack_from(data) != (
+            self.__MAGIC,
+            self.__FORMAT_VERSION,
+            marshal.version,
+        ):
+            return
+        try:
+            documents = marshal.loads(data[header_size:])
+        except (EOFError, ValueError, TypeError) as e:
+            print(f"Error: unable to read the search index: {e}")
+            return
+        if not isinstance(documents, dict):
+            return
+        for movie_id, weights in documents.items():
+            self.__add_document(movie_id, weights)
+
+
+search_index = SearchIndex(app_data_path("search_index"))
@@ -0,0 +1,49 @@
+from typing import Any
+
+import requests
+from moviefinder.service_client import session
+from moviefinder.task_executor import TaskPriority
+from moviefinder.worker import Worker
+from PySide6 import QtCore
+
+
+class ServiceCall(QtCore.QObject):
+    """A request to the service that is sent by a worker thread.
+
+    Emits a ``finished`` signal in the GUI thread with the response, or with None if
+    the service could not be reached. Requests time out after the service client's
+    default timeouts. A cancelled call never emits ``finished``. Keep a reference to
+    the call until it finishes or is cancelled.
+    """
+
+    finished = QtCore.Signal(object)  # the response or None
+
+    def __init__(self, method: str, url: str, json: dict[str, Any]):
+        QtCore.QObject.__init__(self)
+        self.method = method
+        self.url = url
+        self.json = json
+        self.is_cancelled = False
+        self.__worker = Worker(TaskPriority.HIGH)
+        self.__worker.done.connect(self.__finish)
+        self.__worker.failed.connect(lambda _: self.__finish(None))
+
+    def start(self) -> None:
+        self.__worker.start(self.__send)
+
+    def cancel(self) -> None:
+        """Ignores the response, if any, when it arrives."""
+        self.is_cancelled = True
+        self.__worker.cancel()
+
+    def __send(self) -> requests.Response | None:
+        """Runs in a worker thread."""
+        try:
+            return session.request(self.method, self.url, json=self.json)
+        except requests.exceptions.RequestException as e:
+            print(f"Exception while sending {self.method} {self.url}: {e}")
+            return None
+
+    def __finish(self, response: requests.Response | None) -> None:
+        if not self.is_cancelled:
+            self.finished.emit(response)
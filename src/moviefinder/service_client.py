@@ -0,0 +1,48 @@
+import requests
+from moviefinder.dev_settings import MAX_CONNECTIONS_PER_HOST
+from moviefinder.dev_settings import MAX_HTTP_RETRIES
+from moviefinder.dev_settings import SERVICE_CONNECT_TIMEOUT_SECONDS
+from moviefinder.dev_settings import SERVICE_READ_TIMEOUT_SECONDS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """An HTTP adapter that gives every request default connect and read timeouts."""
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (
+                SERVICE_CONNECT_TIMEOUT_SECONDS,
+                SERVICE_READ_TIMEOUT_SECONDS,
+            )
+        return super().send(request, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """Creates an HTTP session that keeps connections open to be reused.
+
+    At most ``MAX_CONNECTIONS_PER_HOST`` connections are open to each host at once;
+    more requests to the same host wait for a connection to be free. Idempotent
+    requests that fail to connect or get a 502, 503, or 504 response are retried with
+    exponential backoff.
+    """
+    retry = Retry(
+        total=MAX_HTTP_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = _TimeoutHTTPAdapter(
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST, pool_block=True, max_retries=retry
+    )
+    new_session = requests.Session()
+    new_session.mount("http://", adapter)
+    new_session.mount("https://", adapter)
+    new_session.headers["Accept-Encoding"] = "gzip, deflate"
+    return new_session
+
+
+# Use this for all HTTP requests, including those to the service and for posters.
+session = create_session()
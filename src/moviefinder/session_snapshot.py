@@ -0,0 +1,78 @@
+import marshal
+import struct
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from moviefinder.app_data import app_data_path
+from moviefinder.app_data import write_atomically
+from moviefinder.dev_settings import SESSION_SNAPSHOT_MAX_AGE_SECONDS
+
+
+class SessionSnapshot:
+    """The state of the movies each user had loaded when the app last quit.
+
+    Restoring a snapshot lets the browse menu be shown right after logging in instead
+    of after the first page of movies is received. Each user's snapshot is saved in its
+    own file in a folder on the device. The file starts with a header followed by the
+    state encoded by ``marshal``, which reads and writes built-in types much faster than
+    JSON. Snapshots written by another version of ``marshal`` or older than the maximum
+    age are not used.
+    """
+
+    __MAGIC = b"MFSS"
+    __FORMAT_VERSION = 1
+    __HEADER = struct.Struct("<4sHHd")  # magic, format & marshal versions, saved at
+
+    def __init__(self, folder: Path, max_age_seconds: float):
+        self.folder = folder
+        self.max_age_seconds = max_age_seconds
+
+    def save(self, email: str, state: dict[str, Any]) -> None:
+        """Saves a user's snapshot, replacing their previous one."""
+        header = self.__HEADER.pack(
+            self.__MAGIC, self.__FORMAT_VERSION, marshal.version, time.time()
+        )
+        try:
+            write_atomically(self.__path(email), header + marshal.dumps(state))
+        except (OSError, ValueError) as e:
+            print(f"Error: unable to save the session snapshot: {e}")
+
+    def load(self, email: str) -> dict[str, Any] | None:
+        """Returns a user's snapshot, or None if it is missing, invalid, or too old."""
+        try:
+            data = self.__path(email).read_bytes()
+        except OSError:
+            return None
+        header_size = self.__HEADER.size
+        if len(data) < header_size:
+            return None
+        magic, format_version, marshal_version, saved_at = self.__HEADER.unpack_from(
+            data
+        )
+        if (
+            magic != self.__MAGIC
+            or format_version != self.__FORMAT_VERSION
+            or marshal_version != marshal.version
+            or time.time() - saved_at >= self.max_age_seconds
+        ):
+            return None
+        try:
+            state = marshal.loads(data[header_size:])
+        except (EOFError, ValueError, TypeError) as e:
+            print(f"Error: unable to read the session snapshot: {e}")
+            return None
+        return state if isinstance(state, dict) else None
+
+    def delete(self, email: str) -> None:
+        """Deletes a user's snapshot, if any."""
+        self.__path(email).unlink(missing_ok=True)
+
+    def __path(self, email: str) -> Path:
+        return self.folder / sha256(email.lower().encode("utf8")).hexdigest()
+
+
+session_snapshot = SessionSnapshot(
+    app_data_path("sessions"), SESSION_SNAPSHOT_MAX_AGE_SECONDS
+)
@@ -6,6 +6,7 @@ from moviefinder.country_code import CountryCode
 from moviefinder.loading_dialog import LoadingDialog
 from moviefinder.service_name import ServiceName
 from moviefinder.movies import movies
+from moviefinder.service_call import ServiceCall
 from moviefinder.user import show_message_box
 from moviefinder.user import user
 from moviefinder.validators import NameValidator
@@ -21,9 +22,13 @@ class SettingsMenu(QtWidgets.QWidget):
         super().__init__(main_window)
         self.main_window = main_window
         self.from_menu_name: Literal["LoggedInStartMenu", "BrowseMenu"] | None = None
+        self.__save_call: ServiceCall | None = None
+        self.__loading_dialog: LoadingDialog | None = None
         self.layout = QtWidgets.QFormLayout(self)
         options_button_layout = QtWidgets.QHBoxLayout()
-        self.options_button = main_window.create_options_button(self)
+        self.options_button = main_window.create_options_button(
+            self, include_settings=False
+        )
         options_button_layout.addWidget(self.options_button, alignment=Qt.AlignRight)
         self.layout.addRow(options_button_layout)
         title_label = QtWidgets.QLabel("<h1>settings</h1>", self)
@@ -144,22 +149,54 @@ class SettingsMenu(QtWidgets.QWidget):
             settings.setValue("user/password", new_password)
         new_region = CountryCode(self.region_combo_box.currentText())
         new_services: list[ServiceName] = self.__get_services()
-        must_reload_movies = False
-        if (
-            new_genres != movies.genres
-            or new_region != user.region
-            or new_services != user.services
-        ):
-            movies.genres = new_genres
-            must_reload_movies = True
-        if not user.update_and_save(new_name, new_region, new_services, new_password):
+        region_or_services_changed = (
+            new_region != user.region or new_services != user.services
+        )
+        genres_changed = new_genres != movies.genres
+        self.__loading_dialog = LoadingDialog(on_cancel=self.__stop_saving)
+        self.__loading_dialog.show()
+        self.__save_call = user.update_and_save(
+            new_name,
+            new_region,
+            new_services,
+            new_password,
+            lambda ok: self.__finish_saving(
+                ok, new_genres, region_or_services_changed, genres_changed
+            ),
+        )
+
+    def __stop_saving(self) -> None:
+        """Closes the loading dialog and ignores any response from the service."""
+        if self.__save_call is not None:
+            self.__save_call.cancel()
+            self.__save_call = None
+        if self.__loading_dialog is not None:
+            self.__loading_dialog.close()
+            self.__loading_dialog = None
+
+    def __finish_saving(
+        self,
+        ok: bool,
+        new_genres: list[str],
+        region_or_services_changed: bool,
+        genres_changed: bool,
+    ) -> None:
+        self.__stop_saving()
+        if not ok:
             self.main_window.log_out()
             return
-        if must_reload_movies and self.from_menu_name == "BrowseMenu":
-            with LoadingDialog():
-                self.main_window.clear_movies()
-                if not movies.load():
-                    show_message_box("Error: unable to connect to the service.")
-                    return
-                self.main_window.browse_menu.reload_browse_widget()
+        if region_or_services_changed:
+            movies.genres = new_genres
+            if self.from_menu_name == "BrowseMenu":
+                with LoadingDialog():
+                    self.main_window.clear_movies()
+                    if not movies.load():
+                        show_message_box("Error: unable to connect to the service.")
+                        return
+                    self.main_window.browse_menu.reload_browse_widget()
+        elif genres_changed:
+            if self.from_menu_name == "BrowseMenu":
+                self.main_window.browse_menu.change_genres(new_genres)
+            else:
+                movies.genres = new_genres
         self.__show_previous_menu()
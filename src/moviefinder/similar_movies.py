@@ -0,0 +1,212 @@
+from bisect import bisect_left
+from bisect import insort
+from collections.abc import Container
+from collections.abc import Iterable
+from dataclasses import dataclass
+from heapq import nlargest
+from math import exp
+from math import sqrt
+from threading import Lock
+
+from moviefinder.movie import Movie
+
+
+@dataclass(frozen=True)
+class _Features:
+    """What a movie's similarity to other movies is computed from."""
+
+    genre_mask: int
+    people: dict[str, float]  # maps cast members and directors to their weights
+    people_length: float
+    release_year: int
+
+
+class SimilarMovies:
+    """A thread-safe table of each movie's most similar movies.
+
+    Two movies' similarity combines how much their genres overlap, how many cast
+    members and directors they share, and how close their release years are. The
+    genres and the people are sparse vectors, and their overlaps are the vectors'
+    cosine similarities.
+
+    Comparing each new movie to every other movie would take quadratic time, so a new
+    movie is only compared to the movies that share a person with it and, for the
+    combinations of genres that overlap the most with its own, to the movies released
+    closest to it. The new movie's best matches are kept, and it also replaces the worst
+    kept match of each compared movie that it is more similar to. Looking up a movie's
+    similar movies then doesn't compare any movies.
+    """
+
+    NEIGHBOR_COUNT = 20  # the most similar movies kept for each movie
+    GENRE_SHARE = 0.5  # how much of a similarity is the genres' similarity
+    PEOPLE_SHARE = 0.35
+    YEAR_SHARE = 0.15
+    YEAR_SCALE = 10  # how many years apart make the years' similarity drop to 1/e
+    DIRECTOR_WEIGHT = 2.0  # how much more a shared director counts than a cast member
+    MIN_GENRE_SIMILARITY = 0.5  # of the genre combinations to compare movies from
+    YEAR_NEIGHBOR_COUNT = 5  # compared from each genre combination on each side
+    MAX_GENRE_CANDIDATES = 100  # the most movies compared because of their genres
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__generation = 0  # changes each time the table is cleared
+        self.__features: dict[str, _Features] = {}
+        # Maps people to the IDs of the movies they are in.
+        self.__people_postings: dict[str, list[str]] = {}
+        # Maps genre masks to their movies' release years and IDs, in order.
+        self.__genre_buckets: dict[int, list[tuple[int, str]]] = {}
+        # Maps movie IDs to their most similar movies' negated similarities and IDs,
+        # most similar first.
+        self.__neighbors: dict[str, list[tuple[float, str]]] = {}
+
+    def __contains__(self, movie_id: object) -> bool:
+        return movie_id in self.__features
+
+    @property
+    def generation(self) -> int:
+        """A number that changes each time the table is cleared."""
+        return self.__generation
+
+    def add(self, movies: Iterable[Movie], generation: int | None = None) -> None:
+        """Finds the similar movies of movies that weren't added yet.
+
+        Parameters
+        ----------
+        movies : Iterable[Movie]
+            The movies to add.
+        generation : int | None
+            If given, the movies are only added until the table is cleared after
+            ``generation`` was read, so that a background task started before the
+            table was cleared doesn't fill it again. Defaults to None.
+        """
+        for movie in movies:
+            features = self.__features_of(movie)
+            with self.__lock:
+                if generation is not None and generation != self.__generation:
+                    return
+                if movie.id in self.__features:
+                    continue
+                scored = [
+                    (self.__similarity(features, self.__features[other_id]), other_id)
+                    for other_id in self.__candidates(features)
+                ]
+                self.__neighbors[movie.id] = [
+                    (-score, other_id)
+                    for score, other_id in nlargest(self.NEIGHBOR_COUNT, scored)
+                ]
+                for score, other_id in scored:
+                    self.__offer(other_id, score, movie.id)
+                self.__features[movie.id] = features
+                for person in features.people:
+                    self.__people_postings.setdefault(person, []).append(movie.id)
+                insort(
+                    self.__genre_buckets.setdefault(features.genre_mask, []),
+                    (features.release_year, movie.id),
+                )
+
+    def similar(
+        self, movie_id: str, movie_ids: Container[str] | None = None, limit: int = 10
+    ) -> list[str]:
+        """Returns the IDs of a movie's most similar movies, most similar first.
+
+        Parameters
+        ----------
+        movie_id : str
+            The ID of the movie to find similar movies of.
+        movie_ids : Container[str] | None
+            If given, only these movies are returned. Defaults to None.
+        limit : int
+            The most movie IDs to return. Defaults to 10.
+        """
+        with self.__lock:
+            neighbors = list(self.__neighbors.get(movie_id, ()))
+        similar_ids = [
+            other_id
+            for _, other_id in neighbors
+            if movie_ids is None or other_id in movie_ids
+        ]
+        return similar_ids[:limit]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__features.clear()
+            self.__people_postings.clear()
+            self.__genre_buckets.clear()
+            self.__neighbors.clear()
+
+    def __similarity(self, a: _Features, b: _Features) -> float:
+        """Returns how similar two movies are, from 0 to 1."""
+        genre_similarity = self.__genre_similarity(a.genre_mask, b.genre_mask)
+        people_similarity = 0.0
+        if a.people_length and b.people_length:
+            if len(a.people) > len(b.people):
+                a, b = b, a
+            shared_weight = sum(
+                weight * b.people[person]
+                for person, weight in a.people.items()
+                if person in b.people
+            )
+            people_similarity = shared_weight / (a.people_length * b.people_length)
+        year_similarity = 0.0
+        if a.release_year >= 0 and b.release_year >= 0:
+            years_apart = abs(a.release_year - b.release_year)
+            year_similarity = exp(-years_apart / self.YEAR_SCALE)
+        return (
+            self.GENRE_SHARE * genre_similarity
+            + self.PEOPLE_SHARE * people_similarity
+            + self.YEAR_SHARE * year_similarity
+        )
+
+    def __features_of(self, movie: Movie) -> _Features:
+        people = {f"cast:{name}": 1.0 for name in movie.cast}
+        for name in movie.directors:
+            people[f"director:{name}"] = self.DIRECTOR_WEIGHT
+        people_length = sqrt(sum(weight * weight for weight in people.values()))
+        return _Features(movie.genre_mask, people, people_length, movie.release_year)
+
+    def __genre_similarity(self, a: int, b: int) -> float:
+        if not a or not b:
+            return 0.0
+        return (a & b).bit_count() / sqrt(a.bit_count() * b.bit_count())
+
+    def __candidates(self, features: _Features) -> set[str]:
+        """Returns the IDs of the movies to compare a new movie to.
+
+        Must be called while holding the lock.
+        """
+        candidates: set[str] = set()
+        for person in features.people:
+            candidates.update(self.__people_postings.get(person, ()))
+        similar_buckets = []
+        for genre_mask, bucket in self.__genre_buckets.items():
+            genre_similarity = self.__genre_similarity(features.genre_mask, genre_mask)
+            if genre_similarity >= self.MIN_GENRE_SIMILARITY:
+                similar_buckets.append((genre_similarity, bucket))
+        similar_buckets.sort(key=lambda similar_bucket: similar_bucket[0], reverse=True)
+        genre_candidate_count = 0
+        for _, bucket in similar_buckets:
+            if genre_candidate_count >= self.MAX_GENRE_CANDIDATES:
+                break
+            i = bisect_left(bucket, (features.release_year, ""))
+            start = max(0, i - self.YEAR_NEIGHBOR_COUNT)
+            stop = i + self.YEAR_NEIGHBOR_COUNT
+            nearest = bucket[start:stop]
+            candidates.update(movie_id for _, movie_id in nearest)
+            genre_candidate_count += len(nearest)
+        return candidates
+
+    def __offer(self, movie_id: str, score: float, other_id: str) -> None:
+        """Keeps another movie as one of a movie's most similar if it's similar enough.
+
+        Must be called while holding the lock.
+        """
+        neighbors = self.__neighbors.setdefault(movie_id, [])
+        if len(neighbors) < self.NEIGHBOR_COUNT:
+            insort(neighbors, (-score, other_id))
+        elif -score < neighbors[-1][0]:
+            neighbors.pop()
+            insort(neighbors, (-score, other_id))
+
+
+similar_movies = SimilarMovies()
@@ -0,0 +1,66 @@
+import os
+import time
+from collections.abc import Callable
+
+from PySide6 import QtCore
+
+
+class StartupProfile:
+    """Measures how long each phase of starting the app takes.
+
+    If the ``MOVIEFINDER_PROFILE_STARTUP`` environment variable is set, how long each
+    phase took is printed once the main window is first painted. Time is measured from
+    when this module is first imported. To also see how long each module takes to
+    import, set the ``PYTHONPROFILEIMPORTTIME`` environment variable too.
+    """
+
+    def __init__(self, is_enabled: bool):
+        self.is_enabled = is_enabled
+        self.__start_time = time.perf_counter()
+        self.__phase_start_time = self.__start_time
+        self.__phases: list[tuple[str, float]] = []
+        self.__first_paint_filter: _FirstPaintFilter | None = None
+
+    def mark(self, phase: str) -> None:
+        """Records that a phase of starting the app just finished."""
+        if self.is_enabled:
+            now = time.perf_counter()
+            self.__phases.append((phase, now - self.__phase_start_time))
+            self.__phase_start_time = now
+
+    def report_after_first_paint(self, app: QtCore.QCoreApplication) -> None:
+        """Prints the phases' times after any of the app's widgets is first painted."""
+        if self.is_enabled:
+            self.__first_paint_filter = _FirstPaintFilter(self.report)
+            app.installEventFilter(self.__first_paint_filter)
+
+    def report(self) -> None:
+        """Prints how long each phase took and stops measuring."""
+        self.mark("painting the main window")
+        self.is_enabled = False
+        app = QtCore.QCoreApplication.instance()
+        if app is not None and self.__first_paint_filter is not None:
+            app.removeEventFilter(self.__first_paint_filter)
+        print("Startup profile:")
+        for phase, seconds in self.__phases:
+            print(f"{seconds * 1000:9.1f} ms  {phase}")
+        total_seconds = self.__phase_start_time - self.__start_time
+        print(f"{total_seconds * 1000:9.1f} ms  total")
+
+
+class _FirstPaintFilter(QtCore.QObject):
+    """Calls a function once, after the first paint events are handled."""
+
+    def __init__(self, on_first_paint: Callable[[], None]):
+        QtCore.QObject.__init__(self)
+        self.__on_first_paint = on_first_paint
+        self.__has_painted = False
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if not self.__has_painted and event.type() == QtCore.QEvent.Type.Paint:
+            self.__has_painted = True
+            QtCore.QTimer.singleShot(0, self.__on_first_paint)
+        return False
+
+
+startup_profile = StartupProfile(bool(os.environ.get("MOVIEFINDER_PROFILE_STARTUP")))
@@ -0,0 +1,218 @@
+import traceback
+from collections.abc import Callable
+from collections.abc import Hashable
+from concurrent.futures import CancelledError
+from enum import IntEnum
+from itertools import count
+from queue import PriorityQueue
+from threading import Condition
+from threading import Lock
+from threading import Thread
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+
+from moviefinder.dev_settings import MAX_BACKGROUND_THREADS
+
+
+T = TypeVar("T")
+
+
+class TaskPriority(IntEnum):
+    """The order in which waiting tasks are started. Lower values start first."""
+
+    HIGH = 0  # the user is waiting for it, such as logging in
+    NORMAL = 1  # the user can see it, such as loading the posters in view
+    LOW = 2  # the user may need it later, such as prefetching pages
+
+
+class Task(Generic[T]):
+    """A function call that runs in one of a ``TaskExecutor``'s threads.
+
+    Like ``concurrent.futures.Future``, a task's result can be waited for, and it can
+    be cancelled before it starts. A task that is cancelled while it is running
+    finishes, but its result is not used. Long-running functions can check
+    ``is_cancelled`` to stop early.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., T],
+        args: tuple,
+        kwargs: dict[str, Any],
+        priority: TaskPriority,
+        key: Hashable | None,
+    ):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.__condition = Condition()
+        self.__is_running = False
+        self.__is_done = False
+        self.__is_cancelled = False
+        self.__result: T | None = None
+        self.__exception: BaseException | None = None
+        self.__done_callbacks: list[Callable[["Task[T]"], None]] = []
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.__is_cancelled
+
+    def cancel(self) -> bool:
+        """Cancels the task and returns True unless it has already finished."""
+        with self.__condition:
+            if self.__is_done:
+                return False
+            self.__is_cancelled = True
+            if self.__is_running:
+                return True
+        self.__finish()
+        return True
+
+    def cancel_if_not_started(self) -> bool:
+        """Cancels the task and returns True if it hasn't started running yet."""
+        with self.__condition:
+            if self.__is_done or self.__is_running:
+                return False
+            self.__is_cancelled = True
+        self.__finish()
+        return True
+
+    def done(self) -> bool:
+        """Returns True if the task finished or was cancelled."""
+        return self.__is_done
+
+    def result(self, timeout: float | None = None) -> T:
+        """Waits for the task to finish and returns what its function returned.
+
+        Raises what the function raised, ``CancelledError`` if the task was cancelled,
+        or ``TimeoutError`` if the task doesn't finish in time.
+        """
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: self.__is_done, timeout):
+                raise TimeoutError()
+        if self.__is_cancelled:
+            raise CancelledError()
+        if self.__exception is not None:
+            raise self.__exception
+        return self.__result  # type: ignore
+
+    def exception(self) -> BaseException | None:
+        """Returns what the finished task's function raised, if anything."""
+        return self.__exception
+
+    def add_done_callback(self, fn: Callable[["Task[T]"], None]) -> None:
+        """Calls a function with the task when it finishes or is cancelled.
+
+        The function is called in the thread that finishes the task, or right away if
+        the task already finished.
+        """
+        with self.__condition:
+            if not self.__is_done:
+                self.__done_callbacks.append(fn)
+                return
+        fn(self)
+
+    def run(self) -> None:
+        """Runs the task's function unless the task was cancelled."""
+        with self.__condition:
+            if self.__is_cancelled:
+                return
+            self.__is_running = True
+        try:
+            self.__result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.__exception = e
+        self.__finish()
+
+    def __finish(self) -> None:
+        with self.__condition:
+            self.__is_done = True
+            self.__condition.notify_all()
+            done_callbacks = self.__done_callbacks
+            self.__done_callbacks = []
+        for fn in done_callbacks:
+            try:
+                fn(self)
+            except Exception:
+                traceback.print_exc()
+
+
+class TaskExecutor:
+    """Runs tasks in a fixed number of daemon threads, starting the most urgent first.
+
+    Tasks with the same priority start in the order they were submitted. A task
+    submitted with the same key as a task that hasn't finished yet is not run again;
+    the unfinished task is returned instead. The threads are daemon threads so that
+    quitting never waits for them.
+    """
+
+    def __init__(self, max_threads: int):
+        self.max_threads = max_threads
+        self.__queue: PriorityQueue[tuple[int, int, Task]] = PriorityQueue()
+        self.__sequence_numbers = count()
+        self.__lock = Lock()
+        self.__threads: list[Thread] = []
+        self.__tasks_by_key: dict[Hashable, Task] = {}
+
+    def submit(
+        self,
+        fn: Callable[..., T],
+        *args,
+        priority: TaskPriority = TaskPriority.NORMAL,
+        key: Hashable | None = None,
+        **kwargs,
+    ) -> Task[T]:
+        """Schedules a function call and returns its task.
+
+        Parameters
+        ----------
+        fn : Callable[..., T]
+            The function to call in one of the executor's threads.
+        *args
+            The positional arguments to be passed to ``fn``.
+        priority : TaskPriority
+            How soon the task should start compared to other waiting tasks. Defaults to
+            ``TaskPriority.NORMAL``.
+        key : Hashable | None
+            Identifies tasks that would do the same work, so that only one of them runs
+            at a time. Defaults to None (the task is not deduplicated).
+        **kwargs
+            The keyword arguments to be passed to ``fn``.
+        """
+        with self.__lock:
+            if key is not None:
+                task = self.__tasks_by_key.get(key)
+                if task is not None and not (task.done() or task.is_cancelled):
+                    return task
+                task = Task(fn, args, kwargs, priority, key)
+                self.__tasks_by_key[key] = task
+                task.add_done_callback(self.__forget_key)
+            else:
+                task = Task(fn, args, kwargs, priority, key)
+            if len(self.__threads) < self.max_threads:
+                thread = Thread(
+                    target=self.__work,
+                    name=f"task_executor_{len(self.__threads)}",
+                    daemon=True,
+                )
+                self.__threads.append(thread)
+                thread.start()
+        self.__queue.put((priority, next(self.__sequence_numbers), task))
+        return task
+
+    def __forget_key(self, task: Task) -> None:
+        with self.__lock:
+            if self.__tasks_by_key.get(task.key) is task:
+                del self.__tasks_by_key[task.key]
+
+    def __work(self) -> None:
+        while True:
+            _, _, task = self.__queue.get()
+            task.run()
+
+
+# Use this for all background work, including loading pages, posters, and syncing.
+task_executor = TaskExecutor(MAX_BACKGROUND_THREADS)
@@ -1,16 +1,24 @@
+from collections.abc import Callable
 from typing import final
 from typing import NoReturn
 from typing import Optional
+from typing import TYPE_CHECKING
 
-import requests
+from moviefinder.app_data import app_data_path
 from moviefinder.country_code import CountryCode
+from moviefinder.declined_movies import DeclinedMovies
 from moviefinder.dev_settings import SERVICE_BASE_URL
 from moviefinder.dev_settings import USE_MOCK_DATA
 from moviefinder.service_name import ServiceName
 from moviefinder.validators import EmailValidator
+from moviefinder.vocabulary import GENRES
 from PySide6 import QtCore
 from PySide6 import QtWidgets
 
+if TYPE_CHECKING:
+    import requests
+    from moviefinder.service_call import ServiceCall
+
 
 def show_message_box(text: str) -> None:
     """Shows the user a message box and blocks until the user closes it."""
@@ -36,38 +44,9 @@ class _User:
         self.password = ""
         self.region: CountryCode | None = None
         self.services: list[ServiceName] = []
-        self.declined_movies: list[str] = []  # IDs of movies the user clicked "x" on
+        self.declined_movies = DeclinedMovies(app_data_path("declined"))
         # Map genres to the number of times a movie in that genre has been liked.
-        self.genre_habits = {
-            "action": 0,
-            "adult": 0,
-            "adventure": 0,
-            "animation": 0,
-            "biography": 0,
-            "comedy": 0,
-            "crime": 0,
-            "documentary": 0,
-            "drama": 0,
-            "family": 0,
-            "fantasy": 0,
-            "film noir": 0,
-            "game show": 0,
-            "historical": 0,
-            "horror": 0,
-            "musical": 0,
-            "musical": 0,
-            "mystery": 0,
-            "news": 0,
-            "reality": 0,
-            "romance": 0,
-            "science fiction": 0,
-            "short": 0,
-            "sport": 0,
-            "talk show": 0,
-            "thriller": 0,
-            "war": 0,
-            "western": 0,
-        }
+        self.genre_habits = {genre: 0 for genre in GENRES}
 
     def __bool__(self) -> bool:
         """Returns True if the user is logged in, False otherwise."""
@@ -80,11 +59,14 @@ class _User:
         region: CountryCode,
         services: list[ServiceName],
         password: str,
-    ) -> bool:
-        """Creates a new account and saves it to the service.
-
-        Returns True if the account was created successfully, False if the account
-        already exists or if there was an error communicating to the service.
+        on_done: Callable[[bool], None],
+    ) -> "ServiceCall | None":
+        """Creates a new account and saves it to the service in the background.
+
+        Calls ``on_done`` in the GUI thread with True if the account was created
+        successfully, or False if the account already exists or if there was an error
+        communicating to the service. Returns the call to the service so that it can be
+        cancelled, or None if the service doesn't need to be called.
         """
         self.clear()
         self.name = name
@@ -92,23 +74,33 @@ class _User:
         self.region = region
         self.services = services
         self.password = password
+        self.declined_movies.open(email)
         if USE_MOCK_DATA:
-            return True
-        try:
-            response = requests.post(
-                url=f"{SERVICE_BASE_URL}/register",
-                json={
-                    "name": self.name,
-                    "email": self.email,
-                    "country": self.region.name.lower(),
-                    "services": [s.value for s in self.services],
-                    "password": password,
-                    "genre_habits": self.genre_habits,
-                },
-            )
-        except requests.exceptions.ConnectionError as e:
+            on_done(True)
+            return None
+        from moviefinder.service_call import ServiceCall
+
+        call = ServiceCall(
+            "POST",
+            f"{SERVICE_BASE_URL}/register",
+            {
+                "name": self.name,
+                "email": self.email,
+                "country": self.region.name.lower(),
+                "services": [s.value for s in self.services],
+                "password": password,
+                "genre_habits": self.genre_habits,
+            },
+        )
+        call.finished.connect(
+            lambda response: on_done(self.__finish_creating(response))
+        )
+        call.start()
+        return call
+
+    def __finish_creating(self, response: "requests.Response | None") -> bool:
+        if response is None:
             show_message_box("Error communicating with the service.")
-            print(e)
             return False
         if response.status_code == 403:
             show_message_box("An account with this email address already exists.")
@@ -127,12 +119,19 @@ class _User:
         new_region: CountryCode,
         new_services: list[ServiceName],
         new_password: str,
-    ) -> bool:
-        """Updates and saves the user's data to the db, not including genre habits.
-
-        If the new password is empty, it will not be saved. Returns True if the update
-        was successful, and False if there was an error communicating with the service.
+        on_done: Callable[[bool], None],
+    ) -> "ServiceCall | None":
+        """Updates and saves the user's data to the db in the background.
+
+        Does not include genre habits. If the new password is empty, it will not be
+        saved. Calls ``on_done`` in the GUI thread with True if the update was
+        successful, and False if there was an error communicating with the service.
+        Returns the call to the service so that it can be cancelled, or None if the
+        service doesn't need to be called.
         """
+        if USE_MOCK_DATA:
+            on_done(True)
+            return None
         data = {
             "email": self.email,
             "password": self.password,
@@ -145,58 +144,46 @@ class _User:
             data["services"] = [s.value for s in new_services]
         if new_password:
             data["updatedpw"] = new_password
-        if not USE_MOCK_DATA:
-            response = requests.put(
-                url=f"{SERVICE_BASE_URL}/account",
-                json=data,
+        from moviefinder.service_call import ServiceCall
+
+        call = ServiceCall("PUT", f"{SERVICE_BASE_URL}/account", data)
+        call.finished.connect(
+            lambda response: on_done(
+                self.__finish_updating(
+                    response, new_name, new_region, new_services, new_password
+                )
             )
-            if response.status_code == 401:
-                print("Status code 401.")
-                print(f"{response.content = }")
-                show_message_box("Error: settings update failed.")
-                return False
-            if not response:
-                print(f"{response.status_code = }")
-                print(f"{response.content = }")
-                show_message_box("Unknown error when updating.")
-                return False
-            self.name = new_name
-            self.region = new_region
-            self.services = new_services
-            if new_password:
-                self.password = new_password
-            print("Successfully saved the settings.")
-        return True
-
-    def save_genre_habits_and_declined_movies(self) -> bool:
-        """Saves the user's genre habits and the movies they declined to the service.
-
-        Assumes the account already exists. Returns True if the update was successful,
-        and False if there was an error communicating with the service.
-        """
-        if USE_MOCK_DATA:
-            return True
-        print("Saving genre habits...")
-        response = requests.put(
-            url=f"{SERVICE_BASE_URL}/data",
-            json={
-                "email": self.email,
-                "genre_habits": self.genre_habits,
-                "password": self.password,
-                "declined": self.declined_movies,
-            },
         )
+        call.start()
+        return call
+
+    def __finish_updating(
+        self,
+        response: "requests.Response | None",
+        new_name: str,
+        new_region: CountryCode,
+        new_services: list[ServiceName],
+        new_password: str,
+    ) -> bool:
+        if response is None:
+            show_message_box("Error communicating with the service.")
+            return False
         if response.status_code == 401:
-            print("Status code 401")
+            print("Status code 401.")
             print(f"{response.content = }")
-            show_message_box("Error: unable to connect to the service.")
+            show_message_box("Error: settings update failed.")
             return False
         if not response:
             print(f"{response.status_code = }")
             print(f"{response.content = }")
-            show_message_box("Failed to save.")
+            show_message_box("Unknown error when updating.")
             return False
-        print("Successfully saved the genre habits.")
+        self.name = new_name
+        self.region = new_region
+        self.services = new_services
+        if new_password:
+            self.password = new_password
+        print("Successfully saved the settings.")
         return True
 
     def clear(self) -> None:
@@ -206,6 +193,7 @@ class _User:
         self.password = ""
         self.region = None
         self.services = []
+        self.declined_movies.clear()
         for genre in self.genre_habits:
             self.genre_habits[genre] = 0
         settings = QtCore.QSettings()
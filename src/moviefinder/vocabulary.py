@@ -0,0 +1,95 @@
+from collections.abc import Hashable
+from collections.abc import Iterable
+from threading import Lock
+from typing import Generic
+from typing import TypeVar
+
+from moviefinder.country_code import CountryCode
+from moviefinder.service_name import ServiceName
+
+
+T = TypeVar("T", bound=Hashable)
+
+# The genres the service sorts movies into, in lowercase.
+GENRES = (
+    "action",
+    "adult",
+    "adventure",
+    "animation",
+    "biography",
+    "comedy",
+    "crime",
+    "documentary",
+    "drama",
+    "family",
+    "fantasy",
+    "film noir",
+    "game show",
+    "historical",
+    "horror",
+    "musical",
+    "mystery",
+    "news",
+    "reality",
+    "romance",
+    "science fiction",
+    "short",
+    "sport",
+    "talk show",
+    "thriller",
+    "war",
+    "western",
+)
+
+
+class Vocabulary(Generic[T]):
+    """A numbering of values that lets a set of the values be stored as one int.
+
+    Each value is given its own bit, and a set of values is stored as a bitmask with
+    the bits of its values set. A vocabulary that can grow gives new values the next
+    unused bit the first time they're seen; other vocabularies ignore unknown values.
+    """
+
+    def __init__(self, values: Iterable[T], can_grow: bool = False):
+        self.can_grow = can_grow
+        self.__values: list[T] = []
+        self.__bits: dict[T, int] = {}
+        self.__lock = Lock()
+        for value in values:
+            self.__add(value)
+
+    def bit(self, value: T) -> int:
+        """Returns a value's bit, or 0 if the value is unknown and can't be added."""
+        if value in self.__bits:
+            return self.__bits[value]
+        if not self.can_grow:
+            return 0
+        with self.__lock:
+            self.__add(value)
+            return self.__bits[value]
+
+    def mask(self, values: Iterable[T]) -> int:
+        """Returns the bitmask of a set of values."""
+        mask = 0
+        for value in values:
+            mask |= self.bit(value)
+        return mask
+
+    def values(self, mask: int) -> list[T]:
+        """Returns the values whose bits are set in a bitmask, in vocabulary order."""
+        values = []
+        while mask:
+            lowest_bit = mask & -mask
+            values.append(self.__values[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return values
+
+    def __add(self, value: T) -> None:
+        if value not in self.__bits:
+            self.__bits[value] = 1 << len(self.__values)
+            self.__values.append(value)
+
+
+genre_vocabulary: Vocabulary[str] = Vocabulary(GENRES, can_grow=True)
+region_vocabulary: Vocabulary[CountryCode] = Vocabulary(CountryCode)
+service_vocabulary: Vocabulary[ServiceName] = Vocabulary(ServiceName)
@@ -1,42 +1,73 @@
-from threading import Thread
+from collections.abc import Hashable
 from typing import Callable
 
+from moviefinder.task_executor import Task
+from moviefinder.task_executor import task_executor
+from moviefinder.task_executor import TaskPriority
 from PySide6 import QtCore
 
 
 class Worker(QtCore.QObject):
-    """A worker that executes a function in a separate thread.
+    """A worker that executes a function as a task of ``task_executor``.
 
-    Emits a ``done`` signal when the function has finished executing. What the function
-    returns will be emitted in the ``done`` signal.
+    Emits a ``done`` signal in the GUI thread with what the function returned when the
+    function has finished executing, or a ``failed`` signal with the exception if the
+    function raised one. Neither signal is emitted if the task is cancelled.
     """
 
-    # TODO: attempting to emit the `done` signal with None may cause an error.
-    # https://stackoverflow.com/questions/21102591/pyside-pyqt-signal-that-can-transmit-any-value-including-none  # noqa: E501
-
     done = QtCore.Signal(object)
+    failed = QtCore.Signal(object)
+    __finished = QtCore.Signal(object)  # the task; emitted from the task's thread
 
-    def __init__(self):
+    def __init__(self, priority: TaskPriority = TaskPriority.NORMAL):
         QtCore.QObject.__init__(self)
-        self.is_running = False
+        self.priority = priority
+        self.__task: Task | None = None
+        self.__finished.connect(self.__emit_result)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the latest task's result hasn't been emitted yet."""
+        return self.__task is not None
 
-    def start(self, fn: Callable, *args, **kwargs):
-        """Starts the worker thread.
+    def start(self, fn: Callable, *args, key: Hashable | None = None, **kwargs):
+        """Starts running the function in a background thread.
+
+        If an earlier task of this worker hasn't finished yet, its result will not be
+        emitted.
 
         Parameters
         ----------
         fn : Callable
-            The function to be executed in the worker thread. What this function returns
+            The function to be executed in the background. What this function returns
             will be emitted in the ``done`` signal, so any function connected to the
             ``done`` signal should be able to handle the return value of ``fn``.
         *args
             The positional arguments to be passed to ``fn``.
+        key : Hashable | None
+            Passed to ``task_executor.submit``. Defaults to None.
         **kwargs
             The keyword arguments to be passed to ``fn``.
         """
-        Thread(target=self.__exec, args=(fn, *args), kwargs=kwargs, daemon=True).start()
+        self.__task = task_executor.submit(
+            fn, *args, priority=self.priority, key=key, **kwargs
+        )
+        self.__task.add_done_callback(self.__finished.emit)
+
+    def cancel(self) -> None:
+        """Cancels the latest task so that its result is not emitted."""
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
 
-    def __exec(self, fn: Callable, *args, **kwargs):
-        self.is_running = True
-        self.done.emit(fn(*args, **kwargs))
-        self.is_running = False
+    def __emit_result(self, task: Task) -> None:
+        if task is not self.__task:
+            return  # the task was cancelled or replaced
+        self.__task = None
+        if task.is_cancelled:
+            return
+        if (exception := task.exception()) is not None:
+            print(f"Exception in a background task: {exception!r}")
+            self.failed.emit(exception)
+        else:
+            self.done.emit(task.result())
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from moviefinder.catalog_cache import CatalogCache
+
+
+def __request_body(genres: list[str], page: int = 1) -> dict:
+    return {
+        "country": "us",
+        "genre": genres,
+        "language": "en",
+        "orderBy": "year",
+        "page": str(page),
+        "services": ["netflix", "hulu"],
+    }
+
+
+def test_put_and_get_page(tmp_path: Path) -> None:
+    cache = CatalogCache(tmp_path, 1000, 60)
+    cache.put(__request_body(["Action", "Drama"]), b'{"total_pages": 3}')
+    assert cache.get(__request_body(["Drama", "Action"])) == {"total_pages": 3}
+    assert cache.get(__request_body(["Action", "Drama"], page=2)) is None
+    assert cache.get(__request_body(["Action"])) is None
+
+
+def test_pages_persist(tmp_path: Path) -> None:
+    cache = CatalogCache(tmp_path, 1000, 60)
+    cache.put(__request_body(["Action"]), b"{}")
+    cache.save()
+    assert CatalogCache(tmp_path, 1000, 60).get(__request_body(["Action"])) == {}
+
+
+def test_old_pages_are_not_used(tmp_path: Path) -> None:
+    cache = CatalogCache(tmp_path, 1000, 0)
+    cache.put(__request_body(["Action"]), b"{}")
+    assert cache.get(__request_body(["Action"])) is None
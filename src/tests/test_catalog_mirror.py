@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Any
+
+from moviefinder.catalog_mirror import CatalogMirror
+from moviefinder.country_code import CountryCode
+from moviefinder.service_name import ServiceName
+
+
+def movie_data(
+    movie_id: str, year: int, genres: list[str], countries: tuple[str, ...] = ("us",)
+) -> dict[str, Any]:
+    return {
+        "imdbID": movie_id,
+        "title": movie_id,
+        "genres": genres,
+        "countries": list(countries),
+        "videoURL": "https://www.netflix.com/title/1",
+        "year": year,
+        "imdbRating": 70,
+    }
+
+
+def pages_of(movies_data: list[dict[str, Any]], page_size: int) -> list[dict]:
+    total_pages = -(-len(movies_data) // page_size)
+    starts = range(0, len(movies_data), page_size)
+    return [
+        {
+            "movies": movies_data[start : start + page_size],  # noqa: E203
+            "total_pages": total_pages,
+        }
+        for start in starts
+    ]
+
+
+def test_synced_pages_are_read_by_genre(tmp_path: Path) -> None:
+    catalog_mirror = CatalogMirror(tmp_path / "mirror.sqlite3", 2, 60)
+    services = [ServiceName.NETFLIX]
+    pages = pages_of(
+        [
+            movie_data("a", 2001, ["Comedy"]),
+            movie_data("b", 2003, ["Drama"]),
+            movie_data("c", 2002, ["Comedy", "Drama"]),
+        ],
+        2,
+    )
+    assert catalog_mirror.needs_sync(CountryCode.US, services)
+    assert catalog_mirror.sync(CountryCode.US, services, lambda page: pages[page - 1])
+    assert not catalog_mirror.needs_sync(CountryCode.US, services)
+    assert catalog_mirror.last_synced(CountryCode.US, services) is not None
+    movies_data, total_pages = catalog_mirror.page(
+        CountryCode.US, services, ["drama"], 1
+    )
+    assert [data["imdbID"] for data in movies_data] == ["b", "c"]
+    assert total_pages == 1
+    movies_data, total_pages = catalog_mirror.page(
+        CountryCode.US, services, ["comedy", "drama"], 2
+    )
+    assert [data["imdbID"] for data in movies_data] == ["a"]
+    assert total_pages == 2
+    assert catalog_mirror.page(CountryCode.CA, services, ["drama"], 1) == ([], 1)
+
+
+def test_unfinished_sync_continues_and_deletes_missing_movies(tmp_path: Path) -> None:
+    catalog_mirror = CatalogMirror(tmp_path / "mirror.sqlite3", 10, 0)
+    services = [ServiceName.NETFLIX]
+    pages = pages_of(
+        [movie_data("a", 2001, ["Comedy"]), movie_data("b", 2002, ["Comedy"])], 1
+    )
+    assert catalog_mirror.sync(CountryCode.US, services, lambda page: pages[page - 1])
+    pages = pages_of(
+        [movie_data("c", 2003, ["Comedy"]), movie_data("b", 2002, ["Comedy"])], 1
+    )
+    requested_pages: list[int] = []
+    failing_pages = {2}
+
+    def fetch_page(page: int) -> dict[str, Any] | None:
+        requested_pages.append(page)
+        return None if page in failing_pages else pages[page - 1]
+
+    assert not catalog_mirror.sync(CountryCode.US, services, fetch_page)
+    assert catalog_mirror.needs_sync(CountryCode.US, services)
+    movies_data, _ = catalog_mirror.page(CountryCode.US, services, ["comedy"], 1)
+    assert [data["imdbID"] for data in movies_data] == ["c", "b", "a"]
+    failing_pages.clear()
+    assert catalog_mirror.sync(CountryCode.US, services, fetch_page)
+    assert requested_pages == [1, 2, 2]
+    movies_data, _ = catalog_mirror.page(CountryCode.US, services, ["comedy"], 1)
+    assert [data["imdbID"] for data in movies_data] == ["c", "b"]
+
+
+def test_missing_movies_are_only_deleted_from_the_synced_region(
+    tmp_path: Path,
+) -> None:
+    catalog_mirror = CatalogMirror(tmp_path / "mirror.sqlite3", 10, 0)
+    services = [ServiceName.NETFLIX]
+    both_movies = pages_of(
+        [
+            movie_data("a", 2001, ["Comedy"], ("us", "ca")),
+            movie_data("b", 2002, ["Comedy"], ("us", "ca")),
+        ],
+        10,
+    )
+    one_movie = pages_of([movie_data("a", 2001, ["Comedy"], ("us", "ca"))], 10)
+    for region in (CountryCode.US, CountryCode.CA):
+        assert catalog_mirror.sync(region, services, lambda page: both_movies[0])
+    assert catalog_mirror.sync(CountryCode.CA, services, lambda page: one_movie[0])
+
+    def movie_ids(region: CountryCode) -> list[str]:
+        movies_data, _ = catalog_mirror.page(region, services, ["comedy"], 1)
+        return [data["imdbID"] for data in movies_data]
+
+    assert movie_ids(CountryCode.CA) == ["a"]
+    assert movie_ids(CountryCode.US) == ["b", "a"]
+    assert catalog_mirror.sync(CountryCode.US, services, lambda page: one_movie[0])
+    assert movie_ids(CountryCode.US) == ["a"]
+    assert catalog_mirror.sync(CountryCode.US, services, lambda page: both_movies[0])
+    assert movie_ids(CountryCode.US) == ["b", "a"]
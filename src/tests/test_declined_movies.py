@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from moviefinder.declined_movies import DeclinedMovies
+
+
+def test_declined_movies_persist(tmp_path: Path) -> None:
+    declined_movies = DeclinedMovies(tmp_path)
+    declined_movies.open("a@b.c")
+    for movie_id in ("tt0000002", "tt10000001", "tt0000001", "not-imdb"):
+        declined_movies.add(movie_id)
+    declined_movies.mark_synced(["tt0000002", "tt0000001"])
+    declined_movies.save()
+    reopened = DeclinedMovies(tmp_path)
+    reopened.open("a@b.c")
+    assert set(reopened) == {"tt0000001", "tt0000002", "tt10000001", "not-imdb"}
+    assert reopened.unsynced_ids() == ["tt10000001", "not-imdb"]
+    reopened.open("d@e.f")
+    assert not reopened
+
+
+def test_only_new_declines_are_unsynced(tmp_path: Path) -> None:
+    declined_movies = DeclinedMovies(tmp_path)
+    declined_movies.open("a@b.c")
+    declined_movies.merge(["tt0000001"])
+    declined_movies.add("tt0000001")
+    declined_movies.add("tt0000002")
+    assert "tt0000001" in declined_movies
+    assert declined_movies.unsynced_ids() == ["tt0000002"]
+
+
+def test_unreadable_file_is_ignored(tmp_path: Path) -> None:
+    declined_movies = DeclinedMovies(tmp_path)
+    declined_movies.open("a@b.c")
+    declined_movies.add("tt0000001")
+    declined_movies.save()
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"\x05")
+    declined_movies.open("a@b.c")
+    assert len(declined_movies) == 0
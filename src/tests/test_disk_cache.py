@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from moviefinder.disk_cache import DiskCache
+
+
+def test_get_missing_value(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 100, 60)
+    assert cache.get("https://example.com/a.jpg") is None
+
+
+def test_put_and_get_value(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 100, 60)
+    cache.put("https://example.com/a.jpg", b"abc", etag='"1"', last_modified="x")
+    cached = cache.get("https://example.com/a.jpg")
+    assert cached is not None
+    entry, data = cached
+    assert data == b"abc"
+    assert entry.etag == '"1"'
+    assert entry.last_modified == "x"
+    assert entry.key == "https://example.com/a.jpg"
+    assert cache.is_fresh(entry)
+
+
+def test_values_persist(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 100, 60)
+    cache.put("https://example.com/a.jpg", b"abc")
+    cache.save()
+    cached = DiskCache(tmp_path, 100, 60).get("https://example.com/a.jpg")
+    assert cached is not None
+    assert cached[1] == b"abc"
+
+
+def test_unsaved_values_are_deleted(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 100, 60)
+    cache.put("a", b"abc")
+    cache.save()
+    cache.put("b", b"def")
+    cache = DiskCache(tmp_path, 100, 60)
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert len([p for p in tmp_path.iterdir() if p.name != "index.json"]) == 1
+
+
+def test_invalid_index_is_discarded(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 100, 60)
+    cache.put("a", b"abc")
+    cache.save()
+    index_path = tmp_path / "index.json"
+    index_path.write_text(index_path.read_text().replace('"size"', '"bytes"'))
+    assert DiskCache(tmp_path, 100, 60).get("a") is None
+
+
+def test_least_recently_used_value_is_evicted(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, 10, 60)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert len([p for p in tmp_path.iterdir() if p.name != "index.json"]) == 2
@@ -0,0 +1,114 @@
+from pathlib import Path
+from types import ModuleType
+from types import SimpleNamespace
+
+import pytest
+from moviefinder import habits_sync as habits_sync_module
+from moviefinder.declined_movies import DeclinedMovies
+from moviefinder.habits_sync import HabitsSync
+from moviefinder.user import user
+
+
+@pytest.fixture(autouse=True)
+def logged_in_user(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(user, "email", "a@b.c")
+    monkeypatch.setattr(user, "password", "password")
+    monkeypatch.setattr(user, "genre_habits", {"comedy": 0, "drama": 0})
+    declined_movies = DeclinedMovies(tmp_path / "declined")
+    declined_movies.open("a@b.c")
+    monkeypatch.setattr(user, "declined_movies", declined_movies)
+
+
+def test_journal_replaces_genre_habits_when_reopened(tmp_path: Path) -> None:
+    habits_sync = HabitsSync(tmp_path)
+    habits_sync.open("a@b.c")
+    habits_sync.change_genre_habits(["comedy"], 1)
+    habits_sync.change_genre_habits(["comedy", "drama"], 1)
+    habits_sync.save()
+    # The app quits whether or not the service saved the genre habits.
+    for saved_comedy_habit in (0, 2):
+        user.genre_habits = {"comedy": saved_comedy_habit, "drama": 0}
+        HabitsSync(tmp_path).open("A@b.c")
+        assert user.genre_habits == {"comedy": 2, "drama": 1}
+    user.genre_habits = {"comedy": 0, "drama": 0}
+    HabitsSync(tmp_path).open("d@e.f")
+    assert user.genre_habits == {"comedy": 0, "drama": 0}
+
+
+def test_closing_sends_the_changes_and_clears_the_journal(tmp_path: Path) -> None:
+    habits_sync = HabitsSync(tmp_path)
+    habits_sync.open("a@b.c")
+    assert habits_sync.close() is None
+    habits_sync.open("a@b.c")
+    habits_sync.change_genre_habits(["drama"], 1)
+    habits_sync.decline_movie("tt0000001")
+    task = habits_sync.close()
+    assert task is not None
+    task.result(timeout=5)
+    user.genre_habits = {"comedy": 0, "drama": 1}
+    user.declined_movies.open("a@b.c")
+    habits_sync.open("a@b.c")
+    assert user.genre_habits == {"comedy": 0, "drama": 1}
+    assert set(user.declined_movies) == {"tt0000001"}
+    assert habits_sync.close() is None
+
+
+def test_all_declined_movies_are_sent(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: list[dict] = []
+
+    def put(url: str, json: dict) -> SimpleNamespace:
+        requests.append(json)
+        return SimpleNamespace(status_code=200, content=b"")
+
+    monkeypatch.setattr(habits_sync_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(habits_sync_module.session, "put", put)
+    user.declined_movies.merge(["tt0000001"])
+    habits_sync = HabitsSync(tmp_path)
+    habits_sync.open("a@b.c")
+    habits_sync.decline_movie("tt0000002")
+    task = habits_sync.close()
+    assert task is not None
+    task.result(timeout=5)
+    assert sorted(requests[0]["declined"]) == ["tt0000001", "tt0000002"]
+
+
+def test_sync_sends_the_changes(tmp_path: Path, qtbot: ModuleType) -> None:
+    habits_sync = HabitsSync(tmp_path)
+    habits_sync.open("a@b.c")
+    habits_sync.change_genre_habits(["comedy"], 1)
+    habits_sync.decline_movie("tt0000001")
+    habits_sync.sync()
+    qtbot.waitUntil(lambda: not user.declined_movies.unsynced_ids())
+    assert habits_sync.close() is None
+    assert [path.name for path in tmp_path.iterdir()] == ["declined"]
+
+
+def test_refused_password_stops_syncing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    qtbot: ModuleType,
+) -> None:
+    requests: list[dict] = []
+    messages: list[str] = []
+
+    def put(url: str, json: dict) -> SimpleNamespace:
+        requests.append(json)
+        return SimpleNamespace(status_code=401, content=b"")
+
+    monkeypatch.setattr(habits_sync_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(habits_sync_module.session, "put", put)
+    monkeypatch.setattr(habits_sync_module, "show_message_box", messages.append)
+    habits_sync = HabitsSync(tmp_path)
+    habits_sync.open("a@b.c")
+    habits_sync.change_genre_habits(["comedy"], 1)
+    habits_sync.sync()
+    qtbot.waitUntil(lambda: bool(messages))
+    habits_sync.decline_movie("tt0000001")
+    habits_sync.sync()
+    assert habits_sync.close() is None
+    assert len(requests) == 1
+    user.genre_habits = {"comedy": 0, "drama": 0}
+    habits_sync.open("a@b.c")
+    assert user.genre_habits == {"comedy": 1, "drama": 0}
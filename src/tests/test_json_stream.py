@@ -0,0 +1,29 @@
+import json
+
+import pytest
+from moviefinder.json_stream import JsonArrayStreamParser
+from moviefinder.resources import sample_movies_json_path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parse_sample_movies_in_chunks(chunk_size: int) -> None:
+    with open(sample_movies_json_path, "r", encoding="utf8") as file:
+        text = file.read()
+    starts = range(0, len(text), chunk_size)
+    chunks = (text[start : start + chunk_size] for start in starts)  # noqa: E203
+    parser = JsonArrayStreamParser("movies")
+    assert list(parser.parse(chunks)) == json.loads(text)["movies"]
+    assert parser.members == {"total_pages": 4}
+
+
+def test_numbers_split_across_chunks() -> None:
+    parser = JsonArrayStreamParser("items")
+    chunks = ['{"a": 1', '2, "items": [1, 2', "3], ", '"b": tr', "ue}"]
+    assert list(parser.parse(chunks)) == [1, 23]
+    assert parser.members == {"a": 12, "b": True}
+
+
+@pytest.mark.parametrize("text", ['{"items": [1, 2', "[1, 2]", '{"items": [1}'])
+def test_invalid_json(text: str) -> None:
+    with pytest.raises(ValueError):
+        list(JsonArrayStreamParser("items").parse([text]))
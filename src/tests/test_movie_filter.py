@@ -0,0 +1,41 @@
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import Movie
+from moviefinder.movie_filter import MovieFilter
+from moviefinder.service_name import ServiceName
+
+
+def create_movie(imdb_id: str, genres: list[str], countries: list[str]) -> Movie:
+    return Movie(
+        {
+            "imdbID": imdb_id,
+            "title": imdb_id,
+            "genres": genres,
+            "countries": countries,
+            "videoURL": f"https://www.netflix.com/title/{imdb_id}/",
+        }
+    )
+
+
+def test_matches_region_service_and_genre() -> None:
+    movie = create_movie("tt0000001", ["Action", "History"], ["us", "ca"])
+    netflix = [ServiceName.NETFLIX]
+    assert MovieFilter.create(CountryCode.CA, netflix, ["history"]).matches(movie)
+    assert not MovieFilter.create(CountryCode.GB, netflix, ["action"]).matches(movie)
+    assert not MovieFilter.create(
+        CountryCode.US, [ServiceName.HULU], ["action"]
+    ).matches(movie)
+    assert not MovieFilter.create(CountryCode.US, netflix, ["comedy"]).matches(movie)
+
+
+def test_filter_keeps_order() -> None:
+    movies = [
+        create_movie("tt0000001", ["Action"], ["us"]),
+        create_movie("tt0000002", ["Drama"], ["us"]),
+        create_movie("tt0000003", ["Drama", "Action"], ["gb"]),
+        create_movie("tt0000004", ["Action", "Comedy"], ["us"]),
+    ]
+    movie_filter = MovieFilter.create(CountryCode.US, list(ServiceName), ["action"])
+    assert [movie.id for movie in movie_filter.filter(movies)] == [
+        "tt0000001",
+        "tt0000004",
+    ]
@@ -0,0 +1,51 @@
+from moviefinder.movie import Movie
+from moviefinder.movie_ranker import MovieRanker
+
+
+def create_movie(
+    imdb_id: str, genres: list[str], rating_percent: int = -1, vote_count: int = -1
+) -> Movie:
+    return Movie(
+        {
+            "imdbID": imdb_id,
+            "title": imdb_id,
+            "genres": genres,
+            "countries": ["us"],
+            "videoURL": f"https://www.netflix.com/title/{imdb_id}/",
+            "imdbRating": rating_percent,
+            "imdbVoteCount": vote_count,
+        }
+    )
+
+
+def test_ranks_liked_genres_first() -> None:
+    movies = [
+        create_movie("tt0000001", ["Drama"]),
+        create_movie("tt0000002", ["Comedy", "Drama"]),
+        create_movie("tt0000003", ["Comedy"]),
+        create_movie("tt0000004", ["Horror"]),
+    ]
+    ranker = MovieRanker.create({"comedy": 3, "drama": 1, "horror": -2})
+    assert [movie.id for movie in ranker.rank(movies)] == [
+        "tt0000003",
+        "tt0000002",
+        "tt0000001",
+        "tt0000004",
+    ]
+
+
+def test_well_rated_movies_with_many_votes_rank_higher() -> None:
+    movies = [
+        create_movie("tt0000001", ["Comedy"], 95, 10),
+        create_movie("tt0000002", ["Comedy"], 90, 100_000),
+        create_movie("tt0000003", ["Comedy"]),
+        create_movie("tt0000004", ["Comedy"], 30, 100_000),
+    ]
+    ranker = MovieRanker.create({"comedy": 0})
+    assert [movie.id for movie in ranker.rank(movies)] == [
+        "tt0000002",
+        "tt0000001",
+        "tt0000003",
+        "tt0000004",
+    ]
+    assert 0 <= ranker.score(movies[0]) <= 1
@@ -0,0 +1,309 @@
+import random
+from threading import Event
+from threading import Thread
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from moviefinder import movies as movies_module
+from moviefinder.catalog_mirror import CatalogMirror
+from moviefinder.country_code import CountryCode
+from moviefinder.declined_movies import DeclinedMovies
+from moviefinder.movie import Movie
+from moviefinder.movies import _KeyOrder
+from moviefinder.movies import movies
+from moviefinder.service_name import ServiceName
+from moviefinder.user import user
+
+
+def movie_data(key: str, genre: str = "Comedy", title: str = "") -> dict[str, Any]:
+    return {
+        "imdbID": key,
+        "title": title or key,
+        "genres": [genre],
+        "countries": ["us"],
+        "videoURL": "https://www.netflix.com/",
+    }
+
+
+def movie(key: str, genre: str = "Comedy") -> Movie:
+    return Movie(movie_data(key, genre))
+
+
+@pytest.fixture
+def restorable_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[dict]:
+    """Logs in a user and returns a snapshot state of movies "a", "b", and "c"."""
+    monkeypatch.setattr(user, "region", CountryCode.US)
+    monkeypatch.setattr(user, "services", [ServiceName.NETFLIX])
+    monkeypatch.setattr(user, "declined_movies", DeclinedMovies(tmp_path))
+    monkeypatch.setattr(movies, "genres", [])
+    pool = [movie(key) for key in ("a", "b", "c")]
+    pool[0].hearted = True
+    yield {
+        "region": "US",
+        "services": ["NETFLIX"],
+        "genres": ["comedy"],
+        "requested_genres": ["comedy"],
+        "is_from_mirror": False,
+        "current_page": 1,
+        "total_pages": 2,
+        "pool": [pooled_movie.snapshot() for pooled_movie in pool],
+        "keys": ["c", "a", "b"],
+    }
+    movies.clear()
+
+
+def test_keys_keep_their_order() -> None:
+    movies.clear()
+    for key in ("a", "b", "c", "d"):
+        movies[key] = movie(key)
+    movies["b"] = movie("b")
+    assert list(movies.range()) == ["a", "b", "c", "d"]
+    assert list(movies.range(1, 3)) == ["b", "c"]
+    movies.clear()
+
+
+def test_deleted_keys_leave_no_gaps() -> None:
+    movies.clear()
+    for key in ("a", "b", "c", "d"):
+        movies[key] = movie(key)
+    del movies["b"]
+    assert "b" not in movies
+    assert list(movies.range()) == ["a", "c", "d"]
+    assert movies.index("d") == 2
+    movies["b"] = movie("b")
+    assert list(movies.range(2)) == ["d", "b"]
+    movies.clear()
+
+
+def test_rerank_keeps_the_movies_before_the_start() -> None:
+    movies.clear()
+    genres = {"a": "Comedy", "b": "Drama", "c": "Drama", "d": "Comedy"}
+    for key, genre in genres.items():
+        movies[key] = movie(key, genre)
+    genre_habits = user.genre_habits
+    user.genre_habits = {"comedy": 0, "drama": 1}
+    movies.rerank(1)
+    assert list(movies.range()) == ["a", "b", "c", "d"]
+    user.genre_habits = {"comedy": 2, "drama": 1}
+    movies.rerank(1)
+    assert list(movies.range()) == ["a", "d", "b", "c"]
+    assert movies.index("d") == 1
+    user.genre_habits = genre_habits
+    movies.clear()
+
+
+def test_rerank_after_declines() -> None:
+    movies.clear()
+    genres = {"a": "Comedy", "b": "Drama", "c": "Drama", "d": "Comedy", "e": "Drama"}
+    for key, genre in genres.items():
+        movies[key] = movie(key, genre)
+    genre_habits = user.genre_habits
+    user.genre_habits = {"comedy": 0, "drama": 1}
+    movies.rerank(0)
+    assert list(movies.range()) == ["b", "c", "e", "a", "d"]
+    del movies["c"]
+    user.genre_habits = {"comedy": 2, "drama": 1}
+    movies.rerank(1)
+    assert list(movies.range()) == ["b", "a", "d", "e"]
+    assert [movies.index(key) for key in ("b", "a", "d", "e")] == [0, 1, 2, 3]
+    assert movies.key_at(3) == "e"
+    user.genre_habits = genre_habits
+    movies.clear()
+
+
+def test_key_order_matches_a_list() -> None:
+    rng = random.Random(0)
+    key_order = _KeyOrder()
+    expected: list[str] = []
+    for i in range(2000):
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            expected.remove(key)
+            key_order.remove(key)
+        else:
+            key = str(i)
+            expected.append(key)
+            key_order.append(key)
+        if i % 50 == 0:
+            assert list(key_order) == expected
+            assert [key_order.index(key) for key in expected] == list(
+                range(len(expected))
+            )
+            assert [key_order.key_at(j) for j in range(len(expected))] == expected
+            assert key_order.keys(3, 10) == expected[3:10]
+    assert len(key_order) == len(expected)
+
+
+def test_key_order_keeps_positions_when_removing_empty_slots() -> None:
+    keys = [str(i) for i in range(200)]
+    key_order = _KeyOrder(keys)
+    for key in keys[:150]:
+        key_order.remove(key)
+    assert list(key_order) == keys[150:]
+    assert key_order.index("150") == 0
+    assert key_order.key_at(49) == "199"
+    key_order.append("200")
+    assert key_order.index("200") == 50
+
+
+def test_restore_rejects_other_regions_and_services(restorable_state: dict) -> None:
+    movies.clear()
+    movies["x"] = movie("x")
+    other_users: list[dict[str, Any]] = [
+        {"region": "CA"},
+        {"services": ["HULU", "NETFLIX"]},
+    ]
+    for changes in other_users:
+        assert not movies.restore(restorable_state | changes)
+        assert list(movies.range()) == ["x"]
+    assert not movies.restore({"region": "US"})
+    assert list(movies.range()) == ["x"]
+
+
+def test_restore_drops_declined_movies_and_keeps_hearts(
+    restorable_state: dict,
+) -> None:
+    user.declined_movies.add("b")
+    assert movies.restore(restorable_state)
+    assert list(movies.range()) == ["c", "a"]
+    assert movies.pooled_ids() == {"a", "c"}
+    assert movies["a"].hearted and not movies["c"].hearted
+    assert (movies.current_page, movies.total_pages) == (1, 2)
+
+
+def refreshed_page(monkeypatch: pytest.MonkeyPatch, movies_data: list[dict]) -> None:
+    """Makes the service return one page of movies without using the cache."""
+    response_data = {"movies": movies_data, "total_pages": 1}
+    response = SimpleNamespace(json=lambda: response_data, content=b"")
+    monkeypatch.setattr(movies_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(movies_module.session, "get", lambda **_: response)
+    monkeypatch.setattr(movies_module.catalog_cache, "put", lambda *_: None)
+
+
+def test_refreshed_pages_replace_the_restored_movies(
+    restorable_state: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    refreshed_page(
+        monkeypatch,
+        [
+            movie_data("a", title="A"),
+            movie_data("c"),
+            movie_data("d"),
+            movie_data("e", "Drama"),
+        ],
+    )
+    assert movies.restore(restorable_state)
+    refreshed = movies.fetch_restored_pages()
+    assert refreshed is not None
+    stale_keys = movies.stale_keys(refreshed)
+    assert stale_keys == ["b"]
+    for key in stale_keys:
+        del movies[key]
+    movies.merge_refreshed(refreshed)
+    assert list(movies.range()) == ["c", "a", "d"]
+    assert movies.pooled_ids() == {"a", "c", "d", "e"}
+    assert movies["a"].title == "A" and movies["a"].hearted
+    assert movies.total_pages == 1
+
+
+def test_refreshed_pages_are_ignored_after_the_movies_change(
+    restorable_state: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    refreshed_page(monkeypatch, [movie_data("d")])
+    assert movies.restore(restorable_state)
+    refreshed = movies.fetch_restored_pages()
+    assert refreshed is not None
+    movies.refilter(["comedy"])
+    assert movies.stale_keys(refreshed) == []
+    movies.merge_refreshed(refreshed)
+    assert list(movies.range()) == ["a", "b", "c"]
+    assert movies.pooled_ids() == {"a", "b", "c"}
+    assert movies.total_pages == 2
+
+
+def test_invalid_json_pages_are_not_cached(
+    restorable_state: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cached_contents: list[bytes] = []
+
+    def json() -> None:
+        raise ValueError("Expecting value")
+
+    response = SimpleNamespace(json=json, content=b"<html>")
+    monkeypatch.setattr(movies_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(movies_module.session, "get", lambda **_: response)
+    monkeypatch.setattr(
+        movies_module.catalog_cache,
+        "put",
+        lambda _, content: cached_contents.append(content),
+    )
+    assert movies.restore(restorable_state)
+    assert movies.fetch_restored_pages() is None
+    assert cached_contents == []
+
+
+def test_empty_mirror_page_ends_loading(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    catalog_mirror = CatalogMirror(tmp_path / "mirror.sqlite3", 10, 60)
+    services = [ServiceName.NETFLIX]
+    page = {"movies": [movie_data("a", "Drama")], "total_pages": 1}
+    assert catalog_mirror.sync(CountryCode.US, services, lambda _: page)
+    monkeypatch.setattr(movies_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(movies_module, "USE_CATALOG_MIRROR", True)
+    monkeypatch.setattr(movies_module, "catalog_mirror", catalog_mirror)
+    monkeypatch.setattr(user, "region", CountryCode.US)
+    monkeypatch.setattr(user, "services", services)
+    monkeypatch.setattr(user, "declined_movies", DeclinedMovies(tmp_path))
+    monkeypatch.setattr(movies, "genres", ["comedy"])
+    movies.clear()
+    assert movies.load() is None
+    assert not list(movies.range())
+    movies.refilter(["drama"])
+    assert movies.load()
+    assert list(movies.range()) == ["a"]
+    assert movies.load() is None
+    movies.clear()
+
+
+def test_loads_run_one_at_a_time(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    catalog_mirror = CatalogMirror(tmp_path / "mirror.sqlite3", 1, 60)
+    services = [ServiceName.NETFLIX]
+    page = {"movies": [movie_data("a"), movie_data("b")], "total_pages": 1}
+    assert catalog_mirror.sync(CountryCode.US, services, lambda _: page)
+    mirror_page = catalog_mirror.page
+    release = Event()
+    requested_pages: list[int] = []
+
+    def blocking_page(*args: Any) -> tuple[list[dict[str, Any]], int]:
+        requested_pages.append(args[-1])
+        release.wait(timeout=5)
+        return mirror_page(*args)
+
+    monkeypatch.setattr(catalog_mirror, "page", blocking_page)
+    monkeypatch.setattr(movies_module, "USE_MOCK_DATA", False)
+    monkeypatch.setattr(movies_module, "USE_CATALOG_MIRROR", True)
+    monkeypatch.setattr(movies_module, "catalog_mirror", catalog_mirror)
+    monkeypatch.setattr(user, "region", CountryCode.US)
+    monkeypatch.setattr(user, "services", services)
+    monkeypatch.setattr(user, "declined_movies", DeclinedMovies(tmp_path))
+    monkeypatch.setattr(movies, "genres", ["comedy"])
+    movies.clear()
+    results: list[bool | None] = []
+    threads = [Thread(target=lambda: results.append(movies.load())) for _ in "ab"]
+    for thread in threads:
+        thread.start()
+    threads[1].join(timeout=0.2)
+    assert requested_pages == [1]
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == [True, True]
+    assert requested_pages == [1, 2]
+    assert sorted(movies.range()) == ["a", "b"]
+    movies.clear()
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+from moviefinder import movies_model as movies_model_module
+from moviefinder.movie import Movie
+from moviefinder.movies import movies
+from moviefinder.movies_model import forget_movies
+from moviefinder.search_index import SearchIndex
+from moviefinder.similar_movies import similar_movies
+
+
+def test_logging_out_forgets_the_movies(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    search_index = SearchIndex(tmp_path / "index")
+    monkeypatch.setattr(movies_model_module, "search_index", search_index)
+    movie = Movie(
+        {
+            "imdbID": "tt0000001",
+            "title": "A Movie",
+            "genres": ["Comedy"],
+            "countries": ["us"],
+            "videoURL": "https://www.netflix.com/",
+        }
+    )
+    movies.clear()
+    movies[movie.id] = movie
+    search_index.add([movie])
+    search_index.save()
+    similar_movies.add([movie])
+    forget_movies()
+    assert not movies and not list(movies.range())
+    assert not movies.pooled_ids()
+    assert len(search_index) == 0 and search_index.search("movie") == []
+    assert movie.id not in similar_movies
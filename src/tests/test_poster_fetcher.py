@@ -0,0 +1,36 @@
+from moviefinder.dev_settings import MENU_POSTER_HEIGHT
+from moviefinder.dev_settings import MENU_POSTER_WIDTH
+from moviefinder.dev_settings import POSTER_HEIGHT
+from moviefinder.dev_settings import POSTER_WIDTH
+from moviefinder.poster_fetcher import decode_poster
+from PySide6 import QtCore
+from PySide6 import QtGui
+
+
+def __encode_image(width: int, height: int) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor("red"))
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+def test_decode_large_poster() -> None:
+    decoded = decode_poster(__encode_image(2000, 3000))
+    assert decoded is not None
+    poster_image, menu_poster_image = decoded
+    assert poster_image.width() <= POSTER_WIDTH
+    assert poster_image.height() == POSTER_HEIGHT
+    assert menu_poster_image.width() <= MENU_POSTER_WIDTH
+    assert menu_poster_image.height() == MENU_POSTER_HEIGHT
+
+
+def test_decode_small_poster_is_not_enlarged() -> None:
+    decoded = decode_poster(__encode_image(100, 150))
+    assert decoded is not None
+    assert decoded[1].size() == QtCore.QSize(100, 150)
+
+
+def test_decode_invalid_poster() -> None:
+    assert decode_poster(b"not an image") is None
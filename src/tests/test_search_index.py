@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from moviefinder.movie import Movie
+from moviefinder.search_index import SearchIndex
+
+
+def create_movie(imdb_id: str, title: str, cast: list[str], overview: str) -> Movie:
+    return Movie(
+        {
+            "imdbID": imdb_id,
+            "title": title,
+            "genres": ["Drama"],
+            "countries": ["us"],
+            "videoURL": f"https://www.netflix.com/title/{imdb_id}/",
+            "cast": cast,
+            "overview": overview,
+        }
+    )
+
+
+MOVIES = [
+    create_movie("tt0000001", "Amélie", ["Audrey Tautou"], "A shy waitress in Paris."),
+    create_movie("tt0000002", "Paris, Texas", ["Harry Dean Stanton"], "A drifter."),
+    create_movie("tt0000003", "Midnight Run", ["Robert De Niro"], "A bounty hunter."),
+]
+
+
+def test_search_matches_prefixes_and_ranks_titles_first(tmp_path: Path) -> None:
+    search_index = SearchIndex(tmp_path / "index")
+    search_index.add(MOVIES)
+    assert search_index.search("par") == ["tt0000002", "tt0000001"]
+    assert search_index.search("AMELIE") == ["tt0000001"]
+    assert search_index.search("de niro") == ["tt0000003"]
+    assert search_index.search("paris drifter") == ["tt0000002"]
+    assert search_index.search("paris", movie_ids={"tt0000001"}) == ["tt0000001"]
+    assert search_index.search("the") == []
+    assert search_index.search("p") == []
+
+
+def test_index_persists_and_can_be_pruned(tmp_path: Path) -> None:
+    search_index = SearchIndex(tmp_path / "index")
+    search_index.add(MOVIES)
+    search_index.retain({"tt0000001", "tt0000003"})
+    search_index.save()
+    reloaded = SearchIndex(tmp_path / "index")
+    assert len(reloaded) == 2
+    assert "tt0000002" not in reloaded
+    assert reloaded.search("paris") == ["tt0000001"]
+
+
+def test_changed_movies_are_indexed_again(tmp_path: Path) -> None:
+    search_index = SearchIndex(tmp_path / "index")
+    search_index.add(MOVIES)
+    search_index.add(
+        [create_movie("tt0000002", "Paris, Texas", ["Nastassja Kinski"], "A road.")]
+    )
+    assert search_index.search("drifter") == []
+    assert search_index.search("stanton") == []
+    assert search_index.search("kinski") == ["tt0000002"]
+    assert search_index.search("paris") == ["tt0000002", "tt0000001"]
+    search_index.save()
+    reloaded = SearchIndex(tmp_path / "index")
+    assert reloaded.search("drifter") == []
+    assert reloaded.search("road") == ["tt0000002"]
@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import Any
+
+from moviefinder.movie import Movie
+from moviefinder.session_snapshot import SessionSnapshot
+
+
+def test_movie_snapshot_round_trip() -> None:
+    movie = Movie(
+        {
+            "imdbID": "tt0000001",
+            "title": "A Movie",
+            "genres": ["Comedy", "Some New Genre"],
+            "countries": ["us", "ca"],
+            "videoURL": "https://www.netflix.com/title/1",
+            "cast": ["Someone"],
+        }
+    )
+    movie.hearted = True
+    restored = Movie.from_snapshot(movie.snapshot())
+    assert restored
+    assert restored.snapshot() == movie.snapshot()
+    assert restored.genre_mask == movie.genre_mask
+    assert restored.services == movie.services
+
+
+def test_snapshots_persist_per_user(tmp_path: Path) -> None:
+    state: dict[str, Any] = {
+        "keys": ["tt0000001"],
+        "total_pages": None,
+        "pool": [("a", 1, [])],
+    }
+    session_snapshot = SessionSnapshot(tmp_path, 60)
+    session_snapshot.save("a@b.c", state)
+    assert SessionSnapshot(tmp_path, 60).load("A@b.c") == state
+    assert session_snapshot.load("d@e.f") is None
+    assert SessionSnapshot(tmp_path, 0).load("a@b.c") is None
+    session_snapshot.delete("a@b.c")
+    assert session_snapshot.load("a@b.c") is None
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path: Path) -> None:
+    session_snapshot = SessionSnapshot(tmp_path, 60)
+    session_snapshot.save("a@b.c", {})
+    for path in tmp_path.iterdir():
+        path.write_bytes(path.read_bytes()[:-1] + b"\xff")
+    assert session_snapshot.load("a@b.c") is None
@@ -0,0 +1,59 @@
+from moviefinder.movie import Movie
+from moviefinder.similar_movies import SimilarMovies
+
+
+def create_movie(
+    imdb_id: str, genres: list[str], year: int, cast: list[str], directors: list[str]
+) -> Movie:
+    return Movie(
+        {
+            "imdbID": imdb_id,
+            "title": imdb_id,
+            "genres": genres,
+            "countries": ["us"],
+            "videoURL": f"https://www.netflix.com/title/{imdb_id}/",
+            "year": year,
+            "cast": cast,
+            "director": directors,
+        }
+    )
+
+
+def test_similar_movies_share_genres_people_and_years() -> None:
+    similar_movies = SimilarMovies()
+    similar_movies.add(
+        [
+            create_movie("tt0000001", ["Sci-Fi", "Action"], 1999, ["Neo"], ["W"]),
+            create_movie("tt0000002", ["Sci-Fi", "Action"], 2003, ["Neo"], ["W"]),
+            create_movie("tt0000003", ["Sci-Fi", "Action"], 1960, ["Kirk"], ["R"]),
+            create_movie("tt0000004", ["Romance"], 1999, ["Rose"], ["J"]),
+        ]
+    )
+    similar_movies.add([create_movie("tt0000005", ["Action"], 2000, ["Neo"], ["X"])])
+    assert similar_movies.similar("tt0000001") == [
+        "tt0000002",
+        "tt0000005",
+        "tt0000003",
+    ]
+    assert similar_movies.similar("tt0000001", movie_ids={"tt0000003"}) == ["tt0000003"]
+    assert similar_movies.similar("tt0000001", limit=1) == ["tt0000002"]
+    assert similar_movies.similar("tt0000004") == []
+    similar_movies.clear()
+    assert similar_movies.similar("tt0000001") == []
+
+
+def test_movies_are_not_added_after_clearing() -> None:
+    similar_movies = SimilarMovies()
+    generation = similar_movies.generation
+    similar_movies.add([create_movie("tt0000001", ["Action"], 1999, [], [])])
+    similar_movies.clear()
+    similar_movies.add(
+        [create_movie("tt0000002", ["Action"], 2000, [], [])], generation
+    )
+    assert "tt0000002" not in similar_movies
+    similar_movies.add(
+        [create_movie("tt0000002", ["Action"], 2000, [], [])],
+        similar_movies.generation,
+    )
+    assert "tt0000002" in similar_movies
+    assert "tt0000001" not in similar_movies
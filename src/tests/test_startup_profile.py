@@ -0,0 +1,41 @@
+from collections.abc import Iterator
+
+import pytest
+from moviefinder import startup_profile as startup_profile_module
+from moviefinder.startup_profile import StartupProfile
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[float]]:
+    """Makes ``time.perf_counter`` return the numbers appended to the list."""
+    times: list[float] = [0.0]
+    monkeypatch.setattr(startup_profile_module.time, "perf_counter", times.pop)
+    yield times
+
+
+def test_phases_are_reported(
+    clock: list[float], capsys: pytest.CaptureFixture[str]
+) -> None:
+    profile = StartupProfile(True)
+    clock.append(0.25)
+    profile.mark("importing")
+    clock.append(1.0)
+    profile.mark("creating the window")
+    clock.append(1.5)
+    profile.report()
+    assert capsys.readouterr().out.splitlines() == [
+        "Startup profile:",
+        "    250.0 ms  importing",
+        "    750.0 ms  creating the window",
+        "    500.0 ms  painting the main window",
+        "   1500.0 ms  total",
+    ]
+    profile.mark("after reporting")
+    assert not profile.is_enabled
+
+
+def test_disabled_profile_does_not_measure(clock: list[float]) -> None:
+    profile = StartupProfile(False)
+    clock.append(0.25)
+    profile.mark("importing")
+    assert clock == [0.25]
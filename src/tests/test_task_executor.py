@@ -0,0 +1,79 @@
+from concurrent.futures import CancelledError
+from threading import Event
+
+import pytest
+from moviefinder.task_executor import TaskExecutor
+from moviefinder.task_executor import TaskPriority
+
+
+def test_result_and_exception() -> None:
+    executor = TaskExecutor(2)
+    assert executor.submit(pow, 2, 10).result(timeout=5) == 1024
+    task = executor.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        task.result(timeout=5)
+    assert isinstance(task.exception(), ValueError)
+
+
+def test_urgent_tasks_start_first() -> None:
+    executor = TaskExecutor(1)
+    release = Event()
+    started: list[str] = []
+    blocker = executor.submit(release.wait)
+    tasks = [
+        executor.submit(started.append, "low", priority=TaskPriority.LOW),
+        executor.submit(started.append, "normal"),
+        executor.submit(started.append, "high", priority=TaskPriority.HIGH),
+    ]
+    release.set()
+    blocker.result(timeout=5)
+    for task in tasks:
+        task.result(timeout=5)
+    assert started == ["high", "normal", "low"]
+
+
+def test_cancelled_tasks_do_not_run() -> None:
+    executor = TaskExecutor(1)
+    release = Event()
+    started: list[str] = []
+    executor.submit(release.wait)
+    task = executor.submit(started.append, "cancelled")
+    assert task.cancel()
+    release.set()
+    with pytest.raises(CancelledError):
+        task.result(timeout=5)
+    executor.submit(started.append, "not cancelled").result(timeout=5)
+    assert started == ["not cancelled"]
+
+
+def test_only_waiting_tasks_are_cancelled_if_not_started() -> None:
+    executor = TaskExecutor(1)
+    started = Event()
+    release = Event()
+
+    def wait() -> None:
+        started.set()
+        release.wait()
+
+    running_task = executor.submit(wait)
+    waiting_task = executor.submit(pow, 2, 3)
+    assert started.wait(timeout=5)
+    assert not running_task.cancel_if_not_started()
+    assert waiting_task.cancel_if_not_started()
+    assert waiting_task.done()
+    release.set()
+    assert running_task.result(timeout=5) is None
+    with pytest.raises(CancelledError):
+        waiting_task.result(timeout=5)
+    assert not running_task.cancel_if_not_started()
+
+
+def test_identical_tasks_run_once() -> None:
+    executor = TaskExecutor(1)
+    release = Event()
+    executor.submit(release.wait)
+    task = executor.submit(pow, 2, 3, key="2 ** 3")
+    assert executor.submit(pow, 2, 3, key="2 ** 3") is task
+    release.set()
+    assert task.result(timeout=5) == 8
+    assert executor.submit(pow, 2, 3, key="2 ** 3") is not task
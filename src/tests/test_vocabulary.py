@@ -0,0 +1,23 @@
+from moviefinder.service_name import ServiceName
+from moviefinder.vocabulary import Vocabulary
+
+
+def test_mask_and_values() -> None:
+    vocabulary = Vocabulary(ServiceName)
+    mask = vocabulary.mask([ServiceName.NETFLIX, ServiceName.AMAZON_PRIME])
+    assert mask & vocabulary.bit(ServiceName.NETFLIX)
+    assert not mask & vocabulary.bit(ServiceName.HULU)
+    assert vocabulary.values(mask) == [ServiceName.AMAZON_PRIME, ServiceName.NETFLIX]
+
+
+def test_fixed_vocabulary_ignores_unknown_values() -> None:
+    vocabulary = Vocabulary(["action", "drama"])
+    assert vocabulary.bit("history") == 0
+    assert vocabulary.values(vocabulary.mask(["drama", "history"])) == ["drama"]
+
+
+def test_growing_vocabulary_adds_unknown_values() -> None:
+    vocabulary = Vocabulary(["action", "drama"], can_grow=True)
+    mask = vocabulary.mask(["history", "action"])
+    assert vocabulary.bit("history") == 0b100
+    assert vocabulary.values(mask) == ["action", "history"]